@@ -5,196 +5,49 @@ from openpyxl.utils import get_column_letter
 import warnings
 warnings.filterwarnings('ignore')
 
+from engine.inputs import AGENCY, load_agency
+from engine.kpi import agency_kpis
+from engine.metrics import RunMetrics
+from engine.months import parse_months
+
 # Конфигурация
-FILE_PATH = "input-data/agency/agency.xlsx"
+FILE_PATH = "input-data/agency/agency.xlsx"  # или список файлов; все листы Agency объединяются
 OUTPUT_PATH = "output-data/agency_group_sales.xlsx"
+SQLITE_PATH = None  # например "output-data/agency_group_sales.sqlite"
+COLUMNAR_FORMATS = ()  # например ("parquet", "arrow")
+FX_PATH = None  # например "const/fx_rates.csv": дата + курс за 1 EUR по валютам (USD, TRY, ...)
+FX_METHOD = "average"  # "average" — средний курс месяца, "month-end" — курс на конец месяца
+PREVIEW_ONLY = False  # True — только KPI-сводка, без Excel и остальных файлов
+MONTHS = None  # например "3-5" или ["Mart", "Nisan"]: разбираются только строки этих месяцев
 
 print("🚀 Начало обработки данных...")
+# Метрики запуска (строки по шагам, время и память по этапам) пишутся в историю запусков
+metrics = RunMetrics(AGENCY, FILE_PATH, source="script").start()
 
 # ============================================
 # 1. ЗАГРУЗКА И ОЧИСТКА ДАННЫХ
 # ============================================
 print("📥 Загрузка данных...")
-raw = pd.read_excel(FILE_PATH, header=None)
-header_row = raw[raw[0] == "Agency"].index[0]
-df = pd.read_excel(FILE_PATH, header=header_row)
-
-# Удаляем пустые строки и колонки
-df = df.dropna(axis=0, how="all").dropna(axis=1, how="all")
-
-# Нормализация колонок
-df.columns = (
-    df.columns.astype(str)
-    .str.strip()
-    .str.replace('\n', '_', regex=True)
-    .str.replace('_x000a_', '_', regex=True)
-    .str.replace(' ', '_', regex=True)
-    .str.replace('__+', '_', regex=True)
-    .str.replace(r'[^\w_%\.]', '', regex=True)
-    .str.lower()
-)
-
-print(f"Исходных строк после очистки: {len(df)}")
-
 # ============================================
-# 2. ИЗВЛЕЧЕНИЕ МЕСЯЦЕВ
+# 2-6. МЕСЯЦЫ, РЫНКИ, ЧИСЛА, ГРУППЫ АГЕНТСТВ
 # ============================================
-print("📅 Извлечение месяцев...")
-month_pattern = r'\d{2}-[^\d]+'
-month_rows = df['agency'].astype(str).str.match(month_pattern, na=False)
-
-df['month'] = pd.NA
-current_month = None
+# Все шаги работают на булевых масках, без промежуточных копий
+print("📅 Извлечение месяцев, 🌍 рынков, 🏢 групп агентств...")
 
-for i in df.index:
-    if month_rows[i]:
-        month_str = df.at[i, 'agency']
-        parts = str(month_str).split('-')
-        if len(parts) >= 2:
-            current_month = parts[1].strip()
-    if current_month:
-        df.at[i, 'month'] = current_month
-
-# Удаляем строки с заголовками месяцев
-df = df[~month_rows].copy()
-df = df.reset_index(drop=True)
+numeric_cols = ['arrival_room', 'night_room', 'night_paidpax', 'eur_revenue', 'eur_avg_perpaidpax']
+counts = {}
+# Скрипт без __main__-гарда: листы читаются последовательно, без пула процессов
+df_clean = load_agency(FILE_PATH, numeric_cols, counts=counts, max_workers=1, metrics=metrics,
+                       months=parse_months(MONTHS))
+metrics.rows(counts)
 
-print(f"После удаления заголовков месяцев: {len(df)}")
+print(f"Исходных строк после очистки: {counts['loaded']}")
 
-# ============================================
-# 3. ОПРЕДЕЛЕНИЕ РЫНКОВ И УДАЛЕНИЕ СЛУЖЕБНЫХ СТРОК
-# ============================================
-print("🌍 Определение рынков...")
-
-# Словарь для сокращенных названий рынков
-market_names_map = {
-    'CIS_COMMONWEALTH OF INDEPENDENT STATES': 'CIS',
-    'DOMESTIC_DOMESTIC': 'DOMESTIC',
-    'EUROPE_EUROPE MARKET': 'EUROPE',
-    'MIDDLEEAST_MIDDLE EAST MARKET': 'ORTA DOĞU',
-    'OTHER_OTHER MARKETS': 'OTHER',
-    'FAR EASTERN_UZAK DOGU ULKERI': 'FAR EAST',
-    'FAR EASTER_UZAK DOGU ULKERI': 'FAR EAST'
-}
-
-# Служебные строки, которые нужно удалить
-service_rows_patterns = ['TOTAL', 'UK_UNITED KINGDOM'] + list(market_names_map.keys())
-
-df['market'] = pd.NA
-df['is_service_row'] = False
-current_market = None
-
-for i in df.index:
-    agency_val = str(df.at[i, 'agency']).strip()
-    agency_upper = agency_val.upper()
-
-    # Проверяем, является ли строка заголовком рынка
-    is_market_header = False
-    for market_key in market_names_map.keys():
-        if agency_upper == market_key.upper():
-            current_market = market_names_map[market_key]
-            is_market_header = True
-            df.at[i, 'is_service_row'] = True
-            break
-
-    # Проверяем, является ли строка TOTAL (точное совпадение или содержит TOTAL)
-    if agency_upper == 'TOTAL' or 'TOTAL' in agency_upper:
-        df.at[i, 'is_service_row'] = True
-
-    # Проверяем UK_UNITED KINGDOM
-    if 'UK_UNITED KINGDOM' in agency_upper or agency_upper == 'UK_UNITED KINGDOM':
-        df.at[i, 'is_service_row'] = True
-
-    # Если это не служебная строка, присваиваем текущий рынок
-    if not df.at[i, 'is_service_row']:
-        df.at[i, 'market'] = current_market
-
-# Удаляем все служебные строки ОДНИМ РАЗОМ
-df_clean = df[df['is_service_row'] == False].copy()
-df_clean = df_clean.drop(columns=['is_service_row'])
-df_clean = df_clean.reset_index(drop=True)
-
-print(f"После удаления служебных строк: {len(df_clean)}")
+print(f"После удаления заголовков месяцев: {counts['after_month_headers']}")
+print(f"После удаления служебных строк: {counts['after_service_rows']}")
 print(f"Найдено рынков: {df_clean['market'].nunique()}")
 print(f"Рынки: {sorted(df_clean['market'].dropna().unique())}")
-
-# ============================================
-# 4. ПРЕОБРАЗОВАНИЕ ЧИСЛОВЫХ КОЛОНОК
-# ============================================
-print("🔢 Обработка числовых данных...")
-
-numeric_cols = ['arrival_room', 'night_room', 'night_paidpax', 'eur_revenue', 'eur_avg_perpaidpax']
-for col in numeric_cols:
-    if col in df_clean.columns:
-        df_clean[col] = pd.to_numeric(
-            df_clean[col].astype(str).str.replace(',', '.').str.replace(' ', ''),
-            errors='coerce'
-        )
-
-# ============================================
-# 5. ГРУППИРОВКА АГЕНТСТВ
-# ============================================
-print("🏢 Группировка агентств...")
-
-agency_group_rules = {
-    'Anex Tour': ['ANEX-'],
-    'AKAY TOUR': ['AKAY-'],
-    'ARELES (EUROPEHOL)': ['ARELES-'],
-    'BEDSOPIA / PRIME TRAVEL': ['BEDSOPIA'],
-    'BOOKING.COM': ['BOOKING.COM'],
-    'COMP': ['GM', 'COMP 3', 'SALES', 'KONSER', 'ATG', 'PANDEMI'],
-    'CORENDON': ['CORENDON'],
-    'DESTINATION SERVICES': ['DESTINATION-'],
-    'ETS': ['ETS'],
-    'EUROPE HOLIDAY': ['EUHOLIDAY-'],
-    'FIBULA TRAVEL': ['FIBULA-'],
-    'FIT TURIZM': ['FIT HOL-', 'FIT'],
-    'GROUP': ['GROUP-'],
-    'HOTELBEDS': ['HOTELBEDS-'],
-    'HOUSE USE': ['HOUSE USE'],
-    'INDIVIDUAL': ['INDIVIDUAL-'],
-    'ITS': ['ITS-'],
-    'KALANIT TOUR': ['KALANIT-'],
-    'KEYF TRAVEL': ['KEYF TRAVEL-', 'SUNQUEST-'],
-    'KILIT GLOBAL': ['KILIT-'],
-    'MEETING POINT': ['FTI-'],
-    'MOTUS': ['MOTUS-'],
-    'ODEON TOUR': ['ODEON-'],
-    'PASSO TOUR': ['PASSO-'],
-    'PENINSULA': ['PENINSULA-'],
-    'PGM HOLIDAY': ['PGM HOLIDAY-'],
-    'RUSTAR': ['RUSTAR'],
-    'SETUR': ['SETUR'],
-    'SONAR TOUR': ['SONAR-'],
-    'SUMMER TOUR': ['SUMMER-'],
-    'TATILBUDUR': ['TATILBUDUR'],
-    'WEB': ['WEB-'],
-    'ZEYDE TURIZM': ['ZEYDE TURIZM']
-}
-
-def map_agency_group_partial(agency_name):
-    agency_upper = str(agency_name).upper()
-    for group_name, patterns in agency_group_rules.items():
-        for pattern in patterns:
-            # Проверяем начало строки или после пробела
-            if agency_upper.startswith(pattern.upper()) or f" {pattern.upper()}" in agency_upper:
-                return group_name
-    # Если ни одно правило не подошло, возвращаем SORSAT
-    return 'SORSAT'
-
-df_clean['agency_group'] = df_clean['agency'].apply(map_agency_group_partial)
-
 print(f"Найдено групп агентств: {df_clean['agency_group'].nunique()}")
-
-# ============================================
-# 6. ФИНАЛЬНАЯ ОЧИСТКА
-# ============================================
-print("🧹 Финальная очистка...")
-
-# Удаляем строки без месяца или рынка
-df_clean = df_clean.dropna(subset=['month', 'market']).copy()
-df_clean = df_clean.reset_index(drop=True)
-
 print(f"После удаления строк без month/market: {len(df_clean)}")
 
 # ============================================
@@ -203,24 +56,52 @@ print(f"После удаления строк без month/market: {len(df_clea
 print("📊 Группировка данных...")
 
 group_cols = ['month', 'market', 'agency_group', 'agency']
-df_grouped = df_clean.groupby(group_cols, dropna=False)[numeric_cols].sum(min_count=1).reset_index()
+with metrics.stage("aggregate"):
+    df_grouped = df_clean.groupby(group_cols, dropna=False)[numeric_cols].sum(min_count=1).reset_index()
+
+    # Создаем дополнительные сводки
+    df_by_group = df_grouped.groupby(['month', 'agency_group'], dropna=False).agg({
+        'arrival_room': 'sum',
+        'night_room': 'sum',
+        'eur_revenue': 'sum',
+        'eur_avg_perpaidpax': 'mean'
+    }).reset_index().sort_values('eur_revenue', ascending=False)
+
+    df_by_market = df_grouped.groupby(['month', 'market'], dropna=False).agg({
+        'arrival_room': 'sum',
+        'night_room': 'sum',
+        'eur_revenue': 'sum',
+        'eur_avg_perpaidpax': 'mean'
+    }).reset_index().sort_values('eur_revenue', ascending=False)
+
+if FX_PATH:
+    from engine.fx import load_rates
+    with metrics.stage("fx"):
+        rates = load_rates(FX_PATH)
+        df_grouped, df_by_group, df_by_market = (
+            rates.convert(df, method=FX_METHOD) for df in (df_grouped, df_by_group, df_by_market))
+    print(f"💱 Пересчет в валюты: {', '.join(rates.currencies)} ({FX_METHOD})")
 
 print(f"Итоговых записей после группировки: {len(df_grouped)}")
+metrics.rows({'summary': len(df_grouped), 'by_group': len(df_by_group), 'by_market': len(df_by_market)},
+             prefix='result.')
+
+# ============================================
+# 7.5 KPI-СВОДКА (до записи Excel)
+# ============================================
+with metrics.stage("kpi"):
+    kpis = agency_kpis({'Summary': df_grouped})
+totals = kpis['totals']
+print(f"📈 KPI: выручка {totals.get('eur_revenue', 0):,.2f} EUR, "
+      f"комнат {totals.get('arrival_room', 0):,.0f}, ночей {totals.get('night_room', 0):,.0f}, "
+      f"EUR/ночь {totals.get('eur_per_room_night', 0):,.2f}")
+for row in kpis['top_agency_groups'][:5]:
+    print(f"   {row['name']}: {row.get('eur_revenue', 0):,.2f} EUR")
 
-# Создаем дополнительные сводки
-df_by_group = df_grouped.groupby(['month', 'agency_group'], dropna=False).agg({
-    'arrival_room': 'sum',
-    'night_room': 'sum',
-    'eur_revenue': 'sum',
-    'eur_avg_perpaidpax': 'mean'
-}).reset_index().sort_values('eur_revenue', ascending=False)
-
-df_by_market = df_grouped.groupby(['month', 'market'], dropna=False).agg({
-    'arrival_room': 'sum',
-    'night_room': 'sum',
-    'eur_revenue': 'sum',
-    'eur_avg_perpaidpax': 'mean'
-}).reset_index().sort_values('eur_revenue', ascending=False)
+if PREVIEW_ONLY:
+    metrics.finish()
+    print(f"⏱ Этапы: {metrics.summary()}")
+    raise SystemExit(0)
 
 # ============================================
 # 8. ФОРМАТИРОВАНИЕ И ВИЗУАЛИЗАЦИЯ EXCEL
@@ -276,7 +157,7 @@ def format_worksheet(ws):
 # Графики удалены по запросу пользователя
 
 # Сохраняем с форматированием
-with pd.ExcelWriter(OUTPUT_PATH, engine='openpyxl') as writer:
+with metrics.stage("xlsx"), pd.ExcelWriter(OUTPUT_PATH, engine='openpyxl') as writer:
     # Записываем все листы
     df_grouped.to_excel(writer, sheet_name='Summary', index=False)
     df_by_group.to_excel(writer, sheet_name='By Agency Group', index=False)
@@ -288,6 +169,30 @@ with pd.ExcelWriter(OUTPUT_PATH, engine='openpyxl') as writer:
     for sheet_name in ['Summary', 'By Agency Group', 'By Market']:
         ws = workbook[sheet_name]
         format_worksheet(ws)
+metrics.add_output(OUTPUT_PATH)
+
+if SQLITE_PATH:
+    from engine.sqlite_export import export_sqlite
+    export_sqlite(SQLITE_PATH, {
+        'agency_summary': df_grouped,
+        'agency_by_group': df_by_group,
+        'agency_by_market': df_by_market
+    }, FILE_PATH, 'agency', metrics.file_hashes())
+    metrics.add_output(SQLITE_PATH)
+    print(f"🗄️ SQLite сохранен: {SQLITE_PATH}")
+
+if COLUMNAR_FORMATS:
+    from engine.columnar import export_columnar
+    paths = export_columnar(OUTPUT_PATH, {
+        'summary': df_grouped,
+        'by_group': df_by_group,
+        'by_market': df_by_market
+    }, COLUMNAR_FORMATS)
+    for path in paths:
+        metrics.add_output(path)
+    print(f"📦 Колоночные файлы: {', '.join(paths)}")
+
+metrics.finish()
 
 # ============================================
 # 9. СТАТИСТИКА
@@ -301,8 +206,12 @@ print(f"📊 Агентских групп: {df_grouped['agency_group'].nunique(
 print(f"🌍 Рынков: {df_grouped['market'].nunique()}")
 print(f"📅 Месяцев: {df_grouped['month'].nunique()}")
 print(f"💰 Общая выручка (EUR): {df_grouped['eur_revenue'].sum():,.2f}")
+if FX_PATH:
+    for currency in rates.currencies:
+        print(f"💱 Общая выручка ({currency}): {df_grouped[f'{currency.lower()}_revenue'].sum():,.2f}")
 print(f"🏨 Всего комнат: {df_grouped['arrival_room'].sum():,.0f}")
 print(f"🌙 Всего ночей: {df_grouped['night_room'].sum():,.0f}")
+print(f"⏱ Этапы: {metrics.summary()}")
 print("="*60)
 
 # Показываем распределение по группам
@@ -0,0 +1,114 @@
+import gc
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.filterwarnings('ignore')
+
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.agency import read_agency, clean_agency, aggregate_agency
+from engine.uyruk import load_reference, read_uyruk, parse_uyruk, build_uyruk_report
+
+AGENCY_FILE = "input-data/agency/agency.xlsx"
+UYRUK_FILE = "input-data/uyruk/uyruk.xlsx"
+PAIRS_FILE = "const/unique_region_country.xlsx"
+
+AGENCY_REPEAT = int(os.environ.get("BENCH_AGENCY_REPEAT", 1000))
+UYRUK_REPEAT = int(os.environ.get("BENCH_UYRUK_REPEAT", 100))
+
+# Peak RSS growth while the pipeline runs, as a multiple of the input frame size
+MAX_PEAK_RATIO = 3.0
+
+
+# ------------------------------
+# PEAK RSS SAMPLER
+# ------------------------------
+class PeakRSS:
+    """Samples the process RSS in a background thread (psutil), max over the block."""
+
+    def __init__(self, interval=0.002):
+        import psutil
+        self.process = psutil.Process()
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.baseline = self.peak = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+    @property
+    def growth(self):
+        return self.peak - self.baseline
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+# ------------------------------
+# CASES (one fresh process each)
+# ------------------------------
+def agency_case():
+    agency = read_agency(AGENCY_FILE)
+    return pd.concat([agency] * AGENCY_REPEAT, ignore_index=True), \
+        lambda df: aggregate_agency(clean_agency(df))
+
+
+def uyruk_case():
+    ref = load_reference(PAIRS_FILE)
+    uyruk = read_uyruk(UYRUK_FILE)
+    return pd.concat([uyruk] * UYRUK_REPEAT, ignore_index=True), \
+        lambda df: build_uyruk_report(parse_uyruk(df, ref))
+
+
+CASES = {"agency": agency_case, "uyruk": uyruk_case}
+
+
+def measure(name):
+    """(rows, input bytes, seconds, peak RSS growth) of one case, run in the calling process."""
+    df, pipeline = CASES[name]()
+    gc.collect()
+    t0 = time.perf_counter()
+    with PeakRSS() as mem:
+        pipeline(df)
+    return len(df), frame_bytes(df), time.perf_counter() - t0, mem.growth
+
+
+def run(name):
+    # A spawned process per case: the pipeline cannot reuse memory an earlier case freed
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        rows, size, elapsed, growth = pool.submit(measure, name).result()
+
+    ratio = growth / size
+    print(f"{name:<8} rows={rows:>9,}  input={size / 2**20:8.1f} MB  "
+          f"time={elapsed:6.2f}s  peak_growth={growth / 2**20:8.1f} MB  ratio={ratio:4.2f}")
+    assert ratio <= MAX_PEAK_RATIO, (
+        f"{name}: peak RSS grew {ratio:.2f}x the input frame (limit {MAX_PEAK_RATIO}x)"
+    )
+
+
+if __name__ == "__main__":
+    for name in CASES:
+        run(name)
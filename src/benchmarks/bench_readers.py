@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.filterwarnings('ignore')
+
+import pandas as pd
+
+from engine.agency import read_agency
+from engine.readers import available_backends, default_backend, read_sheet
+from engine.uyruk import read_uyruk
+
+AGENCY_FILE = "input-data/agency/agency.xlsx"
+UYRUK_FILE = "input-data/uyruk/uyruk.xlsx"
+PAIRS_FILE = "const/unique_region_country.xlsx"
+
+REPEAT = int(os.environ.get("BENCH_READER_REPEAT", 3))
+
+# Reference backend: the values every other backend has to reproduce exactly
+REFERENCE = "openpyxl"
+
+
+def best_time(read):
+    times = []
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        df = read()
+        times.append(time.perf_counter() - t0)
+    return df, min(times)
+
+
+def bench(name, path, read):
+    results = {backend: best_time(lambda: read(path, backend)) for backend in available_backends()}
+    expected = results[REFERENCE][0]
+    base_time = results[REFERENCE][1]
+
+    print(f"{name:<8} {os.path.basename(path)}  rows={len(expected):,}")
+    for backend, (df, seconds) in results.items():
+        pd.testing.assert_frame_equal(expected, df, check_exact=True)
+        print(f"   {backend:<18} {seconds:7.3f}s  x{base_time / seconds:5.1f}")
+
+
+if __name__ == "__main__":
+    # Extra exports on the command line: agency or Uyruk, told apart by file name
+    extra = sys.argv[1:]
+    print(f"Backends: {', '.join(available_backends())}  (auto: {default_backend()})\n")
+
+    bench("agency", AGENCY_FILE, lambda p, b: read_agency(p, backend=b))
+    bench("uyruk", UYRUK_FILE, lambda p, b: read_uyruk(p, backend=b))
+    bench("pairs", PAIRS_FILE, lambda p, b: read_sheet(p, backend=b))
+    for path in extra:
+        if "uyruk" in os.path.basename(path).lower():
+            bench("uyruk", path, lambda p, b: read_uyruk(p, backend=b))
+        else:
+            bench("agency", path, lambda p, b: read_agency(p, backend=b))
@@ -0,0 +1,37 @@
+import argparse
+import warnings
+warnings.filterwarnings('ignore')
+
+from engine.months import parse_months
+from engine.planner import MAP_REDUCE
+from engine.reports import run_cube_report
+
+# Конфигурация
+AGENCY_PATH = "input-data/agency/agency.xlsx"
+UYRUK_PATH = "input-data/uyruk/uyruk.xlsx"
+UNIQUE_PAIRS_PATH = "./const/unique_region_country.xlsx"
+OUTPUT_PATH = "output-data/agency_uyruk_cube.xlsx"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Куб: выручка групп агентств по национальностям гостей (agency_group × регион × страна × месяц)")
+    parser.add_argument("--agency", nargs="+", default=[AGENCY_PATH], help="выгрузки Agency")
+    parser.add_argument("--uyruk", nargs="+", default=[UYRUK_PATH], help="выгрузки Uyruk (AgencyGroup)")
+    parser.add_argument("--pairs", default=UNIQUE_PAIRS_PATH, help="таблица регион/страна")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="файл отчета .xlsx")
+    parser.add_argument("--months", nargs="+", help="только эти месяцы: 3 4, 3-5 или Mart Nisan")
+    parser.add_argument("--map-reduce", action="store_true",
+                        help="каждый месяц очищается в своем процессе (большие выгрузки, несколько ядер)")
+    args = parser.parse_args()
+
+    frames = run_cube_report(args.agency, args.uyruk, args.pairs, args.output, log=print, source="script",
+                             months=parse_months(args.months), strategy=MAP_REDUCE if args.map_reduce else None)
+
+    cube = frames["Cube"]
+    print(f"Ячеек куба: {len(cube):,}  групп: {cube['agency_group'].nunique()}  "
+          f"стран: {cube['country'].nunique()}  месяцев: {cube['month'].nunique()}")
+    if "difference" in frames["By Group"].columns:
+        gap = frames["By Group"]["difference"].abs().sum()
+        print(f"Расхождение Agency / Uyruk по группам и месяцам: {gap:,.2f} EUR")
+    print(f"✅ Отчет сохранен: {args.output}")
@@ -0,0 +1,233 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from engine.frames import enable_copy_on_write, to_numeric_column
+from engine.months import month_filter, select_months
+from engine.readers import read_sheet
+
+enable_copy_on_write()
+
+
+# ============================
+# REPORT DEFINITION
+# ============================
+MARKET_NAMES_MAP = {
+    'CIS_COMMONWEALTH OF INDEPENDENT STATES': 'CIS',
+    'DOMESTIC_DOMESTIC': 'DOMESTIC',
+    'EUROPE_EUROPE MARKET': 'EUROPE',
+    'MIDDLEEAST_MIDDLE EAST MARKET': 'ORTA DOĞU',
+    'OTHER_OTHER MARKETS': 'OTHER',
+    'FAR EASTERN_UZAK DOGU ULKERI': 'FAR EAST',
+    'FAR EASTER_UZAK DOGU ULKERI': 'FAR EAST'
+}
+
+AGENCY_GROUP_RULES = {
+    'Anex Tour': ['ANEX-'],
+    'AKAY TOUR': ['AKAY-'],
+    'ARELES (EUROPEHOL)': ['ARELES-'],
+    'BEDSOPIA / PRIME TRAVEL': ['BEDSOPIA'],
+    'BOOKING.COM': ['BOOKING.COM'],
+    'COMP': ['GM', 'COMP 3', 'SALES', 'KONSER', 'ATG', 'PANDEMI'],
+    'CORENDON': ['CORENDON'],
+    'DESTINATION SERVICES': ['DESTINATION-'],
+    'ETS': ['ETS'],
+    'EUROPE HOLIDAY': ['EUHOLIDAY-'],
+    'FIBULA TRAVEL': ['FIBULA-'],
+    'FIT TURIZM': ['FIT HOL-', 'FIT'],
+    'GROUP': ['GROUP-'],
+    'HOTELBEDS': ['HOTELBEDS-'],
+    'HOUSE USE': ['HOUSE USE'],
+    'INDIVIDUAL': ['INDIVIDUAL-'],
+    'ITS': ['ITS-'],
+    'KALANIT TOUR': ['KALANIT-'],
+    'KEYF TRAVEL': ['KEYF TRAVEL-', 'SUNQUEST-'],
+    'KILIT GLOBAL': ['KILIT-'],
+    'MEETING POINT': ['FTI-'],
+    'MOTUS': ['MOTUS-'],
+    'ODEON TOUR': ['ODEON-'],
+    'PASSO TOUR': ['PASSO-'],
+    'PENINSULA': ['PENINSULA-'],
+    'PGM HOLIDAY': ['PGM HOLIDAY-'],
+    'RUSTAR': ['RUSTAR'],
+    'SETUR': ['SETUR'],
+    'SONAR TOUR': ['SONAR-'],
+    'SUMMER TOUR': ['SUMMER-'],
+    'TATILBUDUR': ['TATILBUDUR'],
+    'WEB': ['WEB-'],
+    'ZEYDE TURIZM': ['ZEYDE TURIZM']
+}
+
+NUMERIC_COLS = ['arrival_room', 'arrival_paidpax', 'arrival_adult',
+                'arrival_paidchd', 'arrival_freechd', 'arrival_baby', 'night_room',
+                'night_paidpax', 'night_adult', 'night_paidchd', 'night_freechd',
+                'night_baby', 'local_revenue', 'eur_revenue', 'eur_rev.%',
+                'eur_avg_perroom', 'eur_avg_perpaidpax', 'avg_paidpax_night',
+                'avg_rm.night', 'r.occ_%', 'b.occ_%']
+
+SUMMARY_AGG = {
+    'arrival_room': 'sum',
+    'night_room': 'sum',
+    'eur_revenue': 'sum',
+    'eur_avg_perpaidpax': 'mean'
+}
+
+REPORT_YEAR = '2026'
+
+MONTH_PATTERN = r'\d{2}-[^\d]+'
+
+
+# ============================
+# 1. LOAD
+# ============================
+def normalize_columns(columns):
+    return (
+        columns.astype(str)
+        .str.strip()
+        .str.replace('\n', '_', regex=True)
+        .str.replace('_x000a_', '_', regex=True)
+        .str.replace(' ', '_', regex=True)
+        .str.replace('__+', '_', regex=True)
+        .str.replace(r'[^\w_%\.]', '', regex=True)
+        .str.lower()
+    )
+
+
+def is_header_label(value):
+    return value == "Agency"
+
+
+def month_rows(labels):
+    """Mask of the NN-MONTH header rows ("03-MART") of the label column."""
+    return labels.astype(str).str.match(MONTH_PATTERN, na=False).to_numpy()
+
+
+def read_agency(path, sheet=0, backend=None, schema=None, months=None):
+    """``schema`` (a ParsePlan) supplies the header row, the column names and the columns to read.
+
+    With ``months`` (and a ``schema``) only the rows of those months and the
+    label and measure columns are parsed (see ``read_sheet``'s ``rows``);
+    without a schema the whole sheet is read and then cut.
+    """
+    rows = None
+    if schema is None:
+        df = read_sheet(path, sheet, is_header=is_header_label, backend=backend)
+    else:
+        if months:
+            rows = month_filter(months, month_rows, is_market_label)
+        df = read_sheet(path, sheet, backend=backend, header_row=schema.header_row,
+                        usecols=schema.usecols if rows else schema.read_columns, rows=rows)
+
+    df = df.dropna(axis=0, how="all")
+    if rows is None:
+        # A row-bounded read has already dropped the columns empty in the whole sheet
+        df = df.dropna(axis=1, how="all")
+    df.columns = normalize_columns(df.columns) if schema is None else schema.normalize(df.columns)
+    if months and rows is None:
+        df = select_months(df, 'agency', month_rows, months, opens=is_market_label)
+    return df
+
+
+# ============================
+# 2-6. CLEAN
+# ============================
+def _carry(labels, state, key):
+    # Rows before the first header of this chunk belong to the previous chunk's label
+    if pd.notna(state.get(key)):
+        labels = labels.fillna(state[key])
+    if len(labels):
+        state[key] = labels.iloc[-1]
+    return labels
+
+
+def is_market_label(label):
+    """True for a market header row: the rows below it take their market from it."""
+    return str(label).strip().upper() in {k.upper() for k in MARKET_NAMES_MAP}
+
+
+@lru_cache(maxsize=65536)
+def map_agency_group(agency_name):
+    agency_upper = str(agency_name).upper()
+    for group_name, patterns in AGENCY_GROUP_RULES.items():
+        for pattern in patterns:
+            if agency_upper.startswith(pattern.upper()) or f" {pattern.upper()}" in agency_upper:
+                return group_name
+    return 'SORSAT'
+
+
+def clean_agency(df, numeric_cols=NUMERIC_COLS, counts=None, state=None):
+    """Month / market / agency_group labelling driven by boolean masks.
+
+    The input frame is never modified; the only materialised copy is the
+    final row selection of the columns the report needs. If ``counts`` is
+    a dict it receives the row count left after each cleaning step.
+
+    ``state`` (a dict) carries the open month / market from one chunk of a
+    sheet to the next when the sheet is read in chunks.
+    """
+    label = df['agency'].astype(str)
+
+    # Month header rows ("03-MART") open a month that lasts until the next header
+    month_rows = label.str.match(MONTH_PATTERN, na=False)
+    # Text between the first and second '-' (extract keeps a string dtype even without matches)
+    month = label.str.extract(r'^[^-]*-([^-]*)', expand=False).str.strip().where(month_rows).ffill()
+    if state is not None:
+        month = _carry(month, state, 'month')
+    month = month.mask(month == '')
+
+    # Market headers open a market; TOTAL / UK headers are service rows
+    upper = label.str.strip().str.upper()
+    market_keys = {k.upper(): v for k, v in MARKET_NAMES_MAP.items()}
+    is_market = upper.isin(market_keys)
+    market = upper.where(is_market).map(market_keys).ffill()
+    if state is not None:
+        market = _carry(market, state, 'market')
+    is_service = (
+        is_market
+        | upper.str.contains('TOTAL', regex=False)
+        | upper.str.contains('UK_UNITED KINGDOM', regex=False)
+    )
+
+    keep = (~month_rows & ~is_service & month.notna() & market.notna()).to_numpy()
+
+    if counts is not None:
+        counts['loaded'] = len(df)
+        counts['after_month_headers'] = int((~month_rows).sum())
+        counts['after_service_rows'] = int((~month_rows & ~is_service).sum())
+        counts['after_month_market'] = int(keep.sum())
+
+    cols = ['agency'] + [c for c in df.columns if c in numeric_cols]
+    df_clean = df.loc[keep, cols].reset_index(drop=True)
+    df_clean['month'] = month[keep].to_numpy()
+    df_clean['market'] = market[keep].to_numpy()
+
+    for col in numeric_cols:
+        if col in df_clean.columns:
+            df_clean[col] = to_numeric_column(df_clean[col])
+
+    # Each distinct agency name is classified once
+    codes, agencies = pd.factorize(df_clean['agency'], use_na_sentinel=False)
+    groups = np.array([map_agency_group(a) for a in agencies], dtype=object)
+    df_clean['agency_group'] = groups[codes]
+    return df_clean
+
+
+# ============================
+# 7. GROUP
+# ============================
+def aggregate_agency(df_clean, numeric_cols=NUMERIC_COLS, year=REPORT_YEAR):
+    df_clean = df_clean.assign(YIL=year)
+    numeric_cols = [c for c in numeric_cols if c in df_clean.columns]
+
+    group_cols = ['agency_group', 'YIL', 'month', 'market', 'agency']
+    df_grouped = df_clean.groupby(group_cols, dropna=False)[numeric_cols].sum(min_count=1).reset_index()
+
+    df_by_group = df_grouped.groupby(['month', 'agency_group']).agg(SUMMARY_AGG).reset_index()
+    df_by_market = df_grouped.groupby(['month', 'market']).agg(SUMMARY_AGG).reset_index()
+
+    return {
+        "Summary": df_grouped,
+        "By Group": df_by_group,
+        "By Market": df_by_market
+    }
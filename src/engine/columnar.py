@@ -0,0 +1,93 @@
+import os
+
+import pandas as pd
+
+PARQUET = "parquet"
+ARROW = "arrow"
+FORMATS = (PARQUET, ARROW)
+
+# Low-cardinality label columns stored as dictionary-encoded categoricals
+DIMENSION_COLS = {'yil', 'month', 'market', 'agency_group', 'agency', 'region', 'country'}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow çıktısı için 'pyarrow' paketi gerekli (pip install pyarrow)")
+    return pyarrow
+
+
+def _arrow_column_names(columns):
+    """Column names made unique as pandas reads duplicates back: case-sensitive, ``name.1``."""
+    seen = {}
+    names = []
+    for col in map(str, columns):
+        if col in seen:
+            seen[col] += 1
+            col = f"{col}.{seen[col]}"
+        else:
+            seen[col] = 0
+        names.append(col)
+    return names
+
+
+def to_table(df):
+    pa = _require_pyarrow()
+    names = _arrow_column_names(df.columns)
+    arrays = []
+    for i, name in enumerate(names):
+        s = df.iloc[:, i]
+        if name.lower() in DIMENSION_COLS and not pd.api.types.is_numeric_dtype(s.dtype):
+            s = s.astype('category')
+        arrays.append(pa.Array.from_pandas(s))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def sheet_slug(name):
+    return name.strip().lower().replace(' ', '_')
+
+
+def columnar_paths(output_file, sheet, fmt):
+    stem = os.path.splitext(output_file)[0]
+    return f"{stem}.{sheet_slug(sheet)}.{fmt}"
+
+
+def export_columnar(output_file, frames, formats):
+    """Write every result frame next to ``output_file`` as <stem>.<sheet>.parquet / .arrow."""
+    _require_pyarrow()
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    paths = []
+    for sheet, df in frames.items():
+        table = to_table(df)
+        for fmt in formats:
+            path = columnar_paths(output_file, sheet, fmt)
+            if fmt == PARQUET:
+                pq.write_table(table, path)
+            elif fmt == ARROW:
+                # Uncompressed Arrow IPC file so readers can memory-map it
+                feather.write_feather(table, path, compression='uncompressed')
+            else:
+                raise ValueError(f"Bilinmeyen çıktı formatı: {fmt}")
+            paths.append(path)
+    return paths
+
+
+def table_bytes(df, fmt):
+    """One frame as an in-memory Parquet or Arrow IPC file."""
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    sink = pa.BufferOutputStream()
+    table = to_table(df)
+    if fmt == PARQUET:
+        pq.write_table(table, sink)
+    elif fmt == ARROW:
+        feather.write_feather(table, sink, compression='uncompressed')
+    else:
+        raise ValueError(f"Bilinmeyen çıktı formatı: {fmt}")
+    return sink.getvalue().to_pybytes()
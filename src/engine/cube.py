@@ -0,0 +1,184 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from engine.agency import AGENCY_GROUP_RULES, map_agency_group
+from engine.frames import enable_copy_on_write
+from engine.kpi import KPI_MEASURES, measure_key
+from engine.months import month_number
+from engine.uyruk import measure_columns, parse_measures
+
+enable_copy_on_write()
+
+# Trailing words that differ between the two exports ('ANEX TOUR' / 'Anex Tour' / 'ANEX-')
+GENERIC_WORDS = {'TOUR', 'TOURS', 'TRAVEL', 'TURIZM', 'TUR', 'TOURISM'}
+
+CUBE_KEYS = ['month', 'agency_group', 'region', 'country']
+
+# The only measures the cube reads from either export; the loaders skip the other columns
+CUBE_COLUMNS = KPI_MEASURES
+
+# How an Uyruk agency name found its agency group
+EXACT = "group name"
+RULE = "group rule"
+UNMATCHED = "unmatched"
+
+
+# ------------------------------
+# AGENCY KEYS
+# ------------------------------
+def agency_key(name):
+    """'Anex Tour', 'ANEX TOUR' and 'ANEX-' → 'ANEX'."""
+    words = re.sub(r'[^0-9A-Z]+', ' ', str(name).upper()).split()
+    while len(words) > 1 and words[-1] in GENERIC_WORDS:
+        words.pop()
+    return ' '.join(words)
+
+
+def group_keys(rules=AGENCY_GROUP_RULES):
+    """{agency key: agency group} from the group names and their prefixes."""
+    keys = {}
+    for group, patterns in rules.items():
+        for name in [group] + patterns:
+            keys.setdefault(agency_key(name), group)
+    return keys
+
+
+def match_agencies(names, rules=AGENCY_GROUP_RULES):
+    """Agency group and match kind of each Uyruk agency name.
+
+    The nationality export names agencies at group level ('ANEX TOUR'), so
+    the names are matched on their normalised key first and through the
+    agency report's prefix rules second; what matches neither is SORSAT,
+    like an unknown agency in the agency report.
+    """
+    keys = group_keys(rules)
+    groups, kinds = [], []
+    for name in names:
+        group = keys.get(agency_key(name))
+        if group is not None:
+            groups.append(group)
+            kinds.append(EXACT)
+            continue
+        group = map_agency_group(name)
+        groups.append(group)
+        kinds.append(RULE if group != 'SORSAT' else UNMATCHED)
+    return pd.DataFrame({'Agency': list(names), 'agency_group': groups, 'match': kinds})
+
+
+# ------------------------------
+# CUBE
+# ------------------------------
+def _measures(df):
+    # KPI measures under their normalised names, in KPI_MEASURES order
+    found = {}
+    for col in df.columns:
+        key = measure_key(col)
+        if key in KPI_MEASURES and key not in found:
+            found[key] = df[col]
+    return {key: found[key] for key in KPI_MEASURES if key in found}
+
+
+def _codes(values, categories):
+    return pd.Categorical(values, categories=categories).codes.astype(np.int64)
+
+
+def _month_key(label):
+    # Month number, so 'MART' and 'Mart' meet; other labels by their text, after the months
+    number = month_number(label)
+    return (number, "") if number else (13, str(label).strip().upper())
+
+
+def _month_codes(uyruk_months, agency_months):
+    """(Uyruk codes, agency codes, display labels) of the months of both exports.
+
+    The shared code is the month number in calendar order; a month is
+    shown under its Uyruk spelling, else the agency report's.
+    """
+    labels = {}
+    for values in (uyruk_months, agency_months):
+        for label in values.dropna().unique():
+            labels.setdefault(_month_key(label), label)
+    keys = sorted(labels)
+    position = {key: i for i, key in enumerate(keys)}
+
+    def codes(values):
+        code_of = {label: position[_month_key(label)] for label in values.dropna().unique()}
+        return values.map(code_of).fillna(-1).to_numpy(np.int64)
+    return codes(uyruk_months), codes(agency_months), [labels[key] for key in keys]
+
+
+def build_cube(df_agency, df_uyruk):
+    """agency_group × region × country × month cube of the two cleaned exports.
+
+    ``df_agency`` is ``clean_agency`` output, ``df_uyruk`` ``parse_uyruk``
+    output. Every key becomes a categorical code (months by their month
+    number, so differently cased labels meet); the Uyruk rows are summed
+    with one groupby on the codes, and the agency report's group / month
+    totals are looked up by the combined code (group * months + month)
+    instead of a merge. ``share`` is the country's part of the group's
+    month revenue in the nationality export, ``allocated_eur_revenue``
+    spreads the agency report's revenue of that group and month by it.
+
+    Returns {"Cube", "By Group", "Matches"}.
+    """
+    uyruk = parse_measures(df_uyruk.copy())
+    measures = _measures(uyruk[measure_columns(uyruk)])
+
+    # Each distinct Uyruk agency name is matched once
+    agency_codes, agencies = pd.factorize(uyruk['Agency'].astype(str), sort=True)
+    matches = match_agencies(agencies)
+    uyruk_group = matches['agency_group'].to_numpy(dtype=object)[agency_codes]
+
+    # Shared categories: the same group / month has the same code on both sides
+    groups = sorted(set(uyruk_group) | set(df_agency['agency_group'].dropna()))
+    uyruk_months, agency_months, months = _month_codes(uyruk['Month'], df_agency['month'])
+    n_months = len(months)
+
+    cube = pd.DataFrame({
+        'month': pd.Categorical.from_codes(uyruk_months, months),
+        'agency_group': pd.Categorical.from_codes(_codes(uyruk_group, groups), groups),
+        'region': uyruk['Region'].astype('category'),
+        'country': uyruk['Country'].astype('category'),
+        **{k: s.to_numpy() for k, s in measures.items()},
+    })
+    cube = cube.groupby(CUBE_KEYS, observed=True, sort=True)[list(measures)].sum().reset_index()
+
+    def combined(frame):
+        return frame['agency_group'].cat.codes.to_numpy(np.int64) * n_months + frame['month'].cat.codes.to_numpy()
+
+    # Group / month totals of both exports on the combined key
+    size = len(groups) * n_months
+    cube_key = combined(cube)
+    by_group = cube.groupby(['month', 'agency_group'], observed=True, sort=True)[list(measures)].sum().reset_index()
+
+    if 'eur_revenue' in cube.columns:
+        group_codes = _codes(df_agency['agency_group'], groups)
+        valid = (group_codes >= 0) & (agency_months >= 0)
+        agency_revenue = df_agency['eur_revenue'].fillna(0).to_numpy(float)
+        agency_total = np.bincount((group_codes * n_months + agency_months)[valid], weights=agency_revenue[valid],
+                                   minlength=size)
+        uyruk_total = np.bincount(cube_key, weights=cube['eur_revenue'].to_numpy(float), minlength=size)
+
+        denominator = uyruk_total[cube_key]
+        share = np.divide(cube['eur_revenue'].to_numpy(float), denominator,
+                          out=np.zeros(len(cube)), where=denominator != 0)
+        cube['share'] = share.round(6)
+        cube['agency_eur_revenue'] = agency_total[cube_key]
+        cube['allocated_eur_revenue'] = (share * agency_total[cube_key]).round(2)
+
+        by_group['agency_eur_revenue'] = agency_total[combined(by_group)]
+        by_group = by_group.rename(columns={'eur_revenue': 'uyruk_eur_revenue'})
+        by_group['difference'] = (by_group['agency_eur_revenue'] - by_group['uyruk_eur_revenue']).round(2)
+
+    for frame in (cube, by_group):
+        for col in ('month', 'agency_group', 'region', 'country'):
+            if col in frame.columns:
+                frame[col] = frame[col].astype(str)
+
+    return {
+        "Cube": cube,
+        "By Group": by_group,
+        "Matches": matches.sort_values(['match', 'Agency']).reset_index(drop=True),
+    }
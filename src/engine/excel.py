@@ -0,0 +1,69 @@
+import openpyxl
+import pandas as pd
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
+
+
+def format_ws(ws):
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF', size=11)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+
+    # Header
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+
+    # Data rows
+    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
+        for cell in row:
+            cell.border = border
+            if isinstance(cell.value, (int, float)):
+                cell.number_format = "#,##0.00"
+
+    # Auto width
+    for column in ws.columns:
+        max_len = 0
+        col_letter = get_column_letter(column[0].column)
+        for c in column:
+            if c.value:
+                max_len = max(max_len, len(str(c.value)))
+        ws.column_dimensions[col_letter].width = min(max_len + 2, 50)
+
+    ws.freeze_panes = "A2"
+
+
+def stream_workbook(path, frames, chunk_rows=10_000):
+    """Unformatted workbook written row by row (openpyxl write-only mode).
+
+    Memory stays flat however large the frames are; cell values match
+    ``DataFrame.to_excel(index=False)``.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for name, df in frames.items():
+        ws = wb.create_sheet(name)
+        ws.append([str(c) for c in df.columns])
+        for start in range(0, len(df), chunk_rows):
+            block = df.iloc[start:start + chunk_rows].astype(object)
+            for row in block.where(block.notna(), None).itertuples(index=False, name=None):
+                ws.append(row)
+    wb.save(path)
+    return path
+
+
+def write_workbook(path, frames, formatted=True):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for name, df in frames.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+        if formatted:
+            for name in frames:
+                format_ws(writer.book[name])
+    return path
@@ -0,0 +1,29 @@
+import pandas as pd
+
+
+def enable_copy_on_write():
+    # pandas >= 3.0 always uses Copy-on-Write; on 2.x it has to be switched on
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+
+
+def to_numeric_column(s, decimal_comma=False):
+    """Parse an export column into numbers.
+
+    Columns Excel already typed as numbers are returned as is; only text
+    columns go through the string clean-up.
+    """
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s
+
+    text = s.astype(str)
+    if decimal_comma:
+        # "1.234,56" → 1234.56
+        text = (
+            text.str.replace('.', '', regex=False)
+            .str.replace(',', '.', regex=False)
+            .str.replace(r'[^0-9.-]', '', regex=True)
+        )
+    else:
+        text = text.str.replace(',', '.').str.replace(' ', '')
+    return pd.to_numeric(text, errors='coerce')
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from engine.agency import REPORT_YEAR
+from engine.frames import to_numeric_column
+from engine.months import month_number
+
+# Rates are units of the currency per 1 EUR (the exports' base currency)
+BASE = "EUR"
+
+MONTH_AVERAGE = "average"
+MONTH_END = "month-end"
+METHODS = (MONTH_AVERAGE, MONTH_END)
+
+
+def fx_column(column, currency):
+    """'eur_revenue' → 'usd_revenue'."""
+    return f"{currency.lower()}_{column[len(BASE) + 1:]}"
+
+
+def revenue_columns(df):
+    # Amounts in EUR; shares ('eur_rev.%') do not change with the currency
+    prefix = f"{BASE.lower()}_"
+    return [c for c in df.columns
+            if str(c).startswith(prefix) and '%' not in str(c) and pd.api.types.is_numeric_dtype(df[c])]
+
+
+# ------------------------------
+# RATE TABLE
+# ------------------------------
+class FxRates:
+    """A local rate table: a date column and one column per currency.
+
+        date;USD;TRY
+        2026-03-01;1.08;38.9
+        2026-03-02;1.09;39.1
+
+    Daily, weekly or one row per month all work; each report month takes
+    the average of its rows (``average``) or the last rate on or before
+    the month's end (``month-end``).
+    """
+
+    def __init__(self, rates, path=None):
+        self.rates = rates.sort_index()
+        self.currencies = list(rates.columns)
+        self.path = path
+
+    def month_rates(self, months, year=REPORT_YEAR, method=MONTH_AVERAGE):
+        """Rate matrix (len(months) × currencies) of the report month labels; NaN where none applies."""
+        if method not in METHODS:
+            raise ValueError(f"Kur yöntemi: {', '.join(METHODS)}")
+        numbers = [month_number(m) for m in months]
+        starts = pd.to_datetime(
+            [f"{year}-{n:02d}-01" if n else None for n in numbers]).to_series(index=range(len(months)))
+
+        if method == MONTH_AVERAGE:
+            table = self.rates.groupby(self.rates.index.to_period('M')).mean()
+            table.index = table.index.to_timestamp()
+            on = starts
+        else:
+            table = self.rates
+            on = starts + pd.offsets.MonthEnd(0)
+
+        # As-of join: the latest table row at or before each month (backward)
+        left = pd.DataFrame({'at': on, 'row': range(len(months))}).dropna().sort_values('at')
+        right = table.rename_axis('at').reset_index()
+        joined = pd.merge_asof(left, right, on='at', direction='backward')
+
+        matrix = np.full((len(months), len(self.currencies)), np.nan)
+        matrix[joined['row'].to_numpy()] = joined[self.currencies].to_numpy(float)
+        return matrix
+
+    def convert(self, df, month_col='month', year=REPORT_YEAR, method=MONTH_AVERAGE):
+        """``df`` with a converted column per EUR amount and currency ('usd_revenue', ...)."""
+        columns = revenue_columns(df)
+        if not columns or month_col not in df.columns:
+            return df
+
+        codes, months = pd.factorize(df[month_col], use_na_sentinel=False)
+        rates = self.month_rates(list(months), year, method)[codes]
+        # rows × amounts × currencies in one broadcast
+        values = df[columns].to_numpy(float)[:, :, None] * rates[:, None, :]
+
+        converted = {
+            fx_column(col, currency): values[:, i, j]
+            for i, col in enumerate(columns) for j, currency in enumerate(self.currencies)
+        }
+        return df.assign(**converted)
+
+    def added_columns(self, df):
+        names = {fx_column(col, cur) for col in revenue_columns(df) for cur in self.currencies}
+        return [c for c in df.columns if c in names]
+
+    def convert_frames(self, frames, year=REPORT_YEAR, method=MONTH_AVERAGE):
+        return {name: self.convert(df, year=year, method=method) for name, df in frames.items()}
+
+
+def load_rates(path):
+    """FxRates of a CSV (',' or ';') or xlsx rate table."""
+    if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm"):
+        from engine.readers import read_sheet
+        table = read_sheet(path)
+    else:
+        table = pd.read_csv(path, sep=None, engine="python")
+
+    table.columns = [str(c).strip() for c in table.columns]
+    date_col, currencies = table.columns[0], [c.upper() for c in table.columns[1:]]
+    if not currencies:
+        raise ValueError(f"{os.path.basename(path)}: tarih sütunundan sonra en az bir kur sütunu olmalı")
+
+    dates = pd.to_datetime(table[date_col].astype(str).str.strip(), errors='coerce', format='mixed')
+    rates = table.iloc[:, 1:].apply(to_numeric_column)
+    rates.columns = currencies
+    rates.index = pd.DatetimeIndex(dates)
+    rates = rates[rates.index.notna()]
+    if rates.empty:
+        raise ValueError(f"{os.path.basename(path)}: okunabilir tarihli kur satırı yok")
+    return FxRates(rates, path)
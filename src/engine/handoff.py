@@ -0,0 +1,130 @@
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+import traceback
+import uuid
+
+HANDOFF_ROOT = os.path.join(tempfile.gettempdir(), "rapor-handoff")
+
+_LOG = "log"
+_DONE = "done"
+_ERROR = "error"
+_KPI = "kpi"
+
+
+# ------------------------------
+# PUBLISH / MAP
+# ------------------------------
+def publish_results(frames, directory=None):
+    """Write result frames as uncompressed Arrow IPC files; returns {sheet: path}."""
+    import pyarrow as pa
+    from engine.columnar import to_table
+
+    directory = directory or os.path.join(HANDOFF_ROOT, uuid.uuid4().hex)
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = {}
+    for i, (sheet, df) in enumerate(frames.items()):
+        table = to_table(df)
+        path = os.path.join(directory, f"{i:02d}.arrow")
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        manifest[sheet] = path
+    return manifest
+
+
+def _types_mapper(arrow_type):
+    import pandas as pd
+    import pyarrow as pa
+    # Dictionary columns become pandas categoricals, everything else stays on the Arrow buffers
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def map_results(manifest):
+    """Open published results as DataFrames backed by memory-mapped Arrow buffers (no copy)."""
+    import pyarrow as pa
+
+    frames = {}
+    for sheet, path in manifest.items():
+        source = pa.memory_map(path, "r")
+        table = pa.ipc.open_file(source).read_all()
+        frames[sheet] = table.to_pandas(types_mapper=_types_mapper)
+    return frames
+
+
+def cleanup_handoff(max_age_hours=24):
+    """Remove handoff folders of earlier sessions."""
+    if not os.path.isdir(HANDOFF_ROOT):
+        return
+    limit = time.time() - max_age_hours * 3600
+    for name in os.listdir(HANDOFF_ROOT):
+        path = os.path.join(HANDOFF_ROOT, name)
+        try:
+            if os.path.getmtime(path) < limit:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+# ------------------------------
+# RUN A REPORT IN A CHILD PROCESS
+# ------------------------------
+def _child_main(kind, kwargs, messages):
+    try:
+        import warnings
+        warnings.filterwarnings('ignore')
+        from engine.reports import AGENCY, run_agency_report, run_uyruk_report
+
+        log = lambda message: messages.put((_LOG, message))
+        on_kpis = lambda kpis: messages.put((_KPI, kpis))
+        if kind == AGENCY:
+            frames = run_agency_report(log=log, on_kpis=on_kpis, **kwargs)
+        else:
+            frames = run_uyruk_report(log=log, on_kpis=on_kpis, **kwargs)
+
+        messages.put((_DONE, publish_results(frames)))
+    except BaseException as e:
+        if isinstance(e, MemoryError):
+            from engine.planner import MEMORY_ERROR_MESSAGE
+            e = MEMORY_ERROR_MESSAGE
+        messages.put((_ERROR, f"{e}\n{traceback.format_exc()}"))
+
+
+def run_report_in_process(kind, kwargs, log=print, poll=0.2, on_kpis=None):
+    """Run a report in a separate process and map its results back without copying.
+
+    ``on_kpis`` receives the KPI summary the child sends ahead of its workbook.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    messages = ctx.Queue()
+    # Not a daemon: the report may start its own parse pool for multi-file inputs
+    process = ctx.Process(target=_child_main, args=(kind, kwargs, messages))
+    process.start()
+
+    try:
+        while True:
+            try:
+                tag, payload = messages.get(timeout=poll)
+            except queue.Empty:
+                if not process.is_alive():
+                    raise RuntimeError(f"Rapor süreci beklenmedik şekilde sonlandı (kod {process.exitcode})")
+                continue
+
+            if tag == _LOG:
+                log(payload)
+            elif tag == _KPI:
+                if on_kpis is not None:
+                    on_kpis(payload)
+            elif tag == _ERROR:
+                raise RuntimeError(payload.split("\n", 1)[0])
+            else:
+                return map_results(payload)
+    finally:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
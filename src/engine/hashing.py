@@ -0,0 +1,10 @@
+import hashlib
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from engine.kpi import kpi_measures
+from engine.months import month_number
+from engine.schema import AGENCY, UYRUK
+
+# Drill-down levels of each report, top first: (result sheet, [columns]).
+# The month column is always the last level, so an agency opens into its month trend.
+LEVELS = {
+    AGENCY: ("Summary", ['market', 'agency_group', 'agency', 'month']),
+    UYRUK: ("Uyruk", ['Region', 'Country', 'Agency', 'Month']),
+}
+
+
+def _month_rank(names):
+    # Calendar order; labels that are not month names go last, alphabetically
+    return sorted(range(len(names)), key=lambda i: (month_number(names[i]) or 13, names[i]))
+
+
+def _level_codes(values, calendar=False):
+    """(codes, names) of one level column; names sorted (calendar order for months)."""
+    codes, names = pd.factorize(pd.Series(values).fillna("").astype(str), sort=not calendar)
+    names = np.asarray(names, dtype=object)
+    if calendar:
+        order = _month_rank(names)
+        rank = np.empty(len(names), dtype=np.int64)
+        rank[order] = np.arange(len(names))
+        codes, names = rank[codes], names[order]
+    return codes, names
+
+
+# ------------------------------
+# HIERARCHY INDEX
+# ------------------------------
+class HierarchyIndex:
+    """Pre-summed drill-down tree over a result's rows.
+
+    The rows are sorted once by every level; each node is then a
+    contiguous range of that order, so a node stores only its row range,
+    its summed measures and the range of its children. Nodes are numbered
+    level by level (0 .. len-1) and kept in flat arrays: ``children``,
+    ``parent`` and ``totals`` are lookups, never a regroup, so expanding a
+    node costs O(children).
+    """
+
+    def __init__(self, report, df):
+        sheet, columns = LEVELS[report]
+        self.report = report
+        self.sheet = sheet
+        self.levels = columns
+        self.rows = len(df)
+
+        measures = kpi_measures(df, decimal_comma=report == UYRUK)
+        self.measures = list(measures)
+        values = np.column_stack([s.to_numpy(dtype=float) for s in measures.values()]) if measures \
+            else np.zeros((len(df), 0))
+
+        codes = []
+        names = []
+        for col in columns:
+            c, n = _level_codes(df[col], calendar=col == columns[-1])
+            codes.append(c)
+            names.append(n)
+        # np.lexsort sorts by its last key first
+        self.order = np.lexsort(codes[::-1]) if len(df) else np.arange(0)
+        values = values[self.order]
+
+        starts, stops, labels, sums, levels = [], [], [], [], []
+        change = np.zeros(len(df), dtype=bool)
+        for depth, (c, n) in enumerate(zip(codes, names)):
+            c = c[self.order]
+            if len(c):
+                change[0] = True
+                change[1:] |= c[1:] != c[:-1]
+            level_starts = np.flatnonzero(change)
+            starts.append(level_starts)
+            stops.append(np.append(level_starts[1:], len(df)))
+            labels.append(n[c[level_starts]])
+            sums.append(np.add.reduceat(values, level_starts, axis=0) if len(level_starts)
+                        else np.zeros((0, values.shape[1])))
+            levels.append(np.full(len(level_starts), depth))
+
+        # Global node ids: level 0 first, then level 1, ...
+        offsets = np.cumsum([0] + [len(s) for s in starts])
+        child_lo, child_hi, parent = [], [], []
+        for depth in range(len(columns)):
+            if depth + 1 < len(columns):
+                below = starts[depth + 1]
+                child_lo.append(np.searchsorted(below, starts[depth]) + offsets[depth + 1])
+                child_hi.append(np.searchsorted(below, stops[depth]) + offsets[depth + 1])
+            else:
+                child_lo.append(np.zeros(len(starts[depth]), dtype=np.int64))
+                child_hi.append(child_lo[-1])
+            if depth == 0:
+                parent.append(np.full(len(starts[0]), -1))
+            else:
+                parent.append(np.searchsorted(starts[depth - 1], starts[depth], side='right') - 1
+                              + offsets[depth - 1])
+
+        self._roots = len(starts[0])
+        self._start = np.concatenate(starts)
+        self._stop = np.concatenate(stops)
+        self._name = np.concatenate(labels)
+        self._sums = np.concatenate(sums)
+        self._level = np.concatenate(levels)
+        self._child_lo = np.concatenate(child_lo)
+        self._child_hi = np.concatenate(child_hi)
+        self._parent = np.concatenate(parent)
+
+    def __len__(self):
+        return len(self._start)
+
+    def children(self, node=None):
+        """Node ids below ``node`` (None: the top level), in display order."""
+        if node is None:
+            return range(self._roots)
+        return range(int(self._child_lo[node]), int(self._child_hi[node]))
+
+    def parent(self, node):
+        """Parent node id, None for a top-level node."""
+        parent = int(self._parent[node])
+        return None if parent < 0 else parent
+
+    def position(self, node):
+        """Row of ``node`` among its siblings."""
+        parent = self.parent(node)
+        return node if parent is None else node - int(self._child_lo[parent])
+
+    def name(self, node):
+        return self._name[node]
+
+    def level(self, node):
+        return int(self._level[node])
+
+    def row_range(self, node):
+        """(start, stop) of the node in the sorted order."""
+        return int(self._start[node]), int(self._stop[node])
+
+    def row_positions(self, node):
+        """Positions of the node's rows in the result sheet."""
+        start, stop = self.row_range(node)
+        return self.order[start:stop]
+
+    def totals(self, node=None):
+        """{measure: sum} of a node (None: the whole result), with EUR per room night."""
+        sums = self._sums[node] if node is not None else self._sums[:self._roots].sum(axis=0)
+        totals = dict(zip(self.measures, sums.tolist()))
+        if totals.get('night_room') and 'eur_revenue' in totals:
+            totals['eur_per_room_night'] = totals['eur_revenue'] / totals['night_room']
+        return totals
+
+
+def build_hierarchy(report, frames):
+    """HierarchyIndex of a report's result frames (``aggregate_agency`` / ``build_uyruk_report``)."""
+    sheet, _ = LEVELS[report]
+    return HierarchyIndex(report, frames[sheet])
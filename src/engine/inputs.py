@@ -0,0 +1,386 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from engine import agency, uyruk
+from engine.agency import NUMERIC_COLS, read_agency, clean_agency
+from engine.mapreduce import map_reduce_agency, map_reduce_uyruk
+from engine.metrics import stage
+from engine.months import describe_months, select_months
+from engine.planner import IN_MEMORY, STREAMING, make_plan
+from engine.schema import (AGENCY, HEADER_SCAN_ROWS, UYRUK, SchemaError, read_header_blocks, sheet_header,
+                           sheet_plan)
+from engine.streaming import stream_agency, stream_uyruk
+from engine.uyruk import read_uyruk, parse_uyruk
+
+
+def as_list(inputs):
+    return [inputs] if isinstance(inputs, (str, os.PathLike)) else list(inputs)
+
+
+def describe_inputs(inputs):
+    names = [os.path.basename(p) for p in as_list(inputs)]
+    if len(names) == 1:
+        return names[0]
+    return f"{names[0]} +{len(names) - 1}"
+
+
+# ============================
+# REPORT TYPE DETECTION
+# ============================
+def detect_report(path, scan_rows=HEADER_SCAN_ROWS):
+    """'agency' / 'uyruk' from the header row of the first sheet, None if neither."""
+    blocks = read_header_blocks(path, scan_rows)
+    found = sheet_header(next(iter(blocks.values()), []))
+    return found and found[0]
+
+
+def report_schemas(path, kind, scan_rows=HEADER_SCAN_ROWS):
+    """{sheet: ParsePlan} of the sheets in ``path`` that carry a ``kind`` export.
+
+    Only the header block of each sheet is read; a sheet whose header does
+    not fit the report raises SchemaError here, before any body is parsed.
+    """
+    schemas = {}
+    for sheet, rows in read_header_blocks(path, scan_rows).items():
+        schema = sheet_plan(path, sheet, rows, kind)
+        if schema is not None:
+            schemas[sheet] = schema
+    return schemas
+
+
+def report_sheets(path, kind, scan_rows=HEADER_SCAN_ROWS):
+    """Names of the sheets in ``path`` that carry a ``kind`` export."""
+    return list(report_schemas(path, kind, scan_rows))
+
+
+def input_schemas(inputs, kind):
+    """{(path, sheet): ParsePlan}, oldest file first so newer exports win on overlapping months."""
+    paths = sorted(as_list(inputs), key=lambda p: (os.path.getmtime(p), p))
+    schemas = {}
+    for path in paths:
+        sheets = report_schemas(path, kind)
+        if not sheets:
+            header = "Agency" if kind == AGENCY else "AgencyGroup"
+            raise SchemaError(f"{os.path.basename(path)}: '{header}' başlık satırı bulunamadı")
+        schemas.update(((path, sheet), schema) for sheet, schema in sheets.items())
+    return schemas
+
+
+def expand_inputs(inputs, kind):
+    """(path, sheet) parts, oldest file first so newer exports win on overlapping months."""
+    return list(input_schemas(inputs, kind))
+
+
+# ============================
+# PROJECTION
+# ============================
+def project_schemas(schemas, columns):
+    """``schemas`` reading only the label column and the measures among ``columns``.
+
+    ``columns`` are the measures a report declares it needs (None: all of
+    them); the readers then skip every other cell of the sheet.
+    """
+    if columns is None:
+        return schemas
+    return {part: schema.project(columns) for part, schema in schemas.items()}
+
+
+def _cache_kind(kind, sheet, schema):
+    # A projected frame lacks columns a full read has, so it is cached apart
+    if schema is None or schema.read_columns is None:
+        return kind, sheet
+    return kind, sheet, tuple(schema.read_columns)
+
+
+# ============================
+# PARALLEL PARSE
+# ============================
+def _parse_agency_part(path, sheet, numeric_cols, schema=None, months=None):
+    import warnings
+    warnings.filterwarnings('ignore')
+    counts = {}
+    df = _read_part(None, AGENCY, path, sheet, schema, months)
+    return clean_agency(df, numeric_cols, counts=counts), counts
+
+
+def _parse_uyruk_part(path, sheet, ref, schema=None, months=None):
+    import warnings
+    warnings.filterwarnings('ignore')
+    counts = {}
+    df = _read_part(None, UYRUK, path, sheet, schema, months, ref)
+    return parse_uyruk(df, ref, counts=counts), counts
+
+
+def _parse_parts(func, parts, extra, max_workers, schemas=None, months=None):
+    schemas = schemas or {}
+    workers = min(len(parts), max_workers or os.cpu_count() or 1)
+    if workers == 1:
+        return [func(path, sheet, extra, schemas.get((path, sheet)), months) for path, sheet in parts]
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = [pool.submit(func, path, sheet, extra, schemas.get((path, sheet)), months)
+                   for path, sheet in parts]
+        return [f.result() for f in futures]
+
+
+def dedupe_months(frames, month_col, labels, log):
+    """Each month is taken from the last (newest) part that contains it."""
+    owner = {}
+    for i, df in enumerate(frames):
+        for month in df[month_col].dropna().unique():
+            owner[month] = i
+
+    kept = []
+    for i, df in enumerate(frames):
+        own = [m for m, o in owner.items() if o == i]
+        mask = df[month_col].isin(own)
+        if not mask.all():
+            dropped = sorted(set(df.loc[~mask, month_col].dropna()))
+            if dropped:
+                log(f"↺ {labels[i]}: {', '.join(map(str, dropped))} daha yeni bir kaynaktan alındı")
+            df = df[mask]
+        kept.append(df)
+    return kept
+
+
+def _merge_counts(all_counts):
+    total = {}
+    for counts in all_counts:
+        for key, value in counts.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+# ============================
+# EXECUTION PLAN
+# ============================
+def plan_inputs(inputs, kind, memory_fraction=None, strategy=None, log=print):
+    """Expand ``inputs`` into sheets and decide between in-memory and streaming reads.
+
+    The sheets' header layouts are checked first (SchemaError for a wrong file).
+    """
+    schemas = input_schemas(inputs, kind)
+    plan = make_plan(list(schemas), kind, memory_fraction, strategy)
+    plan.schemas = schemas
+    log(plan.describe())
+    return plan
+
+
+# ============================
+# SPECULATIVE PRE-PARSE
+# ============================
+_READERS = {AGENCY: read_agency, UYRUK: read_uyruk}
+
+
+def preparse(inputs, kind, parse_cache, cancelled=None):
+    """Parse the sheets of ``inputs`` into ``parse_cache`` ahead of a run.
+
+    Reads exactly the frames the loaders look up, so the run that follows
+    takes them from the cache. Nothing is read when the run would stream
+    or the sheets would not all fit in the cache; ``cancelled()`` is checked
+    before each sheet. Returns the cache keys [((kind, sheet), path)] filled.
+    """
+    schemas = input_schemas(inputs, kind)
+    plan = make_plan(list(schemas), kind)
+    if plan.strategy != IN_MEMORY or len(schemas) > parse_cache.max_entries:
+        return []
+
+    read = _READERS[kind]
+    filled = []
+    for (path, sheet), schema in schemas.items():
+        if cancelled is not None and cancelled():
+            break
+        parse_cache.get((kind, sheet), path, lambda p, sheet=sheet, schema=schema: read(p, sheet=sheet, schema=schema))
+        filled.append(((kind, sheet), path))
+    return filled
+
+
+def _cached_parts(parse_cache, kind, parts, schemas):
+    # Frames of every part when all were parsed before (e.g. pre-parsed), else None
+    if parse_cache is None:
+        return None
+    frames = [parse_cache.peek(_cache_kind(kind, sheet, schemas.get((path, sheet))), path) for path, sheet in parts]
+    return None if any(df is None for df in frames) else frames
+
+
+def _cut_months(kind, df, months, ref=None):
+    # The ``months`` rows of a whole-sheet frame
+    if kind == AGENCY:
+        return select_months(df, 'agency', agency.month_rows, months, opens=agency.is_market_label)
+    return select_months(df, 'agencygroup', uyruk.month_rows, months, opens=ref.opens)
+
+
+def _read_part(parse_cache, kind, path, sheet, schema, months=None, ref=None):
+    """Uncleaned frame of one part, only the rows of ``months`` when given.
+
+    A month filter cuts a whole-sheet frame the parse cache already holds;
+    otherwise only the months' rows are read (see ``read_agency``), and
+    that partial frame is not cached.
+    """
+    read = _READERS[kind]
+    cache_kind = _cache_kind(kind, sheet, schema)
+    if months:
+        cached = None if parse_cache is None else parse_cache.peek(cache_kind, path)
+        if cached is not None:
+            return _cut_months(kind, cached, months, ref)
+        if kind == AGENCY:
+            return read_agency(path, sheet=sheet, schema=schema, months=months)
+        return read_uyruk(path, sheet=sheet, schema=schema, months=months, ref=ref)
+    if parse_cache is None:
+        return read(path, sheet=sheet, schema=schema)
+    return parse_cache.get(cache_kind, path, lambda p: read(p, sheet=sheet, schema=schema))
+
+
+def _read_parts(parse_cache, kind, parts, schemas, metrics, months=None, ref=None):
+    # Uncleaned frames of every part, through the parse cache when there is one
+    with stage(metrics, "read"):
+        return [_read_part(parse_cache, kind, path, sheet, schemas.get((path, sheet)), months, ref)
+                for path, sheet in parts]
+
+
+def _merge_parts(results, parts, month_col, final_count, counts, log, metrics):
+    if counts is not None:
+        counts.update(_merge_counts(c for _, c in results))
+    if len(results) == 1:
+        return results[0][0]
+
+    labels = [f"{os.path.basename(p)}[{s}]" for p, s in parts]
+    with stage(metrics, "merge"):
+        frames = dedupe_months([df for df, _ in results], month_col, labels, log)
+        df_clean = pd.concat(frames, ignore_index=True)
+    if counts is not None:
+        counts[final_count] = len(df_clean)
+    return df_clean
+
+
+def _with_fallback(plan, load, log):
+    # An underestimated in-memory run switches to streaming instead of failing
+    try:
+        return load()
+    except MemoryError:
+        log("⚠️ Bellek yetmedi, parçalı okumaya geçiliyor...")
+        plan.strategy = STREAMING
+        return None
+
+
+# ============================
+# LOADERS (one file or many files / sheets)
+# ============================
+def load_agency(inputs, numeric_cols=NUMERIC_COLS, counts=None, parse_cache=None,
+                max_workers=None, log=print, metrics=None, plan=None, months=None):
+    """Cleaned agency rows of every sheet in ``inputs``.
+
+    Under a streaming or map-reduce ``plan`` the rows come back pre-summed
+    per agency / month / market, which ``aggregate_agency`` treats the same way.
+    ``months`` (month numbers, see ``parse_months``) limits reading and
+    cleaning to the row ranges of those months: the label column is
+    scanned first and only those rows are converted (see ``read_body``
+    for what each backend still reads; streaming reads every row and
+    cuts each chunk).
+    Only the label column and ``numeric_cols`` are read from the sheets.
+    """
+    plan = plan or plan_inputs(inputs, AGENCY, log=log)
+    parts = plan.parts
+    schemas = project_schemas(plan.schemas, numeric_cols)
+    if months:
+        log(f"📅 Ay filtresi: {describe_months(months)}")
+
+    def in_memory():
+        if plan.map_reduce:
+            frames = _read_parts(parse_cache, AGENCY, parts, schemas, metrics, months)
+            log("🧩 Aylar paralel işleniyor...")
+            with stage(metrics, "mapreduce"):
+                results = map_reduce_agency(frames, numeric_cols, max_workers)
+            return _merge_parts(results, parts, 'month', 'after_month_market', counts, log, metrics)
+
+        if len(parts) == 1:
+            path, sheet = parts[0]
+            with stage(metrics, "read"):
+                df = _read_part(parse_cache, AGENCY, path, sheet, schemas.get((path, sheet)), months)
+            with stage(metrics, "clean"):
+                return clean_agency(df, numeric_cols, counts=counts)
+
+        cached = _cached_parts(parse_cache, AGENCY, parts, schemas)
+        if cached is not None:
+            with stage(metrics, "clean"):
+                results = []
+                for df in cached:
+                    part_counts = {}
+                    df = _cut_months(AGENCY, df, months)
+                    results.append((clean_agency(df, numeric_cols, counts=part_counts), part_counts))
+            return _merge_parts(results, parts, 'month', 'after_month_market', counts, log, metrics)
+
+        log(f"📚 {len(parts)} sayfa paralel okunuyor...")
+        with stage(metrics, "parse"):
+            results = _parse_parts(_parse_agency_part, parts, numeric_cols, max_workers, schemas, months)
+        return _merge_parts(results, parts, 'month', 'after_month_market', counts, log, metrics)
+
+    df_clean = None if plan.streaming else _with_fallback(plan, in_memory, log)
+    if df_clean is None:
+        with stage(metrics, "stream"):
+            results = [stream_agency(path, sheet, numeric_cols, log=log, schema=schemas.get((path, sheet)),
+                                     months=months)
+                       for path, sheet in parts]
+        df_clean = _merge_parts(results, parts, 'month', 'after_month_market', counts, log, metrics)
+
+    if metrics is not None:
+        metrics.plan = plan.as_dict()
+    return df_clean
+
+
+def load_uyruk(inputs, ref, counts=None, parse_cache=None, max_workers=None, log=print, metrics=None,
+               plan=None, months=None, columns=None):
+    """Agency rows of every sheet in ``inputs``; ``months`` works as in ``load_agency``.
+
+    ``columns`` (measure names) reads only those measures; None reads all.
+    """
+    plan = plan or plan_inputs(inputs, UYRUK, log=log)
+    parts = plan.parts
+    schemas = project_schemas(plan.schemas, columns)
+    if months:
+        log(f"📅 Ay filtresi: {describe_months(months)}")
+
+    def in_memory():
+        if plan.map_reduce:
+            frames = _read_parts(parse_cache, UYRUK, parts, schemas, metrics, months, ref)
+            log("🧩 Aylar paralel işleniyor...")
+            with stage(metrics, "mapreduce"):
+                results = map_reduce_uyruk(frames, ref, max_workers)
+            return _merge_parts(results, parts, 'Month', 'after_service_rows', counts, log, metrics)
+
+        if len(parts) == 1:
+            path, sheet = parts[0]
+            with stage(metrics, "read"):
+                df = _read_part(parse_cache, UYRUK, path, sheet, schemas.get((path, sheet)), months, ref)
+            with stage(metrics, "parse"):
+                return parse_uyruk(df, ref, counts=counts)
+
+        cached = _cached_parts(parse_cache, UYRUK, parts, schemas)
+        if cached is not None:
+            with stage(metrics, "parse"):
+                results = []
+                for df in cached:
+                    part_counts = {}
+                    df = _cut_months(UYRUK, df, months, ref)
+                    results.append((parse_uyruk(df, ref, counts=part_counts), part_counts))
+            return _merge_parts(results, parts, 'Month', 'after_service_rows', counts, log, metrics)
+
+        log(f"📚 {len(parts)} sayfa paralel okunuyor...")
+        with stage(metrics, "parse"):
+            results = _parse_parts(_parse_uyruk_part, parts, ref, max_workers, schemas, months)
+        return _merge_parts(results, parts, 'Month', 'after_service_rows', counts, log, metrics)
+
+    df_clean = None if plan.streaming else _with_fallback(plan, in_memory, log)
+    if df_clean is None:
+        with stage(metrics, "stream"):
+            results = [stream_uyruk(path, sheet, ref, log=log, schema=schemas.get((path, sheet)), months=months)
+                       for path, sheet in parts]
+        df_clean = _merge_parts(results, parts, 'Month', 'after_service_rows', counts, log, metrics)
+
+    if metrics is not None:
+        metrics.plan = plan.as_dict()
+    return df_clean
@@ -0,0 +1,80 @@
+import re
+
+import pandas as pd
+
+from engine.frames import to_numeric_column
+from engine.months import month_number
+
+# Headline measures, by their normalised column name
+KPI_MEASURES = ['arrival_room', 'night_room', 'eur_revenue']
+
+TOP_N = 10
+
+
+def measure_key(column):
+    """'night__x000a_room' → 'night_room': Uyruk headers keep Excel line breaks."""
+    return re.sub(r'_+', '_', str(column).replace('_x000a_', '_')).strip('_').lower()
+
+
+def kpi_measures(df, decimal_comma=False):
+    """{kpi name: numeric Series} for the KPI measures present in ``df``."""
+    found = {}
+    for col in df.columns:
+        key = measure_key(col)
+        if key in KPI_MEASURES and key not in found:
+            found[key] = to_numeric_column(df[col], decimal_comma=decimal_comma).fillna(0)
+    return found
+
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 2)
+
+
+def _totals(measures):
+    totals = {name: _number(s.sum()) for name, s in measures.items()}
+    if totals.get('night_room') and 'eur_revenue' in totals:
+        totals['eur_per_room_night'] = round(totals['eur_revenue'] / totals['night_room'], 2)
+    return totals
+
+
+def _breakdown(measures, by, top=None, calendar=False):
+    frame = pd.DataFrame(measures).groupby(by.to_numpy(), sort=True).sum()
+    if calendar:
+        # Months in calendar order; labels that are not month names go last
+        frame = frame.loc[sorted(frame.index, key=lambda m: (month_number(m) or 13, str(m)))]
+    if top is not None and 'eur_revenue' in frame.columns:
+        frame = frame.nlargest(top, 'eur_revenue')
+    return [
+        {"name": str(name), **{col: _number(v) for col, v in row.items()}}
+        for name, row in frame.iterrows()
+    ]
+
+
+def agency_kpis(frames):
+    """JSON-ready headline numbers of an agency result (``aggregate_agency`` frames)."""
+    summary = frames["Summary"]
+    measures = kpi_measures(summary)
+    return {
+        "report": "agency",
+        "rows": len(summary),
+        "totals": _totals(measures),
+        "by_month": _breakdown(measures, summary['month'], calendar=True),
+        "by_market": _breakdown(measures, summary['market']),
+        "top_agency_groups": _breakdown(measures, summary['agency_group'], top=TOP_N),
+    }
+
+
+def uyruk_kpis(frames):
+    """JSON-ready headline numbers of an Uyruk result (``build_uyruk_report`` frame)."""
+    result = frames["Uyruk"]
+    # Nationality export numbers are "1.234,56" text until parse_measures
+    measures = kpi_measures(result, decimal_comma=True)
+    return {
+        "report": "uyruk",
+        "rows": len(result),
+        "totals": _totals(measures),
+        "by_month": _breakdown(measures, result['Month'], calendar=True),
+        "by_region": _breakdown(measures, result['Region']),
+        "top_countries": _breakdown(measures, result['Country'], top=TOP_N),
+    }
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from engine import agency, uyruk
+from engine.months import month_blocks
+from engine.streaming import SUM_KEYS, partial_sums
+
+
+def _sum_counts(all_counts):
+    total = {}
+    for counts in all_counts:
+        for key, value in counts.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def split_months(df, column, header_rows, opens):
+    """Month blocks of one sheet's frame (see ``month_blocks``), each a frame of its own."""
+    labels = df[column]
+    blocks = month_blocks(header_rows(labels), lambda i: opens(labels.iloc[i]))
+    return [df.iloc[start:stop].reset_index(drop=True) for start, stop in blocks] or [df]
+
+
+# ------------------------------
+# MAP (one month block per task)
+# ------------------------------
+def _agency_block(df, numeric_cols):
+    import warnings
+    warnings.filterwarnings('ignore')
+    counts = {}
+    return partial_sums(agency.clean_agency(df, numeric_cols, counts=counts)), counts
+
+
+def _uyruk_block(df, ref):
+    import warnings
+    warnings.filterwarnings('ignore')
+    counts = {}
+    return uyruk.parse_uyruk(df, ref, counts=counts), counts
+
+
+def _run_blocks(func, blocks, extra, max_workers):
+    workers = min(len(blocks), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [func(df, extra) for df in blocks]
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        return list(pool.map(func, blocks, [extra] * len(blocks)))
+
+
+# ------------------------------
+# REDUCE (associative, in block order)
+# ------------------------------
+def combine_agency(results):
+    """Partial sums of the blocks summed again: (rows per agency / month / market, counts).
+
+    Columns in ``clean_agency`` order, as ``stream_agency`` returns them.
+    """
+    df = partial_sums(pd.concat([df for df, _ in results], ignore_index=True))
+    measures = [c for c in df.columns if c not in SUM_KEYS]
+    return df[['agency'] + measures + ['month', 'market', 'agency_group']], _sum_counts(c for _, c in results)
+
+
+def combine_uyruk(results):
+    """Agency rows of the blocks in sheet order, with their counts."""
+    return pd.concat([df for df, _ in results], ignore_index=True), _sum_counts(c for _, c in results)
+
+
+def _map_reduce(frames, split, func, extra, combine, max_workers):
+    # Every block of every sheet goes into one pool; each sheet is then combined on its own
+    blocks = [split(df) for df in frames]
+    results = iter(_run_blocks(func, [b for sheet in blocks for b in sheet], extra, max_workers))
+    return [combine([next(results) for _ in sheet]) for sheet in blocks]
+
+
+def map_reduce_agency(frames, numeric_cols=agency.NUMERIC_COLS, max_workers=None):
+    """[(rows pre-summed per agency_group / month / market / agency, counts)] per sheet frame.
+
+    Each month block is labelled, classified, parsed and summed in a
+    process pool; the blocks' partial sums are summed again, which gives
+    the same totals as cleaning the whole sheet, so ``aggregate_agency``
+    runs on the result unchanged.
+    """
+    def split(df):
+        return split_months(df, 'agency', agency.month_rows, agency.is_market_label)
+    return _map_reduce(frames, split, _agency_block, numeric_cols, combine_agency, max_workers)
+
+
+def map_reduce_uyruk(frames, ref, max_workers=None):
+    """[(agency rows, counts)] per sheet frame, each month block parsed in a process pool."""
+    def split(df):
+        return split_months(df, 'agencygroup', uyruk.month_rows, ref.opens)
+    return _map_reduce(frames, split, _uyruk_block, ref, combine_uyruk, max_workers)
@@ -0,0 +1,240 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from engine.hashing import file_hash
+
+HISTORY_FILE = os.environ.get(
+    "RAPOR_HISTORY", os.path.join(os.path.expanduser("~"), ".rapor", "run_history.jsonl")
+)
+
+MB = 2 ** 20
+
+
+# ------------------------------
+# PEAK MEMORY SAMPLER
+# ------------------------------
+class _MemorySampler:
+    """Samples RSS of this process and its children (parse pools) in a background thread.
+
+    psutil is optional; without it peak memory is simply not recorded.
+    """
+
+    def __init__(self, interval=0.05):
+        try:
+            import psutil
+            self.process = psutil.Process()
+        except ImportError:
+            self.process = None
+        self.interval = interval
+        self.stage_peak = 0
+        self.run_peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def rss(self):
+        total = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except Exception:
+                pass  # child exited between listing and reading
+        return total
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.observe()
+
+    def observe(self):
+        if self.process is None:
+            return
+        rss = self.rss()
+        self.stage_peak = max(self.stage_peak, rss)
+        self.run_peak = max(self.run_peak, rss)
+
+    def start(self):
+        if self.process is None:
+            return
+        self.observe()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def reset_stage(self):
+        if self.process is not None:
+            self.stage_peak = self.rss()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.observe()
+
+
+def _mb(nbytes):
+    return round(nbytes / MB, 1) if nbytes else None
+
+
+def _file_info(path, sha256):
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = None
+    return {"path": os.path.abspath(path), "size": size, "sha256": sha256}
+
+
+# ------------------------------
+# ONE RUN
+# ------------------------------
+class RunMetrics:
+    """Metrics record of one report run, appended to the run history on exit.
+
+        with RunMetrics("agency", input_file, source="gui") as metrics:
+            with metrics.stage("read"):
+                ...
+            metrics.rows(counts)
+            metrics.add_output(output_file)
+
+    Scripts without a ``with`` block call ``start()`` and ``finish()`` instead.
+    """
+
+    def __init__(self, report, inputs, source="engine", history=HISTORY_FILE):
+        from engine.inputs import as_list
+        self.report = report
+        self.inputs = as_list(inputs)
+        self.source = source
+        self.history = history
+        self.stages = []
+        self.counts = {}
+        self.outputs = []
+        self.plan = None
+        self.record = None
+        self._hashes = None
+        self._sampler = _MemorySampler()
+        self._started = None
+        self._started_at = None
+
+    def start(self):
+        self._started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(error=None if exc is None else str(exc))
+        return False
+
+    @contextmanager
+    def stage(self, name):
+        self._sampler.reset_stage()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._sampler.observe()
+            self.stages.append({
+                "name": name,
+                "seconds": round(time.perf_counter() - t0, 3),
+                "peak_mb": _mb(self._sampler.stage_peak),
+            })
+
+    def file_hashes(self):
+        """{absolute path: SHA-256} of the inputs, hashed once per run.
+
+        The result cache key and the SQLite metadata take this mapping, so
+        an input is read for hashing only once. Unreadable files map to None.
+        """
+        if self._hashes is None:
+            self._hashes = {}
+            for path in self.inputs:
+                try:
+                    self._hashes[os.path.abspath(path)] = file_hash(path)
+                except OSError:
+                    self._hashes[os.path.abspath(path)] = None
+        return self._hashes
+
+    def rows(self, counts, prefix=""):
+        for key, value in counts.items():
+            self.counts[f"{prefix}{key}"] = int(value)
+
+    def add_output(self, path):
+        if path and os.path.exists(path):
+            self.outputs.append({"path": os.path.abspath(path), "size": os.path.getsize(path)})
+
+    def finish(self, error=None):
+        if self.record is not None:
+            return self.record
+        self._sampler.stop()
+
+        hashes = self.file_hashes()
+        inputs = [_file_info(path, hashes[os.path.abspath(path)]) for path in self.inputs]
+
+        self.record = {
+            "run_id": uuid.uuid4().hex[:12],
+            "report": self.report,
+            "source": self.source,
+            "started_at": self._started_at.isoformat(timespec="seconds"),
+            "status": "error" if error else "ok",
+            "error": error,
+            "plan": self.plan,
+            "inputs": inputs,
+            "rows": self.counts,
+            "stages": self.stages,
+            "seconds": round(time.perf_counter() - self._started, 3),
+            "peak_mb": _mb(self._sampler.run_peak),
+            "outputs": self.outputs,
+        }
+        if self.history:
+            append_record(self.record, self.history)
+        return self.record
+
+    def summary(self):
+        parts = []
+        for s in self.stages:
+            peak = f" / {s['peak_mb']:.0f} MB" if s["peak_mb"] else ""
+            parts.append(f"{s['name']} {s['seconds']:.2f} sn{peak}")
+        return " · ".join(parts)
+
+
+def stage(metrics, name):
+    """``metrics.stage(name)``, or a no-op when no metrics are collected."""
+    return nullcontext() if metrics is None else metrics.stage(name)
+
+
+# ------------------------------
+# HISTORY FILE (JSON lines)
+# ------------------------------
+_history_lock = threading.Lock()
+
+
+def append_record(record, path=HISTORY_FILE):
+    # History is best effort: a read-only home folder must not fail the report
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with _history_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError:
+        pass
+
+
+def read_history(path=HISTORY_FILE, report=None, limit=None):
+    """Records oldest first; unreadable lines are skipped."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if report is None or record.get("report") == report:
+                records.append(record)
+    return records[-limit:] if limit else records
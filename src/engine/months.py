@@ -0,0 +1,206 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Month names of the exports' NN-MONTH header rows, Turkish letters folded
+MONTHS = {
+    'OCAK': 1, 'SUBAT': 2, 'MART': 3, 'NISAN': 4, 'MAYIS': 5, 'HAZIRAN': 6,
+    'TEMMUZ': 7, 'AGUSTOS': 8, 'EYLUL': 9, 'EKIM': 10, 'KASIM': 11, 'ARALIK': 12,
+}
+
+_FOLD = str.maketrans('ĞŞÜÖÇİIığşüöç', 'GSUOCIIIGSUOC')
+
+_NUMBER = re.compile(r'^\s*(\d{2})-')
+
+
+def month_number(label):
+    """'Ağustos' / 'AĞUSTOS' / 'AGUSTOS' → 8; None for anything else."""
+    return MONTHS.get(str(label).strip().translate(_FOLD).upper().translate(_FOLD))
+
+
+# ------------------------------
+# MONTH FILTER
+# ------------------------------
+def _one_month(token):
+    if token.isdigit() and 1 <= int(token) <= 12:
+        return int(token)
+    number = month_number(token)
+    if number is None:
+        raise ValueError(f"Ay anlaşılamadı: {token!r} (1-12 ya da ay adı, ör. 3, Mart, 3-5)")
+    return number
+
+
+def parse_months(values):
+    """Sorted month numbers of a filter, None for no filter.
+
+    ``values`` is one string or a list of them: numbers, Turkish month names
+    or ranges, comma separated ("3", "03", "Mart", "3-5", "Mart-Mayıs").
+    """
+    if values is None:
+        return None
+    if isinstance(values, (str, int)):
+        values = [values]
+
+    months = set()
+    for value in values:
+        for token in str(value).split(','):
+            token = token.strip()
+            if not token:
+                continue
+            first, _, last = token.partition('-')
+            start = _one_month(first.strip())
+            stop = _one_month(last.strip()) if last.strip() else start
+            if stop < start:
+                raise ValueError(f"Ay aralığı ters: {token!r}")
+            months.update(range(start, stop + 1))
+    return tuple(sorted(months)) or None
+
+
+def describe_months(months):
+    return ", ".join(f"{m:02d}" for m in months)
+
+
+# ------------------------------
+# ROW RANGES
+# ------------------------------
+def month_ranges(labels, header_rows, months, state=None, opens=None):
+    """[(start, stop)] row ranges of the selected ``months``.
+
+    ``labels`` is a sheet's label column and ``header_rows`` the boolean mask
+    of its NN-MONTH header rows; a month's range runs from its header row to
+    the next header of another month. Rows above the first header belong to
+    no month. ``state`` (a dict) carries whether the month open at the end
+    of one chunk of a sheet is selected into the next chunk.
+
+    Cleaning carries labels (market, country) down the sheet. With
+    ``opens(i)`` (as in ``month_blocks``) a range whose first body row does
+    not set them afresh is preceded by the last opening row above it, so
+    its rows keep the labels they have in the whole sheet. With ``state``
+    the opening row may lie in an earlier chunk: ``state['carry']`` then
+    asks for it, and ``state['opener']`` is the chunk's last opening row.
+    """
+    mask = np.asarray(header_rows, dtype=bool)
+    selected = set(months)
+    headers = np.flatnonzero(mask)
+    numbers = [int(_NUMBER.match(str(labels[i])).group(1)) for i in headers]
+
+    starts = [0] + headers.tolist()
+    stops = headers.tolist() + [len(labels)]
+    open_month = bool(state.get('selected')) if state is not None else False
+    keep = [open_month] + [n in selected for n in numbers]
+    if state is not None:
+        state['selected'] = keep[-1]
+
+    ranges = []
+    for start, stop, take in zip(starts, stops, keep):
+        if take and start != stop:
+            _append_range(ranges, start, stop)
+    if opens is None:
+        return ranges
+    return _with_openers(ranges, mask, opens, state)
+
+
+def _append_range(ranges, start, stop):
+    if ranges and ranges[-1][1] == start:
+        ranges[-1] = (ranges[-1][0], stop)
+    else:
+        ranges.append((start, stop))
+
+
+def _last_opener(opens, stop, start):
+    return next((i for i in range(stop - 1, start - 1, -1) if opens(i)), None)
+
+
+def _with_openers(ranges, mask, opens, state):
+    # Up to row ``done`` the selection carries the same labels as the sheet;
+    # ``current`` says so for the rows before this chunk
+    current = state.get('current', True) if state is not None else True
+    done = 0
+    carry = False
+    result = []
+    for start, stop in ranges:
+        body = start + 1 if mask[start] else start
+        # A body row in a later chunk cannot be checked here: carry the opener anyway
+        if body >= stop or not opens(body):
+            opener = _last_opener(opens, start, done)
+            if opener is not None:
+                _append_range(result, opener, opener + 1)
+            elif not current:
+                carry = True
+        _append_range(result, start, stop)
+        done, current = stop, True
+
+    if state is not None:
+        last = _last_opener(opens, len(mask), 0)
+        state['carry'] = carry
+        state['opener'] = last
+        state['current'] = current and (last is None or last < done)
+    return result
+
+
+def month_filter(months, header_rows, opens=None):
+    """``read_sheet(rows=...)`` callback: the body row ranges of ``months`` (see ``month_ranges``).
+
+    It is given the sheet's label column alone, so the ranges are known
+    before any other cell is read. ``opens(label)`` as in ``select_months``.
+    """
+    def ranges(labels):
+        labels = pd.Series(labels, dtype=object)
+        values = labels.to_numpy()
+        at = None if opens is None else (lambda i: opens(values[i]))
+        return month_ranges(values, header_rows(labels), months, opens=at)
+    return ranges
+
+
+def month_blocks(header_rows, opens=None):
+    """[(start, stop)] row ranges of a sheet that can be cleaned independently.
+
+    The sheet is cut at its NN-MONTH header rows; rows above the first
+    header form the first block. Cleaning carries labels (market, country)
+    down the sheet, so a cut is only made where ``opens(i)`` says the first
+    body row ``i`` below the header sets them afresh; any other block,
+    including one that is just a header, stays joined to the one above.
+    """
+    mask = np.asarray(header_rows, dtype=bool)
+    headers = np.flatnonzero(mask).tolist()
+
+    blocks = []
+    for start, stop in zip([0] + headers, headers + [len(mask)]):
+        if start == stop:
+            continue
+        body = start + 1 if mask[start] else start
+        if blocks and (body >= stop or (opens is not None and not opens(body))):
+            blocks[-1] = (blocks[-1][0], stop)
+        else:
+            blocks.append((start, stop))
+    return blocks
+
+
+def select_months(df, column, header_rows, months, state=None, opens=None):
+    """Rows of ``df`` inside the selected months (see ``month_ranges``); ``df`` itself without a filter.
+
+    ``header_rows(labels)`` is the report's NN-MONTH header test, so the
+    filter splits the sheet exactly where cleaning later opens a month.
+    ``opens(label)`` is the report's opening-row test; with ``state`` the
+    last opening row of a chunk is kept for the chunks after it.
+    """
+    if not months:
+        return df
+    labels = df[column]
+    values = labels.to_numpy()
+    at = None if opens is None else (lambda i: opens(values[i]))
+    previous = state.get('opener_row') if state is not None else None
+
+    ranges = month_ranges(values, header_rows(labels), months, state, at)
+    carry = previous is not None and bool(state.get('carry'))
+    if state is not None and state.get('opener') is not None:
+        state['opener_row'] = df.iloc[[state['opener']]]
+
+    if ranges == [(0, len(df))] and not carry:
+        return df
+    positions = np.concatenate([np.arange(start, stop) for start, stop in ranges] or [np.arange(0)])
+    selected = df.iloc[positions]
+    if carry:
+        selected = pd.concat([previous, selected])
+    return selected.reset_index(drop=True)
@@ -0,0 +1,80 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class ParseCache:
+    """Parsed input frames shared between jobs, keyed by file identity.
+
+    Concurrent requests for the same file wait for the first parse instead
+    of reading the workbook again. Frames are treated as read-only by the
+    engine, so one object can be handed to several jobs.
+    """
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._frames = OrderedDict()
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind, path):
+        st = os.stat(path)
+        return kind, os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+    def get(self, kind, path, loader):
+        key = self.key(kind, path)
+
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return self._frames[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._frames:
+                    self._frames.move_to_end(key)
+                    return self._frames[key]
+
+            try:
+                df = loader(path)
+                with self._lock:
+                    self._frames[key] = df
+                    while len(self._frames) > self.max_entries:
+                        self._frames.popitem(last=False)
+            finally:
+                # Also when the loader raises (unreadable file, cancelled prefetch)
+                with self._lock:
+                    self._locks.pop(key, None)
+        return df
+
+    def peek(self, kind, path):
+        """The cached frame of ``path``, None when it has not been parsed (never parses)."""
+        key = self.key(kind, path)
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+            return self._frames.get(key)
+
+    def discard(self, kind, path):
+        """Drop the frame of ``path``, e.g. a speculative parse nobody asked for."""
+        try:
+            key = self.key(kind, path)
+        except OSError:
+            key = None
+        with self._lock:
+            if key is None:
+                # File gone: drop every version of it
+                stale = [k for k in self._frames if k[:2] == (kind, os.path.abspath(path))]
+            else:
+                stale = [key] if key in self._frames else []
+            for k in stale:
+                del self._frames[k]
+
+    def __len__(self):
+        return len(self._frames)
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
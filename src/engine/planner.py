@@ -0,0 +1,159 @@
+import os
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+IN_MEMORY = "memory"
+STREAMING = "streaming"
+# In memory, each month block cleaned and summed in its own process
+MAP_REDUCE = "mapreduce"
+
+# Share of the currently available RAM a run may plan to use
+MEMORY_FRACTION = float(os.environ.get("RAPOR_MEMORY_FRACTION", 0.5))
+
+# Peak memory per byte of uncompressed sheet XML (~22 bytes per cell), measured
+# over a whole run: read, clean, aggregate and the xlsx output
+BYTES_PER_XML_BYTE = {
+    "agency": 3.5,
+    "uyruk": 10.0,
+}
+
+MEMORY_ERROR_MESSAGE = (
+    "Bellek yetersiz: rapor bu bilgisayarın belleğine sığmadı. "
+    "RAPOR_MEMORY_FRACTION değerini düşürerek (ör. 0.2) parçalı okumayı erkenden seçtirebilirsiniz."
+)
+
+GB = 2 ** 30
+MB = 2 ** 20
+
+_NS = {
+    "m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+
+# ------------------------------
+# SIZES WITHOUT LOADING THE WORKBOOK
+# ------------------------------
+def sheet_parts(z):
+    """{sheet name: zip member of its XML part} of an open workbook zip, in sheet order."""
+    members = {name.lower(): name for name in z.namelist()}
+    workbook = ET.fromstring(z.read("xl/workbook.xml"))
+    rels = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.findall("rel:Relationship", _NS)}
+    result = {}
+    for sheet in workbook.findall("m:sheets/m:sheet", _NS):
+        target = targets.get(sheet.get(f"{{{_NS['r']}}}id"), "")
+        part = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+        result[sheet.get("name")] = members.get(posixpath.normpath(part).lower())
+    return result
+
+
+def sheet_xml_sizes(path):
+    """{sheet name: uncompressed size of its XML part}, read from the zip directory only."""
+    with zipfile.ZipFile(path) as z:
+        return {name: z.getinfo(part).file_size if part else 0 for name, part in sheet_parts(z).items()}
+
+
+def available_memory():
+    """Bytes of RAM available right now, None if it cannot be determined."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _size(nbytes):
+    if nbytes is None:
+        return "bilinmiyor"
+    return f"{nbytes / GB:.1f} GB" if nbytes >= GB else f"{nbytes / MB:.0f} MB"
+
+
+# ------------------------------
+# PLAN
+# ------------------------------
+class ExecutionPlan:
+    """How a run reads its inputs: whole sheets in memory, or streamed in chunks
+    with partial results spilled to disk."""
+
+    def __init__(self, kind, parts, strategy, estimate, available, fraction):
+        self.kind = kind
+        self.parts = parts
+        self.strategy = strategy
+        self.estimate = estimate
+        self.available = available
+        self.fraction = fraction
+        # {(path, sheet): ParsePlan}, filled by plan_inputs
+        self.schemas = {}
+
+    @property
+    def streaming(self):
+        return self.strategy == STREAMING
+
+    @property
+    def budget(self):
+        return None if self.available is None else int(self.available * self.fraction)
+
+    @property
+    def map_reduce(self):
+        return self.strategy == MAP_REDUCE
+
+    def describe(self):
+        numbers = f"tahmin {_size(self.estimate)}, sınır {_size(self.budget)}"
+        if self.streaming:
+            return f"🧠 Plan: parçalı okuma, ara sonuçlar diske ({numbers})"
+        if self.map_reduce:
+            return f"🧠 Plan: bellekte, aylar paralel işlenir ({numbers})"
+        return f"🧠 Plan: bellekte işleme ({numbers})"
+
+    def as_dict(self):
+        return {
+            "strategy": self.strategy,
+            "estimate_mb": round(self.estimate / MB, 1),
+            "budget_mb": None if self.budget is None else round(self.budget / MB, 1),
+        }
+
+
+def estimate_bytes(parts, kind):
+    """Expected peak memory of a run over ``parts`` ((path, sheet) pairs)."""
+    sizes = {}
+    total = 0
+    for path, sheet in parts:
+        if path not in sizes:
+            try:
+                sizes[path] = sheet_xml_sizes(path)
+            except (KeyError, zipfile.BadZipFile, ET.ParseError):
+                # Unusual package layout: fall back to the compressed file size (~10x smaller)
+                sizes[path] = {sheet: os.path.getsize(path) * 10}
+        total += sizes[path].get(sheet, 0)
+    return int(total * BYTES_PER_XML_BYTE[kind])
+
+
+def make_plan(parts, kind, memory_fraction=None, strategy=None):
+    """Stream when the estimate exceeds ``memory_fraction`` of the available RAM.
+
+    ``strategy`` forces IN_MEMORY or STREAMING regardless of the estimate;
+    MAP_REDUCE is taken when the data fits in memory and streams otherwise.
+    """
+    fraction = MEMORY_FRACTION if memory_fraction is None else memory_fraction
+    estimate = estimate_bytes(parts, kind)
+    available = available_memory()
+
+    too_big = available is not None and estimate > available * fraction
+    if strategy is None:
+        strategy = STREAMING if too_big else IN_MEMORY
+    elif strategy == MAP_REDUCE and too_big:
+        # The month blocks are cleaned in memory; a file that does not fit still streams
+        strategy = STREAMING
+    return ExecutionPlan(kind, parts, strategy, estimate, available, fraction)
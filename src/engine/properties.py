@@ -0,0 +1,169 @@
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from engine.agency import SUMMARY_AGG
+from engine.excel import write_workbook
+from engine.inputs import AGENCY, UYRUK, as_list
+from engine.metrics import HISTORY_FILE
+from engine.uyruk import measure_columns, parse_measures
+
+PROPERTY = "property"
+
+GROUP_DIR = "_group"
+
+PROPERTY_MEASURES = ['arrival_room', 'night_room', 'eur_revenue']
+
+
+def _no_log(message):
+    pass
+
+
+# ------------------------------
+# PROPERTY MAPPING
+# ------------------------------
+def load_properties(path):
+    """{property: {"agency": [paths], "uyruk": [paths]}} from a JSON mapping file.
+
+        {
+          "Hotel A": {"agency": "a/agency.xlsx", "uyruk": ["a/uyruk_1.xlsx", "a/uyruk_2.xlsx"]},
+          "Hotel B": {"agency": "b/agency.xlsx"}
+        }
+
+    Relative paths are taken from the mapping file's folder; a property may
+    have only one of the two exports.
+    """
+    with open(path, encoding="utf-8") as f:
+        mapping = json.load(f)
+
+    base = os.path.dirname(os.path.abspath(path))
+    properties = {}
+    for name, files in mapping.items():
+        unknown = set(files) - {AGENCY, UYRUK}
+        if unknown:
+            raise ValueError(f"{name}: bilinmeyen anahtar(lar) {', '.join(sorted(unknown))} (agency / uyruk)")
+        properties[name] = {
+            kind: [os.path.join(base, p) for p in as_list(files[kind])]
+            for kind in (AGENCY, UYRUK) if files.get(kind)
+        }
+    return properties
+
+
+def property_dir(output_dir, name):
+    return os.path.join(output_dir, re.sub(r'[^\w.-]+', '_', name).strip('_') or "property")
+
+
+# ------------------------------
+# ONE PROPERTY (worker process)
+# ------------------------------
+def _tag(frames, name):
+    # The property dimension goes first so the consolidated sheets read property → month → ...
+    return {sheet: df.assign(**{PROPERTY: name})[[PROPERTY] + list(df.columns)] for sheet, df in frames.items()}
+
+
+def run_property(name, files, pairs, output_dir, history=HISTORY_FILE):
+    """Agency and Uyruk reports of one property in ``output_dir/<property>/``.
+
+    Returns {"agency": frames, "uyruk": frames} with a ``property`` column.
+    """
+    import warnings
+    warnings.filterwarnings('ignore')
+    from engine.reports import run_agency_report, run_uyruk_report
+
+    folder = property_dir(output_dir, name)
+    os.makedirs(folder, exist_ok=True)
+    results = {}
+    if AGENCY in files:
+        frames = run_agency_report(files[AGENCY], os.path.join(folder, "agency.xlsx"), source="multi",
+                                   history=history)
+        results[AGENCY] = _tag(frames, name)
+    if UYRUK in files:
+        frames = run_uyruk_report(files[UYRUK], pairs, os.path.join(folder, "uyruk.xlsx"), source="multi",
+                                  history=history)
+        results[UYRUK] = _tag(frames, name)
+    return results
+
+
+# ------------------------------
+# CONSOLIDATION
+# ------------------------------
+def consolidate_agency(frames):
+    """Group report from the per-property agency results.
+
+    Built from the property ``Summary`` sheets only: the group By Group /
+    By Market use the same aggregation as a single hotel's report, so a
+    one-property group report equals that property's report.
+    """
+    summary = pd.concat([f["Summary"] for f in frames], ignore_index=True)
+    measures = [c for c in PROPERTY_MEASURES if c in summary.columns]
+    return {
+        "Summary": summary,
+        "By Group": summary.groupby(['month', 'agency_group']).agg(SUMMARY_AGG).reset_index(),
+        "By Market": summary.groupby(['month', 'market']).agg(SUMMARY_AGG).reset_index(),
+        "By Property": summary.groupby([PROPERTY, 'month'])[measures].sum().reset_index(),
+    }
+
+
+def consolidate_uyruk(frames):
+    """Group report from the per-property Uyruk results."""
+    rows = pd.concat([f["Uyruk"] for f in frames], ignore_index=True)
+    dimensions = [PROPERTY, 'YIL']
+    numeric = parse_measures(rows.drop(columns=dimensions))
+    num_cols = measure_columns(numeric)
+
+    by_region = numeric.assign(**{PROPERTY: rows[PROPERTY]})
+    return {
+        "Uyruk": rows,
+        "By Region": by_region.groupby(['Month', 'Region'])[num_cols].sum().reset_index(),
+        "By Property": by_region.groupby([PROPERTY, 'Month', 'Region'])[num_cols].sum().reset_index(),
+    }
+
+
+# ------------------------------
+# ALL PROPERTIES
+# ------------------------------
+def run_properties(properties, pairs, output_dir, max_workers=None, log=_no_log, history=HISTORY_FILE):
+    """Reports of every property in parallel processes, then the group reports.
+
+    ``properties`` is the ``load_properties`` mapping. Per-property reports
+    go to ``output_dir/<property>/``, the consolidated ones to
+    ``output_dir/_group/``. Returns {"agency": frames, "uyruk": frames}
+    of the group.
+    """
+    results = {}
+    workers = min(len(properties), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for name, files in properties.items():
+            results[name] = run_property(name, files, pairs, output_dir, history)
+            log(f"✓ {name}")
+    else:
+        log(f"🏨 {len(properties)} otel, {workers} işlemde...")
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {pool.submit(run_property, name, files, pairs, output_dir, history): name
+                       for name, files in properties.items()}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                log(f"✓ {futures[future]}")
+
+    # Mapping order, not completion order
+    ordered = [results[name] for name in properties]
+    group_dir = os.path.join(output_dir, GROUP_DIR)
+    os.makedirs(group_dir, exist_ok=True)
+
+    group = {}
+    agency = [r[AGENCY] for r in ordered if AGENCY in r]
+    if agency:
+        group[AGENCY] = consolidate_agency(agency)
+        write_workbook(os.path.join(group_dir, "agency.xlsx"), group[AGENCY])
+    uyruk = [r[UYRUK] for r in ordered if UYRUK in r]
+    if uyruk:
+        group[UYRUK] = consolidate_uyruk(uyruk)
+        # Row-level like the single-hotel Uyruk report, which is written unformatted too
+        write_workbook(os.path.join(group_dir, "uyruk.xlsx"), group[UYRUK], formatted=False)
+    log(f"📦 Grup raporu: {group_dir}")
+    return group
@@ -0,0 +1,329 @@
+import os
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas._libs.parsers import STR_NA_VALUES
+from pandas.io.parsers import TextParser
+
+# Fastest first; the first installed one is used unless RAPOR_XLSX_READER names another
+CALAMINE = "calamine"
+OPENPYXL_READONLY = "openpyxl-readonly"
+OPENPYXL = "openpyxl"
+BACKENDS = (CALAMINE, OPENPYXL_READONLY, OPENPYXL)
+
+READER = os.environ.get("RAPOR_XLSX_READER")
+
+
+def available_backends():
+    backends = []
+    try:
+        import python_calamine  # noqa: F401
+        backends.append(CALAMINE)
+    except ImportError:
+        pass
+    return backends + [OPENPYXL_READONLY, OPENPYXL]
+
+
+def default_backend():
+    available = available_backends()
+    if READER:
+        if READER not in available:
+            raise ValueError(f"RAPOR_XLSX_READER={READER}: kullanılabilir okuyucular {', '.join(available)}")
+        return READER
+    return available[0]
+
+
+# ------------------------------
+# SHEET CELLS (pandas' cell conventions)
+# ------------------------------
+def _calamine_cell(value):
+    # Same conversions as pandas' calamine reader
+    if isinstance(value, float):
+        as_int = int(value)
+        return as_int if as_int == value else value
+    if isinstance(value, (datetime, timedelta)):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+_ESCAPE = re.compile(rb'_x[0-9A-Fa-f]{4}_')
+_TEXT_WITH_CONTROL = re.compile(rb'<t[^>]*>([^<]*[\x00-\x1f][^<]*)')
+_CONTROL = re.compile(rb'[\x00-\x1f]')
+
+
+def _scan_strings(stream, tokens, literal):
+    # Blocks are cut at the last '<' so no text element is split between two of them
+    carry = b""
+    for block in iter(lambda: stream.read(1 << 22), b""):
+        data = carry + block
+        cut = data.rfind(b"<")
+        cut = len(data) if cut <= 0 else cut
+        data, carry = data[:cut], data[cut:]
+        tokens.update(_ESCAPE.findall(data))
+        for m in _TEXT_WITH_CONTROL.finditer(data):
+            literal.update(_CONTROL.findall(m.group(1)))
+    tokens.update(_ESCAPE.findall(carry))
+
+
+def string_escapes(path, sheet):
+    """{control character: '_xHHHH_'} for the escapes in the strings of one sheet.
+
+    openpyxl returns escapes such as '_x000a_' literally, calamine decodes
+    them; mapping the decoded characters back makes both read the same text.
+    Shared strings and the sheet's inline strings are scanned. None when the
+    mapping is ambiguous: the character also occurs unescaped, or a printable
+    character is escaped.
+    """
+    from engine.planner import sheet_parts
+
+    tokens, literal = set(), set()
+    with zipfile.ZipFile(path) as z:
+        parts = [sheet_parts(z).get(sheet)]
+        if "xl/sharedStrings.xml" in z.namelist():
+            parts.append("xl/sharedStrings.xml")
+        for part in filter(None, parts):
+            with z.open(part) as stream:
+                _scan_strings(stream, tokens, literal)
+
+    escapes = {}
+    for token in tokens:
+        char = chr(int(token[2:6], 16))
+        if char in escapes or ord(char) >= 0x20 or char.encode() in literal:
+            return None
+        escapes[char] = token.decode()
+    return escapes
+
+
+def pick_cells(row, usecols, convert):
+    """``convert`` of the cells at ``usecols``; missing cells of a short row are ""."""
+    return [convert(row[i]) if i < len(row) else "" for i in usecols]
+
+
+def is_empty_cell(value):
+    """True for a cell value pandas' parser reads as NaN: "", None, NaN and its default NA strings."""
+    if isinstance(value, str):
+        return value in STR_NA_VALUES
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def range_rows(rows, ranges, first=0):
+    """Items of ``rows`` (numbered from ``first``) inside the [(start, stop)] ``ranges``.
+
+    Stops after the last range, so a lazy ``rows`` is read no further.
+    """
+    ranges = iter(ranges)
+    current = next(ranges, None)
+    for i, row in enumerate(rows, first):
+        while current is not None and i >= current[1]:
+            current = next(ranges, None)
+        if current is None:
+            return
+        if i >= current[0]:
+            yield row
+
+
+def _calamine_raw(path, sheet):
+    # (unconverted rows, escapes) of one sheet, None when they would not match openpyxl's text
+    from python_calamine import CalamineWorkbook, SheetTypeEnum
+
+    book = CalamineWorkbook.from_path(path)
+    try:
+        if not isinstance(sheet, str):
+            names = [s.name for s in book.sheets_metadata if s.typ == SheetTypeEnum.WorkSheet]
+            sheet = names[sheet]
+        escapes = string_escapes(path, sheet)
+        if escapes is None:
+            return None
+        return book.get_sheet_by_name(sheet).to_python(skip_empty_area=False), escapes
+    finally:
+        book.close()
+
+
+def _calamine_convert(rows, escapes, usecols=None):
+    if usecols is None:
+        rows = [[_calamine_cell(v) for v in row] for row in rows]
+    else:
+        rows = [pick_cells(row, usecols, _calamine_cell) for row in rows]
+    if escapes:
+        table = {ord(char): token for char, token in escapes.items()}
+        rows = [[v.translate(table) if isinstance(v, str) else v for v in row] for row in rows]
+    return rows
+
+
+def _calamine_rows(path, sheet, usecols=None):
+    """Rows read by calamine, None when they would not match openpyxl's text."""
+    raw = _calamine_raw(path, sheet)
+    return None if raw is None else _calamine_convert(*raw, usecols)
+
+
+def _calamine_body(path, sheet, header_row, usecols, rows):
+    """(header and selected body rows, filled positions) read by calamine; None as for ``_calamine_rows``.
+
+    calamine decodes the whole sheet, but only the label column and the
+    rows ``rows(labels)`` selects are converted.
+    """
+    raw = _calamine_raw(path, sheet)
+    if raw is None:
+        return None
+    cells, escapes = raw
+    body = cells[header_row + 1:]
+    labels = [row[0] if row else "" for row in _calamine_convert([row[:1] for row in body], escapes)]
+    filled = {i for i in usecols if any(i < len(row) and not is_empty_cell(row[i]) for row in body)}
+    selected = [row for start, stop in rows(labels) for row in body[start:stop]]
+    return _calamine_convert([cells[header_row]] + selected, escapes, usecols), filled
+
+
+def openpyxl_cell(cell):
+    # Same conversions as pandas' openpyxl reader
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        value = int(cell.value)
+        return value if value == cell.value else float(cell.value)
+    return cell.value
+
+
+def _openpyxl_rows(path, sheet, usecols=None):
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if isinstance(sheet, str) else wb.worksheets[sheet]
+        ws.reset_dimensions()
+        rows = []
+        last_with_data = -1
+        for row in ws.iter_rows():
+            values = [openpyxl_cell(c) for c in row] if usecols is None else pick_cells(row, usecols, openpyxl_cell)
+            while values and values[-1] == "":
+                values.pop()
+            if values:
+                last_with_data = len(rows)
+            rows.append(values)
+    finally:
+        wb.close()
+
+    # Like pandas: no trailing empty rows, every row as wide as the widest
+    rows = rows[:last_with_data + 1]
+    width = max((len(r) for r in rows), default=0)
+    return [r + [""] * (width - len(r)) for r in rows]
+
+
+def _openpyxl_body(path, sheet, header_row, usecols, rows):
+    """(header and selected body rows, filled positions) read by openpyxl in read-only mode.
+
+    The label column comes from a scan of the sheet XML (``read_body_scan``);
+    openpyxl then reads up to the last selected row and no further. Rows
+    above the first selected one are still parsed, only not converted.
+    """
+    from engine.schema import read_body_scan
+
+    labels, filled = read_body_scan(path, sheet, header_row, usecols)
+    ranges = rows(labels)
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if isinstance(sheet, str) else wb.worksheets[sheet]
+        ws.reset_dimensions()
+        header = next(ws.iter_rows(min_row=header_row + 1, max_row=header_row + 1), ())
+        selected = []
+        if ranges:
+            body = ws.iter_rows(min_row=header_row + 2 + ranges[0][0], max_row=header_row + 1 + ranges[-1][1])
+            selected = [pick_cells(row, usecols, openpyxl_cell) for row in range_rows(body, ranges, ranges[0][0])]
+    finally:
+        wb.close()
+    return [pick_cells(header, usecols, openpyxl_cell)] + selected, filled
+
+
+def sheet_rows(path, sheet=0, backend=None, usecols=None):
+    """Cell values of one sheet as lists, converted the way ``pd.read_excel`` sees them.
+
+    ``usecols`` (column positions) keeps only those cells of every row.
+    """
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen okuyucu: {backend}")
+    if backend == CALAMINE:
+        rows = _calamine_rows(path, sheet, usecols)
+        if rows is not None:
+            return rows
+    # pd.read_excel's openpyxl reader also opens the workbook read-only
+    return _openpyxl_rows(path, sheet, usecols)
+
+
+def _parse(rows, header):
+    # The parser call of pd.read_excel with default arguments
+    return TextParser(rows, header=header, skip_blank_lines=False).read()
+
+
+# ------------------------------
+# FRAMES
+# ------------------------------
+def read_sheet(path, sheet=0, is_header=None, backend=None, header_row=None, usecols=None, rows=None):
+    """One sheet as ``pd.read_excel(header=<row>, usecols=usecols)`` returns it.
+
+    The header row is ``header_row`` when known (a ParsePlan's), else the
+    first whose first cell satisfies ``is_header`` (row 0 when both are
+    None). Every backend gives the same frame; the faster ones read the
+    workbook once, where the ``openpyxl`` backend reads it twice through
+    ``pd.read_excel`` like the reports always did, unless the row is known.
+    ``usecols`` needs a known header row: it must not drop the column the
+    header search looks at.
+
+    ``rows(labels)`` bounds the read (it needs the header row and
+    ``usecols``): it gets the first column of the body rows and returns the
+    [(start, stop)] body row ranges to keep, so only those rows are parsed
+    (see ``read_body``).
+    """
+    backend = backend or default_backend()
+    if rows is not None:
+        if header_row is None or usecols is None:
+            raise ValueError("satır aralıkları için başlık satırı ve sütunlar bilinmeli")
+        return read_body(path, sheet, header_row, usecols, rows, backend)
+    if header_row is not None:
+        is_header = None
+    elif usecols is not None:
+        raise ValueError("usecols için başlık satırı bilinmeli (header_row)")
+    if backend == OPENPYXL:
+        header = header_row or 0
+        if is_header is not None:
+            raw = pd.read_excel(path, sheet_name=sheet, header=None)
+            header = raw.index[raw[0].map(is_header).astype(bool)][0]
+        return pd.read_excel(path, sheet_name=sheet, header=header, usecols=usecols)
+
+    rows = sheet_rows(path, sheet, backend, usecols)
+    header = header_row or 0
+    if is_header is not None:
+        header = next((i for i, row in enumerate(rows) if row and is_header(row[0])), None)
+        if header is None:
+            raise IndexError(f"{os.path.basename(path)}: başlık satırı bulunamadı")
+    return _parse(rows, header)
+
+
+def read_body(path, sheet, header_row, usecols, rows, backend=None):
+    """The body rows ``rows(labels)`` keeps, as ``read_sheet`` would give them.
+
+    Columns are dropped only when they are empty in the whole sheet, as
+    ``dropna(axis=1, how="all")`` on a full read would drop them. calamine
+    converts only the kept rows; openpyxl's read-only reader stops after
+    the last one, but still parses the rows above the first.
+    ``pd.read_excel`` (the ``openpyxl`` backend) has no row bound: it
+    reads the whole sheet, which is then cut.
+    """
+    backend = backend or default_backend()
+    if backend == OPENPYXL:
+        df = pd.read_excel(path, sheet_name=sheet, header=header_row, usecols=usecols).dropna(axis=1, how="all")
+        ranges = rows(df.iloc[:, 0].tolist())
+        return df.iloc[[i for start, stop in ranges for i in range(start, stop)]]
+
+    body = _calamine_body(path, sheet, header_row, usecols, rows) if backend == CALAMINE else None
+    if body is None:
+        body = _openpyxl_body(path, sheet, header_row, usecols, rows)
+    cells, filled = body
+    df = _parse(cells, 0)
+    return df.iloc[:, [j for j, i in enumerate(usecols) if i in filled]]
@@ -0,0 +1,290 @@
+import time
+
+from engine.agency import aggregate_agency
+from engine.cube import CUBE_COLUMNS, build_cube
+from engine.excel import stream_workbook, write_workbook
+from engine.fx import MONTH_AVERAGE, load_rates
+from engine.hashing import file_hash
+from engine.inputs import AGENCY, UYRUK, as_list, load_agency, load_uyruk, plan_inputs
+from engine.kpi import agency_kpis, uyruk_kpis
+from engine.metrics import HISTORY_FILE, RunMetrics
+from engine.result_cache import result_key
+from engine.snapshots import SNAPSHOT_DIR, SnapshotStore, build_pickup_report
+from engine.uyruk import build_uyruk_report, region_reference
+
+
+def _no_log(message):
+    pass
+
+
+# ============================
+# EXTRA OUTPUTS
+# ============================
+def _write_extra_outputs(report, input_file, output_file, tables, sqlite_file, columnar, log, metrics):
+    if sqlite_file:
+        log("🗄️ SQLite veritabanı yazılıyor...")
+        from engine.sqlite_export import export_sqlite
+        with metrics.stage("sqlite"):
+            export_sqlite(sqlite_file, {f"{report}_{name}": df for name, df in tables.items()}, input_file, report,
+                          metrics.file_hashes())
+        metrics.add_output(sqlite_file)
+        log(f"✓ SQLite: {sqlite_file}")
+
+    if columnar:
+        t0 = time.perf_counter()
+        from engine.columnar import export_columnar
+        with metrics.stage("columnar"):
+            paths = export_columnar(output_file, tables, columnar)
+        for path in paths:
+            metrics.add_output(path)
+        log(f"✓ {', '.join(columnar)}: {len(paths)} dosya ({time.perf_counter() - t0:.2f} sn)")
+
+
+def _result_rows(metrics, frames):
+    metrics.rows({name: len(df) for name, df in frames.items()}, prefix="result.")
+
+
+# ============================
+# RESULT CACHE
+# ============================
+def _cache_lookup(result_cache, report, input_file, reference, metrics, log):
+    """(key, cached result or None); (None, None) without a cache."""
+    if result_cache is None:
+        return None, None
+    with metrics.stage("cache_lookup"):
+        key = result_key(report, input_file, reference, metrics.file_hashes())
+        hit = result_cache.get(key)
+    if hit is not None:
+        metrics.plan = {"strategy": "cached"}
+        metrics.rows(hit.counts)
+        log("⚡ Aynı girdi ve kurallar: sonuç önbellekten alındı")
+    return key, hit
+
+
+def _reference(reference, months):
+    # A month filter makes a different result from the same inputs
+    return reference if not months else {"reference": reference, "months": list(months)}
+
+
+def _emit_cached(hit, output_file, write, metrics, preview):
+    frames = hit.frames
+    _result_rows(metrics, frames)
+    preview(frames)
+    if output_file:
+        with metrics.stage("xlsx"):
+            if not hit.copy_xlsx(output_file):
+                write(output_file, frames)
+        metrics.add_output(output_file)
+    return frames
+
+
+# ============================
+# KPI PREVIEW
+# ============================
+def _kpi_preview(on_kpis, kpis, metrics):
+    """Hands the KPI summary to ``on_kpis`` before any workbook is written."""
+    def preview(frames):
+        if on_kpis is not None:
+            with metrics.stage("kpi"):
+                summary = kpis(frames)
+            on_kpis(summary)
+    return preview
+
+
+# ============================
+# AGENCY
+# ============================
+def run_agency_report(input_file, output_file, sqlite_file=None, log=_no_log, parse_cache=None,
+                      columnar=(), source="engine", history=HISTORY_FILE, snapshot_dir=None, result_cache=None,
+                      fx_table=None, fx_method=MONTH_AVERAGE, on_kpis=None, months=None, strategy=None):
+    """``input_file`` may be one path or a list of exports (every matching sheet is used).
+
+    Every run appends a metrics record (row counts, per-stage time and memory)
+    to ``history``; pass ``history=None`` to skip it. ``output_file=None`` skips
+    the xlsx (the frames are still returned). With ``snapshot_dir`` the
+    Summary is also stored as today's snapshot for the pickup report. A
+    ``result_cache`` (ResultCache) hands back the result of an identical
+    earlier run instead of recomputing it. ``fx_table`` (CSV / xlsx, see
+    ``engine.fx``) adds the EUR amounts in every currency of the table.
+    ``on_kpis(kpis)`` receives the ``agency_kpis`` summary as soon as the
+    result is aggregated, before the workbook is written. ``months`` (month
+    numbers, see ``engine.months.parse_months``) reports only those months.
+    ``strategy`` (see ``engine.planner.make_plan``) overrides the memory
+    based plan; MAP_REDUCE cleans and sums each month in its own process.
+    """
+    with RunMetrics(AGENCY, input_file, source=source, history=history) as metrics:
+        rates = None
+        if fx_table:
+            with metrics.stage("fx"):
+                rates = load_rates(fx_table)
+            log(f"💱 Kurlar: {', '.join(rates.currencies)} ({fx_method})")
+
+        fx_key = {"fx": file_hash(fx_table), "method": fx_method} if fx_table else None
+        key, hit = _cache_lookup(result_cache, AGENCY, input_file, _reference(fx_key, months), metrics, log)
+        preview = _kpi_preview(on_kpis, agency_kpis, metrics)
+        if hit is not None:
+            frames = _emit_cached(hit, output_file, write_workbook, metrics, preview)
+        else:
+            log("📥 Okuma Excel...")
+            plan = plan_inputs(input_file, AGENCY, strategy=strategy, log=log)
+            log("🌍 Ay, pazar ve agenta grupları belirleniyor...")
+            counts = {}
+            df_clean = load_agency(input_file, counts=counts, parse_cache=parse_cache, log=log, metrics=metrics,
+                                   plan=plan, months=months)
+            metrics.rows(counts)
+
+            log("📊 toplama agenta agenta данных...")
+            with metrics.stage("aggregate"):
+                frames = aggregate_agency(df_clean)
+            if rates is not None:
+                with metrics.stage("fx"):
+                    frames = rates.convert_frames(frames, method=fx_method)
+            _result_rows(metrics, frames)
+            preview(frames)
+
+            if output_file:
+                log("💾 Yeni  Excel oluşturma...")
+                with metrics.stage("xlsx"):
+                    write_workbook(output_file, frames)
+                metrics.add_output(output_file)
+
+            if key is not None:
+                with metrics.stage("cache_store"):
+                    result_cache.put(key, frames, output_file, counts)
+
+        _write_extra_outputs(AGENCY, input_file, output_file, {
+            "summary": frames["Summary"],
+            "by_group": frames["By Group"],
+            "by_market": frames["By Market"]
+        }, sqlite_file, columnar, log, metrics)
+
+        if snapshot_dir and months:
+            # A snapshot stands for the whole season; a partial one would read as lost bookings
+            log("📸 Ay filtresi seçiliyken snapshot alınmaz")
+        elif snapshot_dir:
+            summary = frames["Summary"]
+            if rates is not None:
+                # Snapshots keep the export's own measures; rates change independently of bookings
+                summary = summary.drop(columns=rates.added_columns(summary))
+            with metrics.stage("snapshot"):
+                manifest = SnapshotStore(snapshot_dir).save(summary, inputs=as_list(input_file))
+            log(f"📸 Snapshot {manifest['day']}: {len(manifest['months'])} ay, "
+                f"{manifest['new_blocks']} yeni blok")
+
+    log(f"⏱ {metrics.summary()}")
+    return frames
+
+
+# ============================
+# AGENCY × NATIONALITY CUBE
+# ============================
+CUBE = "cube"
+
+
+def run_cube_report(agency_file, uyruk_file, pairs, output_file, log=_no_log, parse_cache=None, columnar=(),
+                    source="engine", history=HISTORY_FILE, months=None, strategy=None):
+    """Agency group × region × country × month cube of an agency and an Uyruk export
+    (see ``build_cube``). Both inputs may be one path or a list of exports;
+    ``months`` limits both to those months. Only the CUBE_COLUMNS measures are read;
+    ``strategy`` works as in ``run_agency_report``."""
+    inputs = as_list(agency_file) + as_list(uyruk_file)
+    with RunMetrics(CUBE, inputs, source=source, history=history) as metrics:
+        with metrics.stage("reference"):
+            ref = region_reference(pairs, parse_cache)
+
+        log("📥 Agency okunuyor...")
+        counts = {}
+        df_agency = load_agency(agency_file, CUBE_COLUMNS, counts=counts, parse_cache=parse_cache, log=log,
+                                metrics=metrics, plan=plan_inputs(agency_file, AGENCY, strategy=strategy, log=log),
+                                months=months)
+        metrics.rows(counts, prefix="agency.")
+        log("📥 Uyruk okunuyor...")
+        counts = {}
+        df_uyruk = load_uyruk(uyruk_file, ref, counts=counts, parse_cache=parse_cache, log=log, metrics=metrics,
+                              plan=plan_inputs(uyruk_file, UYRUK, strategy=strategy, log=log), months=months,
+                              columns=CUBE_COLUMNS)
+        metrics.rows(counts, prefix="uyruk.")
+
+        log("🧊 Küp oluşturuluyor...")
+        with metrics.stage("cube"):
+            frames = build_cube(df_agency, df_uyruk)
+        _result_rows(metrics, frames)
+
+        unmatched = frames["Matches"].query("match == 'unmatched'")["Agency"].tolist()
+        if unmatched:
+            log(f"⚠️ Eşleşmeyen acenteler (SORSAT): {', '.join(unmatched)}")
+
+        if output_file:
+            with metrics.stage("xlsx"):
+                write_workbook(output_file, frames)
+            metrics.add_output(output_file)
+
+        _write_extra_outputs(CUBE, inputs, output_file, {"cube": frames["Cube"], "by_group": frames["By Group"]},
+                             None, columnar, log, metrics)
+
+    log(f"⏱ {metrics.summary()}")
+    return frames
+
+
+# ============================
+# PICKUP
+# ============================
+def run_pickup_report(output_file, day=None, compare=None, days_back=1, snapshot_dir=SNAPSHOT_DIR,
+                      log=_no_log):
+    """Pickup between two stored snapshots (see ``build_pickup_report``) written to ``output_file``."""
+    store = SnapshotStore(snapshot_dir)
+    day, compare, frames = build_pickup_report(store, day, compare, days_back)
+    log(f"📈 Pickup: {compare} → {day}")
+    write_workbook(output_file, frames)
+    return day, compare, frames
+
+
+# ============================
+# UYRUK
+# ============================
+def run_uyruk_report(input_file, pairs, output_file, sqlite_file=None, log=_no_log, parse_cache=None,
+                     columnar=(), source="engine", history=HISTORY_FILE, result_cache=None, on_kpis=None,
+                     months=None, strategy=None):
+    """``input_file`` may be one path or a list of exports; ``pairs`` is the reference
+    file path or an already loaded RegionReference. ``output_file=None`` skips the xlsx;
+    ``result_cache``, ``on_kpis``, ``months`` and ``strategy`` work as in ``run_agency_report``."""
+    with RunMetrics(UYRUK, input_file, source=source, history=history) as metrics:
+        log("📥 VERİ YÜKLENİYOR...")
+        with metrics.stage("reference"):
+            ref = region_reference(pairs, parse_cache)
+
+        key, hit = _cache_lookup(result_cache, UYRUK, input_file, _reference(ref.fingerprint, months), metrics, log)
+        preview = _kpi_preview(on_kpis, uyruk_kpis, metrics)
+        if hit is not None:
+            result = _emit_cached(hit, output_file, lambda path, frames: frames["Uyruk"].to_excel(path, index=False),
+                                  metrics, preview)["Uyruk"]
+        else:
+            plan = plan_inputs(input_file, UYRUK, strategy=strategy, log=log)
+            counts = {}
+            df_clean = load_uyruk(input_file, ref, counts=counts, parse_cache=parse_cache, log=log,
+                                  metrics=metrics, plan=plan, months=months)
+            metrics.rows(counts)
+
+            with metrics.stage("build"):
+                result = build_uyruk_report(df_clean)
+            _result_rows(metrics, {"Uyruk": result})
+            preview({"Uyruk": result})
+
+            if output_file:
+                with metrics.stage("xlsx"):
+                    if plan.streaming:
+                        # The row-level result is as large as the input: write it row by row
+                        stream_workbook(output_file, {"Sheet1": result})
+                    else:
+                        result.to_excel(output_file, index=False)
+                metrics.add_output(output_file)
+
+            if key is not None:
+                with metrics.stage("cache_store"):
+                    result_cache.put(key, {"Uyruk": result}, output_file, counts)
+
+        _write_extra_outputs(UYRUK, input_file, output_file, {"result": result}, sqlite_file, columnar, log,
+                             metrics)
+
+    log(f"⏱ {metrics.summary()}")
+    return {"Uyruk": result}
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+
+from engine.hashing import file_hash
+
+RESULT_CACHE_DIR = os.environ.get(
+    "RAPOR_RESULT_CACHE", os.path.join(os.path.expanduser("~"), ".rapor", "results")
+)
+RESULT_CACHE_MB = int(os.environ.get("RAPOR_RESULT_CACHE_MB", 500))
+
+FRAMES_FILE = "frames.pkl"
+XLSX_FILE = "result.xlsx"
+META_FILE = "meta.json"
+
+ENGINE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_lock = threading.Lock()
+
+
+# ------------------------------
+# KEY PARTS
+# ------------------------------
+@lru_cache(maxsize=None)
+def engine_version():
+    """Hash of the engine sources: any code change invalidates cached results."""
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(ENGINE_DIR)):
+        if name.endswith(".py"):
+            with open(os.path.join(ENGINE_DIR, name), "rb") as f:
+                h.update(name.encode() + b"\0" + f.read())
+    return h.hexdigest()[:16]
+
+
+def rules_version(report):
+    """Hash of the report's labelling rules and measure lists."""
+    from engine import agency, uyruk
+    if report == "agency":
+        rules = [agency.AGENCY_GROUP_RULES, agency.MARKET_NAMES_MAP, agency.NUMERIC_COLS,
+                 agency.SUMMARY_AGG, agency.REPORT_YEAR, agency.MONTH_PATTERN]
+    else:
+        rules = [uyruk.SERVICE_WORDS, uyruk.DIMENSION_COLS, uyruk.REPORT_YEAR]
+    return hashlib.sha256(repr(rules).encode()).hexdigest()[:16]
+
+
+def result_key(report, inputs, reference=None, hashes=None):
+    """Cache key of one run: input file hashes (in merge order), reference hash,
+    rules version and engine version. ``hashes`` ({absolute path: SHA-256},
+    see ``RunMetrics.file_hashes``) saves hashing the inputs again."""
+    from engine.inputs import as_list
+
+    # Same order as expand_inputs: newer exports win on overlapping months
+    paths = sorted(as_list(inputs), key=lambda p: (os.path.getmtime(p), p))
+    parts = {
+        "report": report,
+        "inputs": [hashes[os.path.abspath(p)] if hashes else file_hash(p) for p in paths],
+        "reference": reference,
+        "rules": rules_version(report),
+        "engine": engine_version(),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+# ------------------------------
+# CACHE
+# ------------------------------
+class CachedResult:
+    def __init__(self, directory, meta):
+        self.directory = directory
+        self.meta = meta
+        self.counts = meta.get("counts", {})
+
+    @property
+    def frames(self):
+        return pd.read_pickle(os.path.join(self.directory, FRAMES_FILE))
+
+    def copy_xlsx(self, output_file):
+        """Copy the cached workbook to ``output_file``; False when none was cached."""
+        source = os.path.join(self.directory, XLSX_FILE)
+        if not os.path.exists(source):
+            return False
+        shutil.copyfile(source, output_file)
+        return True
+
+
+class ResultCache:
+    """Finished report results on disk, keyed by ``result_key``.
+
+    Each entry is a folder with the result frames, the xlsx that was written
+    (if any) and a small meta file. Entries are touched on every hit and the
+    least recently used ones are removed once the folder grows past
+    ``max_mb``.
+    """
+
+    def __init__(self, root=RESULT_CACHE_DIR, max_mb=RESULT_CACHE_MB):
+        self.root = root
+        self.max_bytes = max_mb * 2 ** 20
+
+    def _entry(self, key):
+        return os.path.join(self.root, key)
+
+    def get(self, key):
+        directory = self._entry(key)
+        try:
+            with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+                meta = json.load(f)
+            os.utime(directory)
+        except (OSError, ValueError):
+            return None
+        return CachedResult(directory, meta)
+
+    def put(self, key, frames, output_file=None, counts=None):
+        """Store a result; best effort, a full or read-only disk must not fail the report."""
+        tmp = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        try:
+            os.makedirs(tmp)
+            pd.to_pickle(frames, os.path.join(tmp, FRAMES_FILE))
+            if output_file and os.path.exists(output_file):
+                shutil.copyfile(output_file, os.path.join(tmp, XLSX_FILE))
+            meta = {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "counts": counts or {},
+            }
+            with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+            with _lock:
+                target = self._entry(key)
+                if os.path.exists(target):
+                    shutil.rmtree(target, ignore_errors=True)
+                os.replace(tmp, target)
+                self._evict()
+        except OSError:
+            pass
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(".tmp-") or not os.path.isdir(path):
+                continue
+            size = sum(e.stat().st_size for e in os.scandir(path) if e.is_file())
+            entries.append((os.path.getmtime(path), size, path))
+
+        total = sum(size for _, size, _ in entries)
+        # Oldest use first; the newest entry always stays
+        for _, size, path in sorted(entries)[:-1]:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __len__(self):
+        if not os.path.isdir(self.root):
+            return 0
+        return sum(1 for name in os.listdir(self.root) if not name.startswith(".tmp-"))
@@ -0,0 +1,392 @@
+import hashlib
+import os
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from engine import agency, uyruk
+from engine.kpi import measure_key
+from engine.planner import sheet_parts
+from engine.readers import is_empty_cell, openpyxl_cell
+
+AGENCY = "agency"
+UYRUK = "uyruk"
+
+HEADER_SCAN_ROWS = 50
+
+
+class SchemaError(ValueError):
+    """An input whose header does not fit the report; raised before its body is read."""
+
+
+# ------------------------------
+# LAYOUTS
+# ------------------------------
+class Layout:
+    """What a report needs from an export's header row."""
+
+    def __init__(self, kind, title, is_header, normalize, label, required, numeric, decimal_comma):
+        self.kind = kind
+        self.title = title
+        self.is_header = is_header
+        self.normalize = normalize
+        self.label = label
+        self.required = required
+        self.numeric = numeric
+        self.decimal_comma = decimal_comma
+
+
+LAYOUTS = {
+    AGENCY: Layout(
+        AGENCY, "Agency", agency.is_header_label, agency.normalize_columns, 'agency',
+        required=list(agency.SUMMARY_AGG),
+        numeric=lambda columns: [c for c in agency.NUMERIC_COLS if c in columns],
+        decimal_comma=False,
+    ),
+    UYRUK: Layout(
+        UYRUK, "AgencyGroup", uyruk.is_header_label, uyruk.normalize_columns, 'agencygroup',
+        required=[],
+        numeric=lambda columns: [c for c in columns if c not in uyruk.DIMENSION_COLS],
+        decimal_comma=True,
+    ),
+}
+
+
+# ------------------------------
+# PARSE PLAN
+# ------------------------------
+class ParsePlan:
+    """Column handling of one header layout, worked out once per fingerprint.
+
+    ``header_row`` is the header's row index in the sheet, ``columns`` the
+    normalised names, ``numeric`` the measure columns, ``usecols`` the
+    positions of the label and measure columns. ``read_columns`` is what a
+    reader should read: None for every column, ``usecols`` once projected.
+    """
+
+    def __init__(self, layout, fingerprint, header_row, header):
+        self.kind = layout.kind
+        self.fingerprint = fingerprint
+        self.header_row = header_row
+        self.header = header
+        self.columns = list(layout.normalize(pd.Index(header)))
+        self.label = layout.label
+        self.numeric = layout.numeric(self.columns)
+        self.decimal_comma = layout.decimal_comma
+        self.usecols = [i for i, c in enumerate(self.columns) if c == self.label or c in self.numeric]
+        self.read_columns = None
+        self._normalize = layout.normalize
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def normalize(self, columns):
+        """Normalised column names, each raw name run through the regex chain only once."""
+        with self._lock:
+            missing = [c for c in dict.fromkeys(columns) if c not in self._names]
+            if missing:
+                self._names.update(zip(missing, self._normalize(pd.Index(missing))))
+            return pd.Index([self._names[c] for c in columns])
+
+    def _copy(self):
+        # Shares the column work (and the name memo) with this plan
+        plan = object.__new__(ParsePlan)
+        plan.__dict__.update(self.__dict__)
+        return plan
+
+    def with_header_row(self, header_row):
+        # Same layout further down another sheet: own row index
+        plan = self._copy()
+        plan.header_row = header_row
+        return plan
+
+    def project(self, columns):
+        """This plan reading only the label column and the measures among ``columns``.
+
+        Names are compared by ``measure_key``, so 'night_room' also selects
+        the Uyruk export's 'night__x000a_room'. Returns the plan itself
+        when every measure is wanted.
+        """
+        wanted = {measure_key(c) for c in columns}
+        numeric = [c for c in self.numeric if measure_key(c) in wanted]
+        if numeric == self.numeric:
+            return self
+        plan = self._copy()
+        plan.numeric = numeric
+        plan.usecols = plan.read_columns = [
+            i for i, c in enumerate(self.columns) if c == self.label or c in numeric]
+        return plan
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def fingerprint(kind, header):
+    text = "\x1f".join(str(v) for v in header)
+    return hashlib.sha256(f"{kind}\x1e{text}".encode("utf-8")).hexdigest()[:16]
+
+
+def validate(plan, layout):
+    """Problems of a layout for its report, empty when it can be parsed."""
+    problems = []
+    if layout.label not in plan.columns:
+        problems.append(f"'{layout.label}' etiket sütunu yok (ilk başlık: {plan.header[0]!r})")
+    missing = [c for c in layout.required if c not in plan.columns]
+    if missing:
+        problems.append(f"eksik sütunlar: {', '.join(missing)}")
+    if not plan.numeric:
+        problems.append("sayısal sütun yok")
+    return problems
+
+
+_plans = {}
+_lock = threading.Lock()
+
+
+def plan_for(kind, header_row, header):
+    """Cached ParsePlan of a header; SchemaError when the layout does not fit.
+
+    Only the problem text of a bad header is cached: a new SchemaError is
+    raised on every call, so no traceback is kept between calls.
+    """
+    key = fingerprint(kind, header)
+    with _lock:
+        cached = _plans.get(key)
+    if cached is None:
+        layout = LAYOUTS[kind]
+        plan = ParsePlan(layout, key, header_row, header)
+        problems = validate(plan, layout)
+        cached = "; ".join(problems) if problems else plan
+        with _lock:
+            _plans[key] = cached
+    if isinstance(cached, str):
+        raise SchemaError(cached)
+    return cached if cached.header_row == header_row else cached.with_header_row(header_row)
+
+
+# ------------------------------
+# HEADER BLOCK
+# ------------------------------
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _column_index(letters):
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+
+def _xml_value(cell, kind, text):
+    # The values openpyxl_cell gives for header cells; shared strings are resolved later
+    if kind == "s":
+        return ("s", int(text))
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{_MAIN}t"))
+    if text is None:
+        return ""
+    if kind in ("str", "d"):
+        return text
+    if kind == "b":
+        return text == "1"
+    if kind == "e":
+        return np.nan
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+
+def _xml_rows(stream, scan_rows):
+    """The first ``scan_rows`` rows of a sheet XML part, parsed only that far."""
+    rows = []
+    for _, elem in ET.iterparse(stream):
+        if elem.tag != f"{_MAIN}row":
+            continue
+        index = int(elem.get("r") or len(rows) + 1) - 1
+        if index >= scan_rows:
+            break
+        values = []
+        for position, cell in enumerate(elem.iter(f"{_MAIN}c")):
+            ref = _CELL_REF.match(cell.get("r") or "")
+            column = _column_index(ref.group(1)) if ref else position
+            values.extend([""] * (column - len(values)))
+            v = cell.find(f"{_MAIN}v")
+            values.append(_xml_value(cell, cell.get("t"), None if v is None else v.text))
+        rows.extend([[]] * (index - len(rows)))
+        rows.append(values)
+        elem.clear()
+    return rows
+
+
+def _shared_strings(z, needed=None):
+    # Shared strings up to the highest index the header blocks use (None: all of them)
+    strings = []
+    if needed is not None and not needed or "xl/sharedStrings.xml" not in z.namelist():
+        return strings
+    last = None if needed is None else max(needed)
+    with z.open("xl/sharedStrings.xml") as stream:
+        for _, elem in ET.iterparse(stream):
+            if elem.tag != f"{_MAIN}si":
+                continue
+            # Rich text runs are joined, phonetic runs (rPh) left out
+            parts = [elem.find(f"{_MAIN}t")] + [r.find(f"{_MAIN}t") for r in elem.findall(f"{_MAIN}r")]
+            strings.append("".join(t.text or "" for t in parts if t is not None))
+            elem.clear()
+            if last is not None and len(strings) > last:
+                break
+    return strings
+
+
+def header_blocks(path, scan_rows=HEADER_SCAN_ROWS):
+    """{worksheet name: first ``scan_rows`` rows} read straight from the workbook XML.
+
+    Only the top of each sheet part is parsed, so a header check costs
+    milliseconds however large the sheet is; openpyxl's read-only mode
+    would parse a sheet without a <dimension> element end to end first.
+    Number formats are not applied: a date cell above the header stays a
+    serial number, which no header check looks at.
+    """
+    blocks = {}
+    with zipfile.ZipFile(path) as z:
+        for name, part in sheet_parts(z).items():
+            if part and "/worksheets/" in part:
+                with z.open(part) as stream:
+                    blocks[name] = _xml_rows(stream, scan_rows)
+
+        needed = {v[1] for rows in blocks.values() for row in rows for v in row if isinstance(v, tuple)}
+        strings = _shared_strings(z, needed)
+    return {
+        name: [[strings[v[1]] if isinstance(v, tuple) else v for v in row] for row in rows]
+        for name, rows in blocks.items()
+    }
+
+
+def _openpyxl_blocks(path, scan_rows):
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        blocks = {}
+        for ws in wb.worksheets:
+            ws.reset_dimensions()
+            blocks[ws.title] = [[openpyxl_cell(c) for c in row] for row in ws.iter_rows(max_row=scan_rows)]
+        return blocks
+    finally:
+        wb.close()
+
+
+def read_header_blocks(path, scan_rows=HEADER_SCAN_ROWS):
+    try:
+        return header_blocks(path, scan_rows)
+    except (KeyError, IndexError, ValueError, ET.ParseError):
+        # Unusual package layout: let openpyxl find the sheets
+        return _openpyxl_blocks(path, scan_rows)
+
+
+def sheet_header(rows):
+    """(kind, row index, header values) of a header block; None if neither report."""
+    for i, row in enumerate(rows):
+        values = list(row)
+        if not values or values[0] == "":
+            continue
+        for kind, layout in LAYOUTS.items():
+            if layout.is_header(values[0]):
+                # Like read_excel: the header ends at the last non-empty cell
+                while values and values[-1] == "":
+                    values.pop()
+                return kind, i, values
+    return None
+
+
+def sheet_plan(path, sheet, rows, kind):
+    """ParsePlan of one sheet's header block for ``kind``; None when the sheet holds no such export."""
+    found = sheet_header(rows)
+    if found is None or found[0] != kind:
+        return None
+    try:
+        return plan_for(kind, found[1], found[2])
+    except SchemaError as e:
+        raise SchemaError(f"{os.path.basename(path)}[{sheet}]: {LAYOUTS[kind].title} raporu okunamıyor — {e}")
+
+
+# ------------------------------
+# BODY SCAN (label column)
+# ------------------------------
+def _worksheet_part(z, sheet):
+    parts = [(name, part) for name, part in sheet_parts(z).items() if part and "/worksheets/" in part]
+    return dict(parts)[sheet] if isinstance(sheet, str) else parts[sheet][1]
+
+
+def _scan_row(row, strings, unfilled):
+    # Label (first column) of one row; columns of ``unfilled`` found with a value are taken out
+    label = ""
+    for position, cell in enumerate(row.iter(f"{_MAIN}c")):
+        ref = _CELL_REF.match(cell.get("r") or "")
+        column = _column_index(ref.group(1)) if ref else position
+        if column != 0 and column not in unfilled:
+            if not unfilled:
+                break
+            continue
+        v = cell.find(f"{_MAIN}v")
+        value = _xml_value(cell, cell.get("t"), None if v is None else v.text)
+        if isinstance(value, tuple):
+            value = strings[value[1]]
+        if column == 0:
+            label = value
+        if column in unfilled and not is_empty_cell(value):
+            unfilled.discard(column)
+    return label
+
+
+def body_scan(path, sheet, header_row, usecols):
+    """(labels, filled) of the rows below ``header_row``, read straight from the sheet XML.
+
+    ``labels`` is the first column of every body row, ``filled`` the
+    positions among ``usecols`` with a value in any of them. No other cell
+    is converted, and a column is no longer looked at once it has a value.
+    """
+    unfilled = set(usecols)
+    labels = []
+    index = -1
+    with zipfile.ZipFile(path) as z:
+        strings = _shared_strings(z)
+        with z.open(_worksheet_part(z, sheet)) as stream:
+            for _, elem in ET.iterparse(stream):
+                if elem.tag != f"{_MAIN}row":
+                    continue
+                index = int(elem.get("r") or index + 2) - 1
+                if index > header_row:
+                    labels.extend([""] * (index - header_row - 1 - len(labels)))
+                    labels.append(_scan_row(elem, strings, unfilled))
+                elem.clear()
+    return labels, set(usecols) - unfilled
+
+
+def _openpyxl_body_scan(path, sheet, header_row, usecols):
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if isinstance(sheet, str) else wb.worksheets[sheet]
+        ws.reset_dimensions()
+        labels, filled = [], set()
+        for row in ws.iter_rows(min_row=header_row + 2):
+            labels.append(openpyxl_cell(row[0]) if row else "")
+            filled.update(i for i in usecols if i < len(row) and not is_empty_cell(openpyxl_cell(row[i])))
+        return labels, filled
+    finally:
+        wb.close()
+
+
+def read_body_scan(path, sheet, header_row, usecols):
+    try:
+        return body_scan(path, sheet, header_row, usecols)
+    except (KeyError, IndexError, ValueError, ET.ParseError):
+        # Unusual package layout: let openpyxl read the sheet
+        return _openpyxl_body_scan(path, sheet, header_row, usecols)
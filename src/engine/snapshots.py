@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+SNAPSHOT_DIR = os.environ.get(
+    "RAPOR_SNAPSHOTS", os.path.join(os.path.expanduser("~"), ".rapor", "snapshots")
+)
+
+KEYS = ['agency_group', 'month', 'market', 'agency']
+
+PICKUP_MEASURES = ['night_room', 'eur_revenue', 'arrival_room']
+
+PICKUP_LEVELS = {
+    "Pickup": ['month', 'market', 'agency_group', 'agency'],
+    "By Market": ['month', 'market'],
+    "By Group": ['month', 'agency_group'],
+    "By Month": ['month'],
+}
+
+
+def as_day(value):
+    """'YYYY-MM-DD' for a date, datetime or string."""
+    if value is None:
+        return date.today().isoformat()
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(str(value)).isoformat()
+
+
+def _write_atomic(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _block_hash(block):
+    h = hashlib.sha256()
+    h.update("\0".join(map(str, block.columns)).encode())
+    h.update(pd.util.hash_pandas_object(block, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+# ------------------------------
+# SNAPSHOT STORE
+# ------------------------------
+class SnapshotStore:
+    """Daily on-the-books snapshots of the agency summary, deduplicated by month.
+
+    Each month of a snapshot is stored once as a block named by its content
+    hash; a snapshot is a small manifest {month: block}. Closed months do not
+    change from one day to the next, so a season of daily snapshots costs
+    little more than the months that actually moved.
+
+        root/blocks/<sha256>.pkl
+        root/snapshots/<YYYY-MM-DD>.json
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self.blocks_dir = os.path.join(root, "blocks")
+        self.manifests_dir = os.path.join(root, "snapshots")
+
+    def _block_path(self, block_hash):
+        return os.path.join(self.blocks_dir, f"{block_hash}.pkl")
+
+    def _manifest_path(self, day):
+        return os.path.join(self.manifests_dir, f"{day}.json")
+
+    def save(self, summary, day=None, inputs=()):
+        """Store the agency ``Summary`` frame as the snapshot of ``day`` (default today)."""
+        day = as_day(day)
+        os.makedirs(self.blocks_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+
+        measures = [c for c in summary.columns
+                    if c not in KEYS and c != 'YIL' and pd.api.types.is_numeric_dtype(summary[c])]
+        df = summary[KEYS + measures]
+
+        months = {}
+        new_blocks = 0
+        for month, block in df.groupby('month', sort=True):
+            block = block.sort_values(KEYS).reset_index(drop=True)
+            block_hash = _block_hash(block)
+            path = self._block_path(block_hash)
+            if not os.path.exists(path):
+                _write_atomic(path, block.to_pickle)
+                new_blocks += 1
+            months[month] = block_hash
+
+        manifest = {
+            "day": day,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "inputs": [os.path.abspath(p) for p in inputs],
+            "rows": len(df),
+            "months": months,
+            "new_blocks": new_blocks,
+        }
+
+        def write(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=1)
+        _write_atomic(self._manifest_path(day), write)
+        return manifest
+
+    def days(self):
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.manifests_dir) if name.endswith(".json"))
+
+    def manifest(self, day):
+        with open(self._manifest_path(as_day(day)), encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self, day):
+        blocks = [pd.read_pickle(self._block_path(h)) for h in self.manifest(day)["months"].values()]
+        return pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame(columns=KEYS)
+
+    def latest(self, on_or_before=None):
+        """Newest snapshot day not after ``on_or_before``; None if there is none."""
+        limit = as_day(on_or_before)
+        days = [d for d in self.days() if d <= limit]
+        return days[-1] if days else None
+
+    def previous(self, day, days_back=1):
+        """Snapshot to compare ``day`` with: the newest one at least ``days_back`` days older."""
+        target = date.fromisoformat(as_day(day)) - timedelta(days=days_back)
+        return self.latest(target)
+
+
+# ------------------------------
+# PICKUP
+# ------------------------------
+def pickup(now, prev, keys, measures=PICKUP_MEASURES):
+    """Keyed outer join of two snapshots: <m>_prev, <m>_now and <m>_pickup per key."""
+    measures = [m for m in measures if m in now.columns or m in prev.columns]
+    now_sums = now.groupby(keys, dropna=False)[measures].sum()
+    prev_sums = prev.groupby(keys, dropna=False)[measures].sum()
+
+    joined = prev_sums.join(now_sums, how="outer", lsuffix="_prev", rsuffix="_now").fillna(0)
+    columns = []
+    for m in measures:
+        joined[f"{m}_pickup"] = joined[f"{m}_now"] - joined[f"{m}_prev"]
+        columns += [f"{m}_prev", f"{m}_now", f"{m}_pickup"]
+    return joined[columns].sort_index().reset_index()
+
+
+def build_pickup_report(store, day=None, compare=None, days_back=1):
+    """Pickup frames between snapshot ``day`` (default: newest) and ``compare``
+    (default: the newest snapshot at least ``days_back`` days older)."""
+    day = store.latest(day)
+    if day is None:
+        raise ValueError("Snapshot bulunamadı")
+    compare = as_day(compare) if compare else store.previous(day, days_back)
+    if compare is None:
+        raise ValueError(f"{day} için karşılaştırılacak daha eski bir snapshot yok")
+
+    now, prev = store.load(day), store.load(compare)
+    frames = {name: pickup(now, prev, keys) for name, keys in PICKUP_LEVELS.items()}
+    return day, compare, frames
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from engine.hashing import file_hash
+
+
+# Columns that BI queries filter / group by
+INDEX_COLUMNS = ['month', 'market', 'agency_group', 'country', 'region']
+
+
+def inputs_hash(paths, hashes=None):
+    """SHA-256 of one input file, or of the per-file hashes for a multi-file run.
+
+    ``hashes`` ({absolute path: SHA-256}) are used instead of reading the files again.
+    """
+    def digest(path):
+        return hashes[os.path.abspath(path)] if hashes else file_hash(path)
+
+    if isinstance(paths, (str, os.PathLike)):
+        return digest(paths)
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(digest(path).encode())
+    return h.hexdigest()
+
+
+def _sql_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _sql_column_names(columns):
+    """Column names made unique for SQLite, which ignores case in names: ``name_1``."""
+    seen = {}
+    names = []
+    for col in map(str, columns):
+        key = col.lower()
+        if key in seen:
+            seen[key] += 1
+            col = f"{col}_{seen[key]}"
+        else:
+            seen[key] = 0
+        names.append(col)
+    return names
+
+
+def _rows(df):
+    # NaN / NA → NULL, numpy scalars → Python scalars; one pass, no frame copy
+    columns = []
+    for i in range(df.shape[1]):
+        s = df.iloc[:, i]
+        values = s.to_numpy(dtype=object)
+        mask = s.isna().to_numpy()
+        if mask.any():
+            values[mask] = None
+        columns.append(values.tolist())
+    return zip(*columns)
+
+
+def write_table(conn, name, df):
+    columns = _sql_column_names(df.columns)
+    col_defs = ", ".join(f'"{c}" {_sql_type(df.dtypes.iloc[i])}' for i, c in enumerate(columns))
+    conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+    conn.execute(f'CREATE TABLE "{name}" ({col_defs})')
+
+    placeholders = ", ".join("?" * len(columns))
+    conn.executemany(f'INSERT INTO "{name}" VALUES ({placeholders})', _rows(df))
+
+    # Indexes are built after the bulk load (cheaper than maintaining them per row)
+    for col in columns:
+        if col.lower() in INDEX_COLUMNS:
+            conn.execute(f'CREATE INDEX "ix_{name}_{col.lower()}" ON "{name}" ("{col}")')
+
+
+def export_sqlite(db_path, tables, input_path, report, hashes=None):
+    """Write result frames as typed fact tables + run metadata in a single transaction.
+
+    ``hashes`` as in ``inputs_hash``.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('BEGIN')
+
+        for name, df in tables.items():
+            write_table(conn, name, df)
+
+        conn.execute('CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)')
+        meta = {
+            'report': report,
+            'input_file': ";".join(os.path.abspath(p) for p in
+                                   ([input_path] if isinstance(input_path, (str, os.PathLike)) else input_path)),
+            'input_sha256': inputs_hash(input_path, hashes),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        for name, df in tables.items():
+            meta[f'rows.{name}'] = str(len(df))
+        conn.executemany('INSERT INTO metadata VALUES (?, ?)', meta.items())
+
+        conn.execute('COMMIT')
+    except Exception:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+
+    return db_path
@@ -0,0 +1,182 @@
+import os
+import shutil
+import tempfile
+
+import openpyxl
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from engine import agency, uyruk
+from engine.months import select_months
+from engine.readers import openpyxl_cell, pick_cells
+
+CHUNK_ROWS = 50_000
+
+
+# ------------------------------
+# CHUNKED SHEET READER
+# ------------------------------
+def _frame(header, rows, normalize):
+    width = len(header)
+    rows = [row[:width] + [""] * (width - len(row)) for row in rows]
+    df = TextParser([header] + rows, header=0).read()
+    df = df.dropna(how="all")
+    df.columns = normalize(df.columns)
+    return df
+
+
+def iter_sheet_chunks(path, sheet, is_header, normalize, chunk_rows=None, usecols=None):
+    """DataFrames of ``chunk_rows`` (default CHUNK_ROWS) rows below the header row of one sheet.
+
+    Mirrors ``read_excel(header=<header row>, usecols=usecols)`` followed by
+    dropping empty rows; only one chunk of cells is held in memory at a
+    time. Cells to the right of the header row are ignored.
+    """
+    chunk_rows = chunk_rows or CHUNK_ROWS
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if isinstance(sheet, str) else wb.worksheets[sheet]
+        ws.reset_dimensions()
+        rows = ws.iter_rows()
+
+        header = None
+        for row in rows:
+            values = [openpyxl_cell(c) for c in row]
+            if values and is_header(values[0]):
+                header = values
+                break
+        if header is None:
+            raise ValueError(f"{os.path.basename(path)}: başlık satırı bulunamadı")
+        while header and header[-1] == "":
+            header.pop()
+        if usecols is not None:
+            header = [header[i] for i in usecols]
+
+        buffer = []
+        chunks = 0
+        for row in rows:
+            if usecols is None:
+                buffer.append([openpyxl_cell(c) for c in row])
+            else:
+                buffer.append(pick_cells(row, usecols, openpyxl_cell))
+            if len(buffer) == chunk_rows:
+                yield _frame(header, buffer, normalize)
+                buffer = []
+                chunks += 1
+        if buffer or not chunks:
+            yield _frame(header, buffer, normalize)
+    finally:
+        wb.close()
+
+
+# ------------------------------
+# SPILL TO DISK
+# ------------------------------
+class SpillStore:
+    """Partial results written to a temporary folder and combined at the end."""
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="rapor-spill-")
+        self.paths = []
+
+    def add(self, df):
+        path = os.path.join(self.directory, f"{len(self.paths):05d}.pkl")
+        df.to_pickle(path)
+        self.paths.append(path)
+
+    def combine(self):
+        return pd.concat([pd.read_pickle(p) for p in self.paths], ignore_index=True)
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _add_counts(total, counts):
+    for key, value in counts.items():
+        total[key] = total.get(key, 0) + value
+
+
+class _FilledColumns:
+    """Columns with at least one value over a whole sheet; read_excel callers drop the rest."""
+
+    def __init__(self):
+        self.filled = {}
+
+    def update(self, df):
+        for col, has_values in df.notna().any().items():
+            self.filled[col] = self.filled.get(col, False) or bool(has_values)
+
+    def empty(self, columns):
+        return [c for c in columns if c in self.filled and not self.filled[c]]
+
+
+# ------------------------------
+# AGENCY
+# ------------------------------
+SUM_KEYS = ['agency_group', 'month', 'market', 'agency']
+
+
+def partial_sums(df_clean):
+    """Measures summed per SUM_KEYS; associative, so partial sums of partial sums are the totals."""
+    numeric = [c for c in df_clean.columns if c not in SUM_KEYS]
+    return df_clean.groupby(SUM_KEYS, dropna=False)[numeric].sum(min_count=1).reset_index()
+
+
+def stream_agency(path, sheet, numeric_cols=agency.NUMERIC_COLS, chunk_rows=None, log=print, schema=None,
+                  months=None):
+    """(agency rows pre-summed per agency_group / month / market / agency, counts) of one sheet.
+
+    Each chunk is cleaned and summed on its own and the partial sums are
+    spilled to disk; summing them again gives the same totals as the
+    in-memory path, so ``aggregate_agency`` runs on the result unchanged.
+    With ``months`` only the row ranges of those months are cleaned.
+    """
+    counts = {}
+    filled = _FilledColumns()
+    with SpillStore() as spill:
+        state, month_state = {}, {}
+        normalize = agency.normalize_columns if schema is None else schema.normalize
+        usecols = None if schema is None else schema.read_columns
+        for df in iter_sheet_chunks(path, sheet, agency.is_header_label, normalize, chunk_rows, usecols):
+            filled.update(df)
+            df = select_months(df, 'agency', agency.month_rows, months, month_state, agency.is_market_label)
+            chunk_counts = {}
+            spill.add(partial_sums(agency.clean_agency(df, numeric_cols, counts=chunk_counts, state=state)))
+            _add_counts(counts, chunk_counts)
+            log(f"   … {os.path.basename(path)}[{sheet}]: {counts['loaded']:,} satır")
+        df_clean = partial_sums(spill.combine())
+
+    # Same columns and order as clean_agency: agency, measures, month, market, agency_group
+    empty = filled.empty(df_clean.columns)
+    measures = [c for c in df_clean.columns if c not in SUM_KEYS and c not in empty]
+    return df_clean[['agency'] + measures + ['month', 'market', 'agency_group']], counts
+
+
+# ------------------------------
+# UYRUK
+# ------------------------------
+def stream_uyruk(path, sheet, ref, chunk_rows=None, log=print, schema=None, months=None):
+    """(agency rows, counts) of one sheet, parsed chunk by chunk and spilled to disk;
+    ``months`` works as in ``stream_agency``."""
+    counts = {}
+    filled = _FilledColumns()
+    with SpillStore() as spill:
+        state, month_state = {}, {}
+        normalize = uyruk.normalize_columns if schema is None else schema.normalize
+        usecols = None if schema is None else schema.read_columns
+        for df in iter_sheet_chunks(path, sheet, uyruk.is_header_label, normalize, chunk_rows, usecols):
+            filled.update(df)
+            df = select_months(df, 'agencygroup', uyruk.month_rows, months, month_state, ref.opens)
+            chunk_counts = {}
+            spill.add(uyruk.parse_uyruk(df.reset_index(drop=True), ref, counts=chunk_counts, state=state))
+            _add_counts(counts, chunk_counts)
+            log(f"   … {os.path.basename(path)}[{sheet}]: {counts['loaded']:,} satır")
+        df_clean = spill.combine()
+
+    return df_clean.drop(columns=filled.empty(df_clean.columns)), counts
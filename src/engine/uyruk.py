@@ -0,0 +1,293 @@
+import difflib
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from engine.frames import enable_copy_on_write, to_numeric_column
+from engine.months import month_filter, select_months
+from engine.readers import read_sheet
+
+enable_copy_on_write()
+
+
+REPORT_YEAR = 2026
+
+MONTH_PATTERN = r'^\d{2}-'
+
+DIMENSION_COLS = ['raw', 'agencygroup', 'Month', 'Country', 'Agency', 'Region']
+
+
+# ------------------------------
+# 0. REGION–COUNTRY REFERENCE
+# ------------------------------
+class RegionReference:
+    def __init__(self, pairs):
+        pairs = pairs.copy()
+        pairs.columns = pairs.columns.astype(str).str.strip().str.title()
+        pairs['Country_norm'] = pairs['Country'].astype(str).str.upper().str.strip()
+        pairs['Country_title'] = pairs['Country'].astype(str).str.title().str.strip()
+        pairs['Region_title'] = pairs['Region'].astype(str).str.title().str.strip()
+
+        self.country_to_region = dict(zip(pairs['Country_norm'], pairs['Region_title']))
+        # First spelling wins, as the old pairs.loc[...].iloc[0] lookup did
+        first = pairs.drop_duplicates('Country_norm')
+        self.country_title = dict(zip(first['Country_norm'], first['Country_title']))
+        self.regions = set(pairs['Region_title'].unique())
+        self.countries = list(self.country_to_region.keys())
+        # classify_label results; long-running processes reuse them across files
+        self.label_kinds = {}
+        # Content hash of the table (result cache key)
+        hashes = pd.util.hash_pandas_object(pairs[['Country', 'Region']], index=False)
+        self.fingerprint = hashlib.sha256(hashes.to_numpy().tobytes()).hexdigest()[:16]
+
+    def classify(self, label):
+        key = str(label)
+        if key not in self.label_kinds:
+            self.label_kinds[key] = classify_label(key, self)
+        return self.label_kinds[key]
+
+    def opens(self, label):
+        """``opens_hierarchy`` of this reference."""
+        return opens_hierarchy(label, self)
+
+
+# ParseCache kind of the reference table
+REFERENCE = "reference"
+
+
+def load_reference(path, backend=None):
+    return RegionReference(read_sheet(path, backend=backend))
+
+
+def region_reference(pairs, parse_cache=None):
+    """RegionReference of a path (through ``parse_cache`` when given) or an already loaded one."""
+    if isinstance(pairs, RegionReference):
+        return pairs
+    if parse_cache is None:
+        return load_reference(pairs)
+    return parse_cache.get(REFERENCE, pairs, load_reference)
+
+
+class ReferenceCache:
+    """Region/country table, reloaded only when the file on disk changes.
+
+    ``on_load(ref)`` is called after every (re)load.
+    """
+
+    def __init__(self, path, on_load=None):
+        self.path = path
+        self.on_load = on_load
+        self.mtime = None
+        self.ref = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            mtime = os.path.getmtime(self.path)
+            if self.ref is None or mtime != self.mtime:
+                self.ref = load_reference(self.path)
+                self.mtime = mtime
+                if self.on_load is not None:
+                    self.on_load(self.ref)
+            return self.ref
+
+
+# ------------------------------
+# 1. READ
+# ------------------------------
+def is_header_label(value):
+    return value is not None and "AgencyGroup" in str(value)
+
+
+def normalize_columns(columns):
+    return (
+        columns.astype(str)
+        .str.strip()
+        .str.replace(r"\s+", "_", regex=True)
+        .str.lower()
+    )
+
+
+def month_rows(labels):
+    """Mask of the NN-MONTH header rows ("03-Mart") of the ``agencygroup`` column."""
+    return labels.astype(str).str.strip().str.match(MONTH_PATTERN, na=False).to_numpy()
+
+
+def read_uyruk(path, sheet=0, backend=None, schema=None, months=None, ref=None):
+    """``schema`` (a ParsePlan) supplies the header row, the column names and the columns to read.
+
+    ``months`` works as in ``read_agency``; its opening rows (countries,
+    regions) need the RegionReference ``ref``.
+    """
+    rows = None
+    if schema is None:
+        df = read_sheet(path, sheet, is_header=is_header_label, backend=backend)
+    else:
+        if months:
+            rows = month_filter(months, month_rows, ref.opens)
+        df = read_sheet(path, sheet, backend=backend, header_row=schema.header_row,
+                        usecols=schema.usecols if rows else schema.read_columns, rows=rows)
+
+    df = df.dropna(how='all')
+    if rows is None:
+        # A row-bounded read has already dropped the columns empty in the whole sheet
+        df = df.dropna(axis=1, how='all')
+    df = df.reset_index(drop=True)
+    df.columns = normalize_columns(df.columns) if schema is None else schema.normalize(df.columns)
+    if months and rows is None:
+        df = select_months(df, 'agencygroup', month_rows, months, opens=ref.opens)
+    return df
+
+
+# ------------------------------
+# 2-4. MONTH / COUNTRY / AGENCY
+# ------------------------------
+# Label kinds of the body rows (month rows are split off before)
+SKIP, COUNTRY, REGION, AGENCY = range(4)
+
+SERVICE_WORDS = ['TOTAL', 'USER', 'UTOPIA']
+
+
+def classify_label(label, ref):
+    """(kind, country, region, agency) of one ``agencygroup`` label.
+
+    Rules in order: exact country, region, TOTAL/USER/UTOPIA, fuzzy country
+    (difflib, cutoff 0.8), otherwise an agency name.
+    """
+    raw_val = str(label).strip()
+    upper = raw_val.upper()
+
+    if not raw_val:
+        return SKIP, None, None, None
+    if upper in ref.country_to_region:
+        return COUNTRY, ref.country_title[upper], ref.country_to_region[upper], None
+    if raw_val.title() in ref.regions:
+        # A region header also closes the open country
+        return REGION, None, raw_val.title(), None
+    if any(x in upper for x in SERVICE_WORDS):
+        return SKIP, None, None, None
+
+    cand = difflib.get_close_matches(upper, ref.countries, n=1, cutoff=0.8)
+    if cand:
+        return COUNTRY, ref.country_title[cand[0]], ref.country_to_region[cand[0]], None
+    return AGENCY, None, None, raw_val
+
+
+def opens_hierarchy(label, ref):
+    """True for a country or region row: the agencies below it do not depend on the rows above."""
+    return ref.classify(str(label).strip())[0] in (COUNTRY, REGION)
+
+
+def _assign_hierarchy(labels, ref, state=None):
+    """Country / region / agency arrays for the body rows.
+
+    Each distinct label is classified once; every row then takes the country
+    and region of the last country or region row above it (or the open ones
+    carried in ``state``), which is a forward fill over row positions.
+    """
+    state = {} if state is None else state
+    n = len(labels)
+
+    codes, uniques = pd.factorize(np.asarray(labels, dtype=object), use_na_sentinel=False)
+    classified = [ref.classify(label) for label in uniques]
+    kind_u = np.array([c[0] for c in classified], dtype=np.int8)
+    country_u = np.array([c[1] for c in classified] + [state.get('country')], dtype=object)
+    region_u = np.array([c[2] for c in classified] + [state.get('region')], dtype=object)
+    agency_u = np.array([c[3] for c in classified], dtype=object)
+
+    kind = kind_u[codes]
+    is_event = (kind == COUNTRY) | (kind == REGION)
+
+    # Position of the last country/region row at or above each row; the extra
+    # "unique" at index len(uniques) stands for the state before the chunk
+    last = np.maximum.accumulate(np.where(is_event, np.arange(n), -1))
+    open_code = np.where(last >= 0, codes[np.maximum(last, 0)], len(uniques))
+
+    cur_country = country_u[open_code]
+    cur_region = region_u[open_code]
+    truthy = np.frompyfunc(bool, 1, 1)
+    has_open = truthy(country_u).astype(bool) & truthy(region_u).astype(bool)
+    is_agency = (kind == AGENCY) & has_open[open_code]
+
+    countries = np.where(is_agency, cur_country, None)
+    regions = np.where(is_agency, cur_region, None)
+    agencies = np.where(is_agency, agency_u[codes], None)
+
+    if n:
+        state['country'] = cur_country[-1]
+        state['region'] = cur_region[-1]
+    return countries, regions, agencies
+
+
+def parse_uyruk(df, ref, counts=None, state=None):
+    """Label rows with Month / Country / Region / Agency and keep agency rows only.
+
+    Works on masks over the input frame; the single copy made is the final
+    row selection. ``counts`` (optional dict) receives the row counts per step;
+    ``state`` (a dict) carries the open month / country / region between
+    chunks of one sheet.
+    """
+    raw = df['agencygroup'].astype(str).str.strip()
+
+    month_mask = raw.str.match(MONTH_PATTERN, na=False).to_numpy()
+    # Text after the first '-' (extract keeps a string dtype even when no row has one)
+    month = raw.str.extract(r'(?s)^[^-]*-(.*)', expand=False).str.strip().str.title().where(month_mask).ffill()
+    if state is not None:
+        if pd.notna(state.get('month')):
+            month = month.fillna(state['month'])
+        if len(month):
+            state['month'] = month.iloc[-1]
+
+    body = ~month_mask
+    countries, regions, agencies = _assign_hierarchy(raw[body].tolist(), ref, state)
+
+    country = np.full(len(df), None, dtype=object)
+    region = np.full(len(df), None, dtype=object)
+    agency = np.full(len(df), None, dtype=object)
+    country[body] = countries
+    region[body] = regions
+    agency[body] = agencies
+
+    agency_upper = pd.Series(agency, dtype=object).str.upper()
+    keep = (
+        pd.notna(agency) & pd.notna(country) & pd.notna(region)
+        & ~agency_upper.str.contains(r'TOTAL|USER|GRAND', na=False).to_numpy()
+    )
+
+    if counts is not None:
+        counts['loaded'] = len(df)
+        counts['after_month_headers'] = int(body.sum())
+        counts['after_hierarchy'] = int(pd.notna(agency).sum())
+        counts['after_service_rows'] = int(keep.sum())
+
+    df_clean = df.loc[keep].reset_index(drop=True)
+    df_clean['raw'] = raw[keep].to_numpy()
+    df_clean['Month'] = month[keep].to_numpy()
+    df_clean['Country'] = country[keep]
+    df_clean['Agency'] = agency[keep]
+    df_clean['Region'] = region[keep]
+    return df_clean
+
+
+# ------------------------------
+# 5. FINAL REPORT
+# ------------------------------
+def measure_columns(df_clean):
+    return [c for c in df_clean.columns if c not in DIMENSION_COLS]
+
+
+def parse_measures(df_clean):
+    # "1.234,56" style numbers of the nationality export
+    for col in measure_columns(df_clean):
+        df_clean[col] = to_numeric_column(df_clean[col], decimal_comma=True).fillna(0)
+    return df_clean
+
+
+def build_uyruk_report(df_clean, year=REPORT_YEAR):
+    df = df_clean.assign(YIL=year)
+    num_cols = measure_columns(df)
+    final_cols = ['YIL', 'Month', 'Region', 'Country', 'Agency'] + num_cols
+    return df[final_cols].sort_values(['Month', 'Country', 'Agency']).reset_index(drop=True)
@@ -1,15 +1,27 @@
 import sys
 import os
-from PySide6.QtCore import QThread, Qt, QPropertyAnimation, QEasingCurve, QTimer, QSize
+import multiprocessing
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, QSize
 from PySide6.QtWidgets import (
     QApplication, QWidget, QHBoxLayout, QVBoxLayout, QPushButton,
     QLabel, QFileDialog, QTextEdit, QMessageBox, QStackedWidget,
-    QGraphicsOpacityEffect, QFrame, QScrollArea, QProgressBar
+    QGraphicsOpacityEffect, QFrame, QScrollArea, QProgressBar, QCheckBox, QLineEdit
 )
 from PySide6.QtGui import QFont, QPalette, QColor, QIcon
 
 from ui.pages.agency.page import Worker as WorkerAgency
 from ui.pages.uyurk.page import Worker as WorkerUyruk
+from ui.widgets.preview import PreviewCard
+from ui.widgets.kpi import KpiCard
+from ui.widgets.drilldown import DrillDownCard
+from ui.widgets.jobs import JobsPanel
+from ui.widgets.history import HistoryPanel
+from ui.scheduler import JobScheduler
+from engine.inputs import AGENCY, UYRUK, describe_inputs
+from engine.months import parse_months
+from engine.planner import MAP_REDUCE
+from engine.snapshots import SNAPSHOT_DIR
+from engine.uyruk import REFERENCE
 
 
 # -----------------------------------
@@ -181,8 +193,11 @@ class FileCard(QWidget):
 
     def set_file(self, path):
         self.file_path = path
-        filename = path.split('/')[-1]
-        self.path_label.setText(f"✓ {filename}")
+        if isinstance(path, str):
+            self.path_label.setText(f"✓ {path.split('/')[-1]}")
+        else:
+            names = ", ".join(p.split('/')[-1] for p in path)
+            self.path_label.setText(f"✓ {len(path)} dosya: {names}")
         self.path_label.setStyleSheet("""
             font-size: 14px;
             color: #34C759;
@@ -191,6 +206,62 @@ class FileCard(QWidget):
         """)
 
 
+# -----------------------------------
+# OPTION CHECKBOX
+# -----------------------------------
+class OptionCheckBox(QCheckBox):
+    def __init__(self, text):
+        super().__init__(text)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet("""
+            QCheckBox {
+                font-size: 14px;
+                color: #000000;
+                padding: 4px 24px;
+                background: transparent;
+            }
+            QCheckBox::indicator {
+                width: 18px;
+                height: 18px;
+            }
+        """)
+
+
+# -----------------------------------
+# MONTH FILTER FIELD
+# -----------------------------------
+class MonthFilterField(QWidget):
+    def __init__(self):
+        super().__init__()
+        layout = QHBoxLayout()
+        layout.setContentsMargins(24, 4, 24, 4)
+        layout.setSpacing(12)
+
+        label = QLabel("📅 Ay filtresi")
+        label.setStyleSheet("font-size: 14px; color: #000000;")
+
+        self.edit = QLineEdit()
+        self.edit.setPlaceholderText("Tüm aylar (ör. 3-5, Mart, Ağustos)")
+        self.edit.setStyleSheet("""
+            QLineEdit {
+                background-color: #F2F2F7;
+                border: none;
+                border-radius: 8px;
+                padding: 8px 12px;
+                font-size: 14px;
+                color: #000000;
+            }
+        """)
+
+        layout.addWidget(label)
+        layout.addWidget(self.edit, 1)
+        self.setLayout(layout)
+
+    def months(self):
+        """Selected month numbers, None for all; ValueError for text that is not a month."""
+        return parse_months(self.edit.text().strip() or None)
+
+
 # -----------------------------------
 # PROGRESS CARD
 # -----------------------------------
@@ -260,15 +331,104 @@ class ProgressCard(QWidget):
 
 
 # -----------------------------------
-# PAGE: Agency Report
+# REPORT PAGE BASE
 # -----------------------------------
-class AgencyPage(QWidget):
+class ReportPage(QWidget):
+    """What the Agency and Uyruk pages share: job bookkeeping and the output options.
+
+    A page builds the widgets these methods use (``progress_card``,
+    ``log_box``, the option check boxes, ...) in its own ``__init__``.
+    """
+
+    # Shown in the message box when a report has been written
+    success_text = ""
+
     def __init__(self, parent):
         super().__init__()
         self.parent_window = parent
+        self.active_jobs = 0
+
+    def connect_worker(self, worker, name):
+        self.active_jobs += 1
+        self.progress_card.set_status(f"İşlem devam ediyor... ({self.active_jobs} iş)", True)
+
+        worker.finished.connect(self.on_finish)
+        worker.error.connect(lambda err: self.on_error(f"[{name}] {err}"))
+        worker.log.connect(lambda message: self.log_box.append(f"[{name}] {message}"))
+        worker.result.connect(self.preview_card.set_results)
+        worker.kpis.connect(self.kpi_card.set_kpis)
+        worker.hierarchy.connect(self.drilldown_card.set_hierarchy)
+
+    def job_done(self):
+        self.active_jobs -= 1
+        if self.active_jobs:
+            self.progress_card.set_status(f"İşlem devam ediyor... ({self.active_jobs} iş)", True)
+            return False
+        return True
+
+    def columnar_formats(self):
+        formats = []
+        if self.parquet_check.isChecked():
+            formats.append("parquet")
+        if self.arrow_check.isChecked():
+            formats.append("arrow")
+        return tuple(formats)
+
+    def sqlite_path(self):
+        if not self.sqlite_check.isChecked():
+            return None
+        return os.path.splitext(self.output_path)[0] + ".sqlite"
+
+    def strategy(self):
+        # None keeps the memory-based plan
+        return MAP_REDUCE if self.map_reduce_check.isChecked() else None
+
+    def on_finish(self, outfile):
+        if not outfile:
+            # KPI preview only: nothing to download
+            self.log_box.append("\n📊 KPI önizleme hazır (Excel oluşturulmadı)")
+            if self.job_done():
+                self.progress_card.set_status("KPI önizleme hazır ✓", False)
+            return
+
+        self.output_file = outfile
+        self.log_box.append("\n✅ İşlem başarıyla tamamlandı!")
+        self.log_box.append(f"📄 Rapor oluşturuldu: {outfile}")
+        self.btn_download.show()
+        if self.job_done():
+            self.progress_card.set_status("İşlem başarıyla tamamlandı ✓", False)
+
+        # Success message
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Başarılı")
+        msg.setText(self.success_text)
+        msg.setIcon(QMessageBox.Information)
+        msg.exec()
+
+    def on_error(self, err):
+        self.log_box.append(f"\n❌ Hata oluştu: {err}")
+        if self.job_done():
+            self.progress_card.set_status("Hata oluştu ✗", False)
+        QMessageBox.critical(self, "Hata", f"İşlem sırasında hata oluştu:\n{err}")
+
+    def download_report(self):
+        if self.output_file and os.path.exists(self.output_file):
+            os.startfile(self.output_file)  # Windows
+            self.log_box.append(f"📥 Rapor açılıyor: {self.output_file}")
+
+
+# -----------------------------------
+# PAGE: Agency Report
+# -----------------------------------
+class AgencyPage(ReportPage):
+    success_text = "Agency raporu başarıyla oluşturuldu!"
+
+    def __init__(self, parent):
+        super().__init__(parent)
         self.input_file = None
         self.output_file = None
         self.output_path = "agency_rapor.xlsx"
+        self.fx_table = None
 
         # Main scroll area
         scroll = QScrollArea()
@@ -321,7 +481,7 @@ class AgencyPage(QWidget):
         # File cards
         self.input_card = FileCard(
             "Giriş Dosyası",
-            "Agency verilerini içeren Excel dosyasını seçin",
+            "Agency verilerini içeren Excel dosyalarını seçin (birden fazla dosya/sayfa birleştirilir)",
             "Dosya Seç",
             "📊"
         )
@@ -336,9 +496,34 @@ class AgencyPage(QWidget):
         self.output_card.set_file(self.output_path)
         self.output_card.btn.clicked.connect(self.select_output)
 
+        self.fx_card = FileCard(
+            "Kur Tablosu (isteğe bağlı)",
+            "Tarih + 1 EUR karşılığı kurlar (ör. USD, TRY) içeren CSV/Excel; gelirler bu para birimlerinde de eklenir",
+            "Tablo Seç",
+            "💱"
+        )
+        self.fx_card.btn.clicked.connect(self.select_fx)
+
+        self.sqlite_check = OptionCheckBox("SQLite veritabanı da oluştur (BI için, .sqlite)")
+        self.parquet_check = OptionCheckBox("Parquet dosyaları da oluştur (.parquet)")
+        self.arrow_check = OptionCheckBox("Arrow IPC dosyaları da oluştur (.arrow)")
+        self.snapshot_check = OptionCheckBox("Günlük snapshot da kaydet (pickup raporu için)")
+        self.kpi_check = OptionCheckBox("Yalnızca KPI önizleme (Excel oluşturulmaz)")
+        self.map_reduce_check = OptionCheckBox("Ayları paralel işle (büyük dosyalar, çok çekirdek)")
+        self.month_filter = MonthFilterField()
+
         # Progress card
         self.progress_card = ProgressCard()
 
+        # Result preview card
+        self.preview_card = PreviewCard()
+
+        # KPI summary, shown as soon as the data is aggregated
+        self.kpi_card = KpiCard()
+
+        # Market / region drill-down over the result's precomputed hierarchy
+        self.drilldown_card = DrillDownCard()
+
         # Log box
         log_label = QLabel("İşlem Günlüğü")
         log_label.setStyleSheet("""
@@ -383,10 +568,21 @@ class AgencyPage(QWidget):
         layout.addWidget(subtitle)
         layout.addWidget(self.input_card)
         layout.addWidget(self.output_card)
+        layout.addWidget(self.fx_card)
+        layout.addWidget(self.sqlite_check)
+        layout.addWidget(self.parquet_check)
+        layout.addWidget(self.arrow_check)
+        layout.addWidget(self.snapshot_check)
+        layout.addWidget(self.kpi_check)
+        layout.addWidget(self.map_reduce_check)
+        layout.addWidget(self.month_filter)
         layout.addWidget(self.progress_card)
+        layout.addWidget(self.kpi_card)
         layout.addWidget(log_label)
         layout.addWidget(self.log_box)
         layout.addLayout(buttons_layout)
+        layout.addWidget(self.preview_card)
+        layout.addWidget(self.drilldown_card)
         layout.addStretch()
 
         content.setLayout(layout)
@@ -398,11 +594,14 @@ class AgencyPage(QWidget):
         self.setLayout(main_layout)
 
     def select_input(self):
-        file, _ = QFileDialog.getOpenFileName(self, "Agency Dosyası Seç", "", "Excel Dosyaları (*.xlsx)")
-        if file:
-            self.input_file = file
-            self.input_card.set_file(file)
-            self.log_box.append(f"✓ Giriş dosyası seçildi: {file.split('/')[-1]}")
+        files, _ = QFileDialog.getOpenFileNames(self, "Agency Dosyaları Seç", "", "Excel Dosyaları (*.xlsx)")
+        if files:
+            self.input_file = files
+            self.input_card.set_file(files)
+            self.log_box.append(f"✓ Giriş dosyası seçildi: {', '.join(f.split('/')[-1] for f in files)}")
+            # Parsed in the background while the remaining options are set
+            if self.parent_window.scheduler.prefetch(AGENCY, files):
+                self.log_box.append("⏳ Dosya arka planda okunuyor...")
 
     def select_output(self):
         file, _ = QFileDialog.getSaveFileName(self, "Raporu Kaydet", "agency_rapor.xlsx", "Excel Dosyaları (*.xlsx)")
@@ -411,62 +610,56 @@ class AgencyPage(QWidget):
             self.output_card.set_file(file)
             self.log_box.append(f"✓ Çıktı konumu belirlendi: {file.split('/')[-1]}")
 
+    def select_fx(self):
+        file, _ = QFileDialog.getOpenFileName(self, "Kur Tablosu Seç", "", "Kur Tabloları (*.csv *.xlsx)")
+        if file:
+            self.fx_table = file
+            self.fx_card.set_file(file)
+            self.log_box.append(f"✓ Kur tablosu seçildi: {file.split('/')[-1]}")
+
     def start(self):
         if not self.input_file:
             QMessageBox.warning(self, "Eksik Bilgi", "Lütfen giriş dosyasını seçiniz.")
             return
 
-        self.log_box.clear()
-        self.log_box.append("🚀 Agency raporu oluşturma işlemi başlatıldı...")
-        self.btn_start.setEnabled(False)
-        self.btn_download.hide()
-        self.progress_card.set_status("İşlem devam ediyor...", True)
-
-        self.thread = QThread()
-        self.worker = WorkerAgency(self.input_file, None, self.output_path)
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.on_finish)
-        self.worker.error.connect(self.on_error)
-        self.worker.log.connect(self.log_box.append)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.error.connect(self.thread.quit)
-        self.thread.start()
-
-    def on_finish(self, outfile):
-        self.output_file = outfile
-        self.log_box.append(f"\n✅ İşlem başarıyla tamamlandı!")
-        self.log_box.append(f"📄 Rapor oluşturuldu: {outfile}")
-        self.btn_start.setEnabled(True)
-        self.btn_download.show()
-        self.progress_card.set_status("İşlem başarıyla tamamlandı ✓", False)
+        try:
+            months = self.month_filter.months()
+        except ValueError as e:
+            QMessageBox.warning(self, "Geçersiz Ay", str(e))
+            return
 
-        # Success message
-        msg = QMessageBox(self)
-        msg.setWindowTitle("Başarılı")
-        msg.setText("Agency raporu başarıyla oluşturuldu!")
-        msg.setIcon(QMessageBox.Information)
-        msg.exec()
+        scheduler = self.parent_window.scheduler
+        preview_only = self.kpi_check.isChecked()
+        output_path = None if preview_only else self.output_path
+        if scheduler.output_in_use(output_path):
+            QMessageBox.warning(self, "Çıktı Kullanımda",
+                                "Bu çıktı dosyasına yazan bir iş zaten kuyrukta. Lütfen başka bir konum seçiniz.")
+            return
 
-    def on_error(self, err):
-        self.log_box.append(f"\n❌ Hata oluştu: {err}")
-        self.btn_start.setEnabled(True)
-        self.progress_card.set_status("Hata oluştu ✗", False)
-        QMessageBox.critical(self, "Hata", f"İşlem sırasında hata oluştu:\n{err}")
+        name = describe_inputs(self.input_file)
+        self.log_box.append(f"🚀 [{name}] Agency raporu kuyruğa eklendi...")
 
-    def download_report(self):
-        if self.output_file and os.path.exists(self.output_file):
-            os.startfile(self.output_file)  # Windows
-            self.log_box.append(f"📥 Rapor açılıyor: {self.output_file}")
+        worker = WorkerAgency(self.input_file, None, output_path, None if preview_only else self.sqlite_path(),
+                              parse_cache=scheduler.parse_cache,
+                              columnar=() if preview_only else self.columnar_formats(),
+                              isolated=scheduler.isolated,
+                              snapshot_dir=SNAPSHOT_DIR if self.snapshot_check.isChecked() else None,
+                              result_cache=scheduler.result_cache,
+                              fx_table=self.fx_table,
+                              months=months,
+                              strategy=self.strategy())
+        self.connect_worker(worker, name)
+        scheduler.submit("Agency", worker)
 
 
 # -----------------------------------
 # PAGE: Uyruk Report
 # -----------------------------------
-class UyrukPage(QWidget):
+class UyrukPage(ReportPage):
+    success_text = "Uyruk performans raporu başarıyla oluşturuldu!"
+
     def __init__(self, parent):
-        super().__init__()
-        self.parent_window = parent
+        super().__init__(parent)
         self.input_file = None
         self.pairs_file = None
         self.output_file = None
@@ -523,7 +716,7 @@ class UyrukPage(QWidget):
         # File cards
         self.input_card = FileCard(
             "Uyruk Verileri",
-            "Uyruk bilgilerini içeren Excel dosyasını seçin",
+            "Uyruk bilgilerini içeren Excel dosyalarını seçin (birden fazla dosya/sayfa birleştirilir)",
             "Dosya Seç",
             "🌍"
         )
@@ -546,9 +739,25 @@ class UyrukPage(QWidget):
         self.output_card.set_file(self.output_path)
         self.output_card.btn.clicked.connect(self.select_output)
 
+        self.sqlite_check = OptionCheckBox("SQLite veritabanı da oluştur (BI için, .sqlite)")
+        self.parquet_check = OptionCheckBox("Parquet dosyaları da oluştur (.parquet)")
+        self.arrow_check = OptionCheckBox("Arrow IPC dosyaları da oluştur (.arrow)")
+        self.kpi_check = OptionCheckBox("Yalnızca KPI önizleme (Excel oluşturulmaz)")
+        self.map_reduce_check = OptionCheckBox("Ayları paralel işle (büyük dosyalar, çok çekirdek)")
+        self.month_filter = MonthFilterField()
+
         # Progress card
         self.progress_card = ProgressCard()
 
+        # Result preview card
+        self.preview_card = PreviewCard()
+
+        # KPI summary, shown as soon as the data is aggregated
+        self.kpi_card = KpiCard()
+
+        # Market / region drill-down over the result's precomputed hierarchy
+        self.drilldown_card = DrillDownCard()
+
         # Log box
         log_label = QLabel("İşlem Günlüğü")
         log_label.setStyleSheet("""
@@ -594,10 +803,19 @@ class UyrukPage(QWidget):
         layout.addWidget(self.input_card)
         layout.addWidget(self.pairs_card)
         layout.addWidget(self.output_card)
+        layout.addWidget(self.sqlite_check)
+        layout.addWidget(self.parquet_check)
+        layout.addWidget(self.arrow_check)
+        layout.addWidget(self.kpi_check)
+        layout.addWidget(self.map_reduce_check)
+        layout.addWidget(self.month_filter)
         layout.addWidget(self.progress_card)
+        layout.addWidget(self.kpi_card)
         layout.addWidget(log_label)
         layout.addWidget(self.log_box)
         layout.addLayout(buttons_layout)
+        layout.addWidget(self.preview_card)
+        layout.addWidget(self.drilldown_card)
         layout.addStretch()
 
         content.setLayout(layout)
@@ -609,11 +827,14 @@ class UyrukPage(QWidget):
         self.setLayout(main_layout)
 
     def select_input(self):
-        file, _ = QFileDialog.getOpenFileName(self, "Uyruk Dosyası Seç", "", "Excel Dosyaları (*.xlsx)")
-        if file:
-            self.input_file = file
-            self.input_card.set_file(file)
-            self.log_box.append(f"✓ Uyruk dosyası seçildi: {file.split('/')[-1]}")
+        files, _ = QFileDialog.getOpenFileNames(self, "Uyruk Dosyaları Seç", "", "Excel Dosyaları (*.xlsx)")
+        if files:
+            self.input_file = files
+            self.input_card.set_file(files)
+            self.log_box.append(f"✓ Uyruk dosyası seçildi: {', '.join(f.split('/')[-1] for f in files)}")
+            # Parsed in the background while the remaining files are chosen
+            if self.parent_window.scheduler.prefetch(UYRUK, files):
+                self.log_box.append("⏳ Dosya arka planda okunuyor...")
 
     def select_pairs(self):
         file, _ = QFileDialog.getOpenFileName(self, "Bölge/Ülke Tablosu Seç", "", "Excel Dosyaları (*.xlsx)")
@@ -621,6 +842,7 @@ class UyrukPage(QWidget):
             self.pairs_file = file
             self.pairs_card.set_file(file)
             self.log_box.append(f"✓ Eşleştirme tablosu seçildi: {file.split('/')[-1]}")
+            self.parent_window.scheduler.prefetch(REFERENCE, file)
 
     def select_output(self):
         file, _ = QFileDialog.getSaveFileName(self, "Raporu Kaydet", "uyruk_performans.xlsx",
@@ -635,48 +857,94 @@ class UyrukPage(QWidget):
             QMessageBox.warning(self, "Eksik Bilgi", "Lütfen tüm gerekli dosyaları seçiniz.")
             return
 
-        self.log_box.clear()
-        self.log_box.append("🚀 Uyruk performans raporu oluşturma işlemi başlatıldı...")
-        self.btn_start.setEnabled(False)
-        self.btn_download.hide()
-        self.progress_card.set_status("İşlem devam ediyor...", True)
-
-        self.thread = QThread()
-        self.worker = WorkerUyruk(self.input_file, self.pairs_file, self.output_path)
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.on_finish)
-        self.worker.error.connect(self.on_error)
-        self.worker.log.connect(self.log_box.append)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.error.connect(self.thread.quit)
-        self.thread.start()
+        try:
+            months = self.month_filter.months()
+        except ValueError as e:
+            QMessageBox.warning(self, "Geçersiz Ay", str(e))
+            return
 
-    def on_finish(self, outfile):
-        self.output_file = outfile
-        self.log_box.append(f"\n✅ İşlem başarıyla tamamlandı!")
-        self.log_box.append(f"📄 Rapor oluşturuldu: {outfile}")
-        self.btn_start.setEnabled(True)
-        self.btn_download.show()
-        self.progress_card.set_status("İşlem başarıyla tamamlandı ✓", False)
+        scheduler = self.parent_window.scheduler
+        preview_only = self.kpi_check.isChecked()
+        output_path = None if preview_only else self.output_path
+        if scheduler.output_in_use(output_path):
+            QMessageBox.warning(self, "Çıktı Kullanımda",
+                                "Bu çıktı dosyasına yazan bir iş zaten kuyrukta. Lütfen başka bir konum seçiniz.")
+            return
 
-        # Success message
-        msg = QMessageBox(self)
-        msg.setWindowTitle("Başarılı")
-        msg.setText("Uyruk performans raporu başarıyla oluşturuldu!")
-        msg.setIcon(QMessageBox.Information)
-        msg.exec()
+        name = describe_inputs(self.input_file)
+        self.log_box.append(f"🚀 [{name}] Uyruk performans raporu kuyruğa eklendi...")
 
-    def on_error(self, err):
-        self.log_box.append(f"\n❌ Hata oluştu: {err}")
-        self.btn_start.setEnabled(True)
-        self.progress_card.set_status("Hata oluştu ✗", False)
-        QMessageBox.critical(self, "Hata", f"İşlem sırasında hata oluştu:\n{err}")
+        worker = WorkerUyruk(self.input_file, self.pairs_file, output_path,
+                             None if preview_only else self.sqlite_path(),
+                             parse_cache=scheduler.parse_cache,
+                             columnar=() if preview_only else self.columnar_formats(),
+                             isolated=scheduler.isolated,
+                             result_cache=scheduler.result_cache,
+                             months=months,
+                             strategy=self.strategy())
+        self.connect_worker(worker, name)
+        scheduler.submit("Uyruk", worker)
 
-    def download_report(self):
-        if self.output_file and os.path.exists(self.output_file):
-            os.startfile(self.output_file)  # Windows
-            self.log_box.append(f"📥 Rapor açılıyor: {self.output_file}")
+
+# -----------------------------------
+# RUN HISTORY PAGE
+# -----------------------------------
+class HistoryPage(QWidget):
+    def __init__(self, parent):
+        super().__init__()
+        self.parent_window = parent
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(50, 40, 50, 40)
+        layout.setSpacing(24)
+
+        # Header
+        header_layout = QHBoxLayout()
+        back_btn = QPushButton("← Geri")
+        back_btn.clicked.connect(lambda: parent.show_page(0))
+        back_btn.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                border: none;
+                color: #007AFF;
+                font-size: 17px;
+                text-align: left;
+                padding: 8px 0px;
+            }
+            QPushButton:hover {
+                color: #0051D5;
+            }
+        """)
+        back_btn.setCursor(Qt.PointingHandCursor)
+        header_layout.addWidget(back_btn)
+        header_layout.addStretch()
+
+        title = QLabel("📈 Çalışma Geçmişi")
+        title.setStyleSheet("""
+            font-size: 36px;
+            font-weight: 700;
+            color: #000000;
+            margin-bottom: 8px;
+        """)
+
+        subtitle = QLabel("Her raporun süresi, tepe belleği ve satır sayıları (ayrıntılar için satırın üzerine gelin)")
+        subtitle.setStyleSheet("""
+            font-size: 17px;
+            color: #8E8E93;
+            margin-bottom: 20px;
+        """)
+
+        self.panel = HistoryPanel()
+
+        layout.addLayout(header_layout)
+        layout.addWidget(title)
+        layout.addWidget(subtitle)
+        layout.addWidget(self.panel)
+        self.setLayout(layout)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.panel.refresh()
 
 
 # -----------------------------------
@@ -740,6 +1008,21 @@ class SelectionPage(QWidget):
         cards_layout.addWidget(agency_card)
         cards_layout.addWidget(uyruk_card)
 
+        history_btn = QPushButton("📈 Çalışma Geçmişi")
+        history_btn.setCursor(Qt.PointingHandCursor)
+        history_btn.clicked.connect(lambda: parent.show_page(3))
+        history_btn.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                border: none;
+                color: #007AFF;
+                font-size: 15px;
+            }
+            QPushButton:hover {
+                color: #0051D5;
+            }
+        """)
+
         # Footer info
         footer = QLabel("Profesyonel veri analizi ve raporlama çözümü")
         footer.setAlignment(Qt.AlignCenter)
@@ -754,6 +1037,7 @@ class SelectionPage(QWidget):
         layout.addWidget(title)
         layout.addWidget(subtitle)
         layout.addLayout(cards_layout)
+        layout.addWidget(history_btn, alignment=Qt.AlignCenter)
         layout.addWidget(footer)
         layout.addStretch()
 
@@ -880,20 +1164,27 @@ class MainWindow(QWidget):
             }
         """)
 
+        # Job scheduler shared by all pages
+        self.scheduler = JobScheduler(parent=self)
+
         # Stacked Widget with pages
         self.stack = QStackedWidget()
         self.selection_page = SelectionPage(self)
         self.agency_page = AgencyPage(self)
         self.uyruk_page = UyrukPage(self)
+        self.history_page = HistoryPage(self)
 
         self.stack.addWidget(self.selection_page)
         self.stack.addWidget(self.agency_page)
         self.stack.addWidget(self.uyruk_page)
+        self.stack.addWidget(self.history_page)
 
         # Main layout
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.setSpacing(0)
         main_layout.addWidget(self.stack)
+        main_layout.addWidget(JobsPanel(self.scheduler))
         self.setLayout(main_layout)
 
         # Fade effect for transitions
@@ -926,6 +1217,12 @@ class MainWindow(QWidget):
 # RUN APPLICATION
 # -----------------------------------
 if __name__ == "__main__":
+    # Needed for report child processes in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
+
+    from engine.handoff import cleanup_handoff
+    cleanup_handoff()
+
     app = QApplication(sys.argv)
 
     # Set application font
@@ -0,0 +1,32 @@
+import argparse
+import os
+import warnings
+warnings.filterwarnings('ignore')
+
+from engine.properties import GROUP_DIR, load_properties, run_properties
+
+# Конфигурация
+PROPERTIES_PATH = "properties.json"  # {"Отель": {"agency": [...], "uyruk": [...]}, ...}
+OUTPUT_DIR = "output-data/group"
+UNIQUE_PAIRS_PATH = "./const/unique_region_country.xlsx"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Отчеты нескольких отелей параллельно + сводный отчет группы")
+    parser.add_argument("--config", default=PROPERTIES_PATH, help="JSON: отель → выгрузки agency / uyruk")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="папка: <отель>/*.xlsx и _group/*.xlsx")
+    parser.add_argument("--pairs", default=UNIQUE_PAIRS_PATH, help="таблица регион/страна")
+    parser.add_argument("--workers", type=int, help="число процессов (по умолчанию — по числу ядер)")
+    args = parser.parse_args()
+
+    properties = load_properties(args.config)
+    print(f"🏨 Отелей: {len(properties)}  ({', '.join(properties)})")
+    group = run_properties(properties, os.path.abspath(args.pairs), args.output_dir, args.workers, log=print)
+
+    if "agency" in group:
+        by_property = group["agency"]["By Property"].groupby("property")["eur_revenue"].sum()
+        print("\n💰 Выручка по отелям (EUR):")
+        for name, revenue in by_property.items():
+            print(f"  {name}: {revenue:,.2f}")
+        print(f"  Итого группа: {by_property.sum():,.2f}")
+    print(f"✅ Отчеты сохранены: {args.output_dir} (сводный — {os.path.join(args.output_dir, GROUP_DIR)})")
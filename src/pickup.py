@@ -0,0 +1,61 @@
+import argparse
+import os
+import warnings
+warnings.filterwarnings('ignore')
+
+from engine.agency import aggregate_agency
+from engine.inputs import load_agency
+from engine.reports import run_pickup_report
+from engine.snapshots import SNAPSHOT_DIR, SnapshotStore
+
+# Конфигурация
+OUTPUT_DIR = "output-data"
+
+
+def save_snapshot(store, files, day):
+    # Ретроспективный снимок из старой выгрузки (например, за прошлую неделю)
+    df_clean = load_agency(files)
+    manifest = store.save(aggregate_agency(df_clean)["Summary"], day=day, inputs=files)
+    print(f"📸 Снимок {manifest['day']}: {len(manifest['months'])} мес., "
+          f"{manifest['new_blocks']} новых блоков")
+
+
+def list_snapshots(store):
+    days = store.days()
+    if not days:
+        print(f"Снимков нет: {store.root}")
+    for day in days:
+        manifest = store.manifest(day)
+        names = ", ".join(os.path.basename(p) for p in manifest["inputs"])
+        print(f"{day}  {manifest['rows']:>7,} строк  {len(manifest['months']):>2} мес.  {names}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pickup: прирост бронирований между двумя снимками Agency")
+    parser.add_argument("--store", default=SNAPSHOT_DIR, help="папка хранилища снимков")
+    parser.add_argument("--date", help="снимок YYYY-MM-DD (по умолчанию последний)")
+    parser.add_argument("--compare", help="снимок для сравнения YYYY-MM-DD")
+    parser.add_argument("--days", type=int, default=1,
+                        help="без --compare: сравнить со снимком N дней назад (1 = вчера, 7 = неделя)")
+    parser.add_argument("--output", help="файл отчета .xlsx")
+    parser.add_argument("--save", nargs="+", metavar="XLSX",
+                        help="сохранить снимок из выгрузок Agency (дата — --date или сегодня) и выйти")
+    parser.add_argument("--list", action="store_true", help="показать сохраненные снимки")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    if args.save:
+        save_snapshot(store, args.save, args.date)
+    elif args.list:
+        list_snapshots(store)
+    else:
+        output = args.output
+        if output is None:
+            day = store.latest(args.date)
+            output = os.path.join(OUTPUT_DIR, f"pickup_{day}.xlsx")
+        day, compare, frames = run_pickup_report(output, args.date, args.compare, args.days, args.store, log=print)
+
+        totals = frames["By Month"]
+        print(f"Ночи (room): {totals['night_room_pickup'].sum():+,.0f}   "
+              f"EUR: {totals['eur_revenue_pickup'].sum():+,.2f}")
+        print(f"✅ Отчет сохранен: {output}")
@@ -0,0 +1,287 @@
+import argparse
+import email.parser
+import email.policy
+import hashlib
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import warnings
+import zipfile
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+warnings.filterwarnings('ignore')
+
+from openpyxl.utils.exceptions import InvalidFileException
+
+# Engine imports happen once, at server start (warm engine for every request)
+from engine.inputs import AGENCY, UYRUK, detect_report
+from engine.kpi import agency_kpis, uyruk_kpis
+from engine.parse_cache import ParseCache
+from engine.reports import run_agency_report, run_uyruk_report
+from engine.schema import SchemaError
+from engine.uyruk import ReferenceCache
+
+# Конфигурация
+HOST = "127.0.0.1"
+PORT = 8765
+UNIQUE_PAIRS_PATH = "./const/unique_region_country.xlsx"
+
+XLSX = "xlsx"
+PARQUET = "parquet"
+JSON = "json"
+FORMATS = (XLSX, PARQUET, JSON)
+
+CONTENT_TYPES = {
+    XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    PARQUET: "application/vnd.apache.parquet",
+    JSON: "application/json; charset=utf-8",
+}
+
+PARSE_CACHE_ENTRIES = 8
+MAX_UPLOAD = 512 * 2 ** 20
+MAX_STORED_UPLOADS = 16
+
+USAGE = {
+    "POST /agency | /uyruk | /report": "тело: xlsx (--data-binary), multipart поле 'file' или JSON {\"path\": ...}",
+    "?format=": "xlsx (по умолчанию) | parquet | json (KPI)",
+    "?sheet=": "лист для parquet (по умолчанию первый)",
+    "?path=": "путь к файлу на этом компьютере вместо загрузки",
+    "GET /health": "состояние и кэши",
+}
+
+
+def log(message):
+    print(f"[{datetime.now():%H:%M:%S}] {message}", flush=True)
+
+
+class RequestError(Exception):
+    """Client error, answered with 400."""
+
+
+# An upload that is not an xlsx workbook, or a damaged one
+BAD_WORKBOOK_ERRORS = (zipfile.BadZipFile, zlib.error, InvalidFileException)
+
+
+def _check_workbook(path):
+    with zipfile.ZipFile(path) as z:
+        if "xl/workbook.xml" not in z.namelist():
+            raise RequestError("xlsx çalışma kitabı değil: xl/workbook.xml yok")
+
+
+# ------------------------------
+# WARM STATE
+# ------------------------------
+class ReportService:
+    """Everything that survives between requests: the reference table, parsed
+    inputs and the stored uploads."""
+
+    def __init__(self, pairs_path, upload_dir=None):
+        self.references = ReferenceCache(
+            pairs_path, on_load=lambda ref: log(f"✔ Эталон загружен: {len(ref.countries)} стран"))
+        self.references.get()
+        self.parse_cache = ParseCache(max_entries=PARSE_CACHE_ENTRIES)
+        self.upload_dir = upload_dir or tempfile.mkdtemp(prefix="rapor-server-")
+        self.started = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def store_upload(self, data):
+        # Named by content: the same upload maps to the same file, so the parse cache hits
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.upload_dir, f"{digest[:32]}.xlsx")
+        if not os.path.exists(path):
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._prune_uploads()
+        return path
+
+    def _prune_uploads(self):
+        uploads = [os.path.join(self.upload_dir, n) for n in os.listdir(self.upload_dir) if n.endswith(".xlsx")]
+        uploads.sort(key=os.path.getmtime)
+        for path in uploads[:-MAX_STORED_UPLOADS]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def run(self, report, path, fmt, sheet=None):
+        """(body bytes, content type, filename) of one report request."""
+        with self._lock:
+            self.requests += 1
+        try:
+            _check_workbook(path)
+            return self._run(report, path, fmt, sheet)
+        except BAD_WORKBOOK_ERRORS as e:
+            raise RequestError(f"Geçerli bir xlsx dosyası değil: {e}") from e
+
+    def _run(self, report, path, fmt, sheet):
+        if report is None:
+            report = detect_report(path)
+            if report is None:
+                raise RequestError("Başlık satırı bulunamadı: ne Agency ne de AgencyGroup raporu")
+
+        with tempfile.TemporaryDirectory(prefix="rapor-request-", dir=self.upload_dir) as tmp:
+            output = os.path.join(tmp, f"{report}.xlsx") if fmt == XLSX else None
+            if report == AGENCY:
+                frames = run_agency_report(path, output, parse_cache=self.parse_cache, source="server")
+            else:
+                frames = run_uyruk_report(path, self.references.get(), output, parse_cache=self.parse_cache,
+                                          source="server")
+
+            stem = os.path.splitext(os.path.basename(path))[0]
+            if fmt == XLSX:
+                with open(output, "rb") as f:
+                    return f.read(), CONTENT_TYPES[XLSX], f"{report}.xlsx"
+
+        if fmt == JSON:
+            kpis = agency_kpis(frames) if report == AGENCY else uyruk_kpis(frames)
+            kpis["input"] = stem
+            return json.dumps(kpis, ensure_ascii=False).encode("utf-8"), CONTENT_TYPES[JSON], None
+
+        from engine.columnar import table_bytes
+        name = sheet or next(iter(frames))
+        if name not in frames:
+            raise RequestError(f"Sayfa yok: {name} (var olanlar: {', '.join(frames)})")
+        return table_bytes(frames[name], PARQUET), CONTENT_TYPES[PARQUET], f"{report}.{name}.parquet"
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "cached_inputs": len(self.parse_cache),
+        }
+
+    def close(self):
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+
+# ------------------------------
+# HTTP
+# ------------------------------
+def _multipart_file(content_type, body):
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True)
+    raise RequestError("multipart: 'file' alanı yok")
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None  # ReportService, set by serve()
+
+    def log_message(self, fmt, *args):
+        log(f"{self.address_string()} {fmt % args}")
+
+    def _send(self, status, body, content_type, filename=None, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if filename:
+            self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), CONTENT_TYPES[JSON])
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(200, self.service.health())
+        else:
+            self._send_json(200 if url.path == "/" else 404, USAGE)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        reports = {"/agency": AGENCY, "/uyruk": UYRUK, "/report": None}
+        if url.path not in reports:
+            self._send_json(404, USAGE)
+            return
+
+        t0 = time.perf_counter()
+        try:
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            path = self._input_path(params)
+            fmt = params.get("format", XLSX).lower()
+            if fmt not in FORMATS:
+                raise RequestError(f"format: {', '.join(FORMATS)}")
+
+            body, content_type, filename = self.service.run(reports[url.path], path, fmt, params.get("sheet"))
+            seconds = time.perf_counter() - t0
+            self._send(200, body, content_type, filename, {"X-Report-Seconds": f"{seconds:.3f}"})
+            log(f"✅ {url.path} {fmt} {os.path.basename(path)} ({seconds:.2f} s)")
+        except (RequestError, SchemaError) as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            log(f"❌ {url.path}: {e}\n{traceback.format_exc()}")
+            self._send_json(500, {"error": str(e)})
+
+    def _input_path(self, params):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_UPLOAD:
+            raise RequestError(f"Dosya çok büyük (> {MAX_UPLOAD // 2 ** 20} MB)")
+        body = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type", "")
+
+        if content_type.startswith("application/json"):
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                raise RequestError("JSON okunamadı")
+            params.update({k: str(v) for k, v in payload.items() if k != "path"})
+            path = payload.get("path")
+        elif content_type.startswith("multipart/form-data"):
+            return self.service.store_upload(_multipart_file(content_type, body))
+        elif body:
+            return self.service.store_upload(body)
+        else:
+            path = params.get("path")
+
+        if not path:
+            raise RequestError("Dosya yüklenmedi ve 'path' verilmedi")
+        if not os.path.isfile(path):
+            raise RequestError(f"Dosya bulunamadı: {path}")
+        return path
+
+
+def serve(host=HOST, port=PORT, pairs_path=UNIQUE_PAIRS_PATH):
+    service = ReportService(pairs_path)
+    Handler.service = service
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    if host not in ("127.0.0.1", "localhost", "::1"):
+        log(f"⚠️ Сервер доступен не только локально: {host}")
+    log(f"🌐 Сервер отчетов: http://{host}:{httpd.server_port}")
+    try:
+        httpd.serve_forever()
+    finally:
+        httpd.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальный HTTP-сервер отчетов (прогретый движок и кэши)")
+    parser.add_argument("--host", default=HOST, help="адрес (по умолчанию только этот компьютер)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--pairs", default=UNIQUE_PAIRS_PATH, help="таблица регион/страна")
+    args = parser.parse_args()
+
+    # kill / service stop: leave through serve()'s cleanup as well
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        serve(args.host, args.port, args.pairs)
+    except KeyboardInterrupt:
+        log("⏹ Остановлено")
@@ -0,0 +1,205 @@
+import itertools
+import os
+import threading
+import time
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from engine.inputs import as_list, preparse
+from engine.parse_cache import ParseCache
+from engine.result_cache import ResultCache
+from engine.uyruk import REFERENCE, load_reference
+
+
+QUEUED = "Sırada"
+RUNNING = "Çalışıyor"
+DONE = "Tamamlandı"
+FAILED = "Hata"
+
+
+def default_max_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+# -----------------------------------
+# JOB
+# -----------------------------------
+class Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, title, worker):
+        self.id = next(self._ids)
+        self.title = title
+        self.worker = worker
+        self.status = QUEUED
+        self.error = None
+        self.started = None
+        self.ended = None
+
+    @property
+    def input_file(self):
+        return self.worker.input_file
+
+    @property
+    def output_file(self):
+        return self.worker.output_file
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def duration(self):
+        if self.started is None:
+            return None
+        return (self.ended or time.monotonic()) - self.started
+
+
+class _JobRunnable(QRunnable):
+    def __init__(self, scheduler, job):
+        super().__init__()
+        self.scheduler = scheduler
+        self.job = job
+
+    def run(self):
+        self.scheduler._started.emit(self.job)
+        # Worker.run() reports through its own finished / error signals
+        self.job.worker.run()
+
+
+class _PrefetchRunnable(QRunnable):
+    def __init__(self, scheduler, kind, inputs, generation):
+        super().__init__()
+        self.scheduler = scheduler
+        self.kind = kind
+        self.inputs = inputs
+        self.generation = generation
+
+    def run(self):
+        self.scheduler._prefetch(self.kind, self.inputs, self.generation)
+
+
+# -----------------------------------
+# SCHEDULER (owned by MainWindow)
+# -----------------------------------
+class JobScheduler(QObject):
+    job_added = Signal(object)
+    job_changed = Signal(object)
+
+    _started = Signal(object)
+
+    def __init__(self, max_workers=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers or default_max_workers())
+        self.parse_cache = ParseCache()
+        # Results of earlier runs on disk: the same file and rules again is a copy, not a recompute
+        self.result_cache = ResultCache()
+        # Run each report in its own process; results come back as memory-mapped Arrow files
+        self.isolated = False
+        self.jobs = []
+        self._started.connect(self._on_started)
+
+        # Speculative parses of the selected files; one thread so they never hold up a job
+        self.prefetch_pool = QThreadPool(self)
+        self.prefetch_pool.setMaxThreadCount(1)
+        self._generations = {}
+        self._prefetched = {}
+        self._prefetch_lock = threading.Lock()
+
+    @property
+    def max_workers(self):
+        return self.pool.maxThreadCount()
+
+    def set_max_workers(self, count):
+        self.pool.setMaxThreadCount(max(1, int(count)))
+
+    def set_isolated(self, enabled):
+        self.isolated = bool(enabled)
+
+    def output_in_use(self, path):
+        # KPI-only jobs write no workbook
+        if not path:
+            return False
+        target = os.path.abspath(path)
+        return any(j.active and j.output_file and os.path.abspath(j.output_file) == target for j in self.jobs)
+
+    # -----------------------------------
+    # SPECULATIVE PRE-PARSE
+    # -----------------------------------
+    def prefetch(self, kind, inputs):
+        """Parse a just-selected input (agency / uyruk files, or the REFERENCE table) in the
+        background, so Start finds it in the parse cache.
+
+        A newer selection of the same kind supersedes it: the older parse
+        stops before its next sheet and its frames are dropped from the
+        cache. Returns False when nothing is started (isolated runs parse in
+        their own process and cannot use this cache).
+        """
+        with self._prefetch_lock:
+            generation = self._generations[kind] = self._generations.get(kind, 0) + 1
+            stale = self._prefetched.pop(kind, [])
+        self._discard(stale, keep=as_list(inputs))
+        if self.isolated:
+            return False
+        self.prefetch_pool.start(_PrefetchRunnable(self, kind, inputs, generation))
+        return True
+
+    def _current(self, kind, generation):
+        return self._generations.get(kind) == generation
+
+    def _prefetch(self, kind, inputs, generation):
+        try:
+            if kind == REFERENCE:
+                self.parse_cache.get(REFERENCE, inputs, load_reference)
+                keys = [(REFERENCE, inputs)]
+            else:
+                keys = preparse(inputs, kind, self.parse_cache,
+                                cancelled=lambda: not self._current(kind, generation))
+        except Exception:
+            # A file that cannot be read is reported by the run itself
+            return
+
+        with self._prefetch_lock:
+            current = self._current(kind, generation)
+            if current:
+                self._prefetched[kind] = keys
+        if not current:
+            self._discard(keys)
+
+    def _discard(self, keys, keep=()):
+        # Frames a queued or running job is reading stay in the cache
+        in_use = {os.path.abspath(p) for p in keep}
+        for job in self.jobs:
+            if job.active:
+                in_use.update(os.path.abspath(p) for p in as_list(job.input_file))
+                if getattr(job.worker, "pairs_file", None):
+                    in_use.add(os.path.abspath(job.worker.pairs_file))
+        for cache_kind, path in keys:
+            if os.path.abspath(path) not in in_use:
+                self.parse_cache.discard(cache_kind, path)
+
+    def submit(self, title, worker):
+        job = Job(title, worker)
+        worker.finished.connect(lambda _out, job=job: self._on_done(job, None))
+        worker.error.connect(lambda err, job=job: self._on_done(job, err))
+
+        self.jobs.append(job)
+        self.job_added.emit(job)
+        self.pool.start(_JobRunnable(self, job))
+        return job
+
+    def _on_started(self, job):
+        job.status = RUNNING
+        job.started = time.monotonic()
+        self.job_changed.emit(job)
+
+    def _on_done(self, job, err):
+        job.ended = time.monotonic()
+        if job.started is None:
+            job.started = job.ended
+        job.status = FAILED if err else DONE
+        job.error = err
+        self.job_changed.emit(job)
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,169 @@
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTreeView, QAbstractItemView
+
+from ui.widgets.kpi import TILES
+
+# Drill-down level names per report, top first (see engine.hierarchy.LEVELS)
+LEVEL_NAMES = {
+    "agency": ["Pazar", "Acente Grubu", "Acente", "Ay"],
+    "uyruk": ["Bölge", "Ülke", "Acente", "Ay"],
+}
+
+
+# -----------------------------------
+# TREE MODEL OVER A HIERARCHY INDEX
+# -----------------------------------
+class HierarchyModel(QAbstractItemModel):
+    """Read-only tree over a HierarchyIndex: every lookup is an index into its arrays.
+
+    A QModelIndex carries the node id as its internal id (offset by one,
+    0 is the invisible root), so parent / row / child never search.
+    """
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.tree = index
+        keys = set(index.totals())
+        self._tiles = [(key, label, decimals) for key, label, decimals in TILES if key in keys]
+        self._columns = [" › ".join(LEVEL_NAMES[index.report])] + [label for _, label, _ in self._tiles]
+
+    def _node(self, index):
+        return index.internalId() - 1 if index.isValid() else None
+
+    def index(self, row, column, parent=QModelIndex()):
+        children = self.tree.children(self._node(parent))
+        if not 0 <= row < len(children) or not 0 <= column < len(self._columns):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row] + 1)
+
+    def parent(self, index):
+        node = self._node(index)
+        parent = None if node is None else self.tree.parent(node)
+        if parent is None:
+            return QModelIndex()
+        return self.createIndex(self.tree.position(parent), 0, parent + 1)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self.tree.children(self._node(parent)))
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        col = index.column()
+        if role == Qt.TextAlignmentRole:
+            if col:
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+
+        if role != Qt.DisplayRole:
+            return None
+
+        node = self._node(index)
+        if col == 0:
+            return str(self.tree.name(node))
+        key, _, decimals = self._tiles[col - 1]
+        value = self.tree.totals(node).get(key)
+        return "" if value is None else f"{value:,.{decimals}f}"
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or orientation != Qt.Horizontal:
+            return None
+        return self._columns[section]
+
+
+# -----------------------------------
+# DRILL-DOWN CARD
+# -----------------------------------
+class DrillDownCard(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(24, 20, 24, 20)
+        layout.setSpacing(12)
+
+        title = QLabel("Detay Gezgini")
+        title.setStyleSheet("""
+            font-size: 17px;
+            color: #000000;
+            font-weight: 600;
+        """)
+
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("""
+            font-size: 13px;
+            color: #8E8E93;
+        """)
+
+        self.view = QTreeView()
+        self.view.setMinimumHeight(360)
+        # Same height for every row: the view never measures rows it does not show
+        self.view.setUniformRowHeights(True)
+        self.view.setAlternatingRowColors(True)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.setExpandsOnDoubleClick(False)
+        self.view.clicked.connect(self._toggle)
+        self.view.setStyleSheet("""
+            QTreeView {
+                background-color: white;
+                alternate-background-color: #F9F9F9;
+                border: 1px solid #E5E5EA;
+                border-radius: 8px;
+                font-size: 13px;
+            }
+            QHeaderView::section {
+                background-color: #4472C4;
+                color: white;
+                font-weight: 600;
+                padding: 6px;
+                border: none;
+            }
+        """)
+
+        layout.addWidget(title)
+        layout.addWidget(self.info_label)
+        layout.addWidget(self.view)
+
+        self.setLayout(layout)
+        self.setStyleSheet("""
+            DrillDownCard {
+                background-color: white;
+                border-radius: 16px;
+                border: 1px solid #E5E5EA;
+            }
+        """)
+        self.hide()
+
+    def clear(self):
+        model = self.view.model()
+        self.view.setModel(None)
+        if model is not None:
+            model.deleteLater()
+        self.info_label.setText("")
+        self.hide()
+
+    def set_hierarchy(self, index):
+        self.clear()
+        model = HierarchyModel(index, self.view)
+        self.view.setModel(model)
+        self.view.setColumnWidth(0, 320)
+        for col in range(1, model.columnCount()):
+            self.view.setColumnWidth(col, 130)
+
+        tops = len(index.children())
+        self.info_label.setText(f"{index.rows:,} satır · {tops} {LEVEL_NAMES[index.report][0].lower()} · "
+                                f"bir satıra tıklayınca alt kırılımı açılır")
+        self.show()
+
+    def _toggle(self, index):
+        # A click opens / closes the row; only its children are asked for
+        if index.column() != 0:
+            index = index.siblingAtColumn(0)
+        self.view.setExpanded(index, not self.view.isExpanded(index))
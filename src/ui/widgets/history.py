@@ -0,0 +1,199 @@
+import os
+
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+
+from engine.metrics import HISTORY_FILE, read_history
+from ui.widgets.jobs import format_duration
+
+REPORTS = [("Tümü", None), ("Agency", "agency"), ("Uyruk", "uyruk")]
+
+TIME_COLOR = "#007AFF"
+MEMORY_COLOR = "#FF9500"
+
+
+def _input_names(record):
+    names = [os.path.basename(i["path"]) for i in record.get("inputs", [])]
+    if len(names) > 1:
+        return f"{names[0]} +{len(names) - 1}"
+    return names[0] if names else ""
+
+
+def _stage_tooltip(record):
+    lines = []
+    for s in record.get("stages", []):
+        peak = f"  ·  {s['peak_mb']:.0f} MB" if s.get("peak_mb") else ""
+        lines.append(f"{s['name']}: {s['seconds']:.2f} sn{peak}")
+    rows = record.get("rows", {})
+    if rows:
+        lines.append("")
+        lines += [f"{key}: {value:,}" for key, value in rows.items()]
+    if record.get("error"):
+        lines += ["", record["error"]]
+    return "\n".join(lines)
+
+
+# -----------------------------------
+# TREND CHART (wall time and peak memory per run)
+# -----------------------------------
+class TrendChart(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.setMinimumHeight(160)
+
+    def set_records(self, records):
+        self.records = [r for r in records if r.get("status") == "ok"]
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect().adjusted(48, 12, -48, -24)
+        painter.fillRect(self.rect(), QColor("white"))
+
+        painter.setPen(QPen(QColor("#E5E5EA"), 1))
+        painter.drawRect(rect)
+
+        if len(self.records) < 2:
+            painter.setPen(QColor("#8E8E93"))
+            painter.drawText(rect, Qt.AlignCenter, "Eğilim için en az iki başarılı çalışma gerekli")
+            return
+
+        seconds = [r["seconds"] for r in self.records]
+        memory = [r.get("peak_mb") or 0 for r in self.records]
+        self._draw_series(painter, rect, seconds, TIME_COLOR)
+        if any(memory):
+            self._draw_series(painter, rect, memory, MEMORY_COLOR)
+
+        # Axis labels: max of each series on its own side
+        painter.setPen(QColor(TIME_COLOR))
+        painter.drawText(4, rect.top() + 10, f"{max(seconds):.1f} sn")
+        if any(memory):
+            painter.setPen(QColor(MEMORY_COLOR))
+            painter.drawText(rect.right() + 4, rect.top() + 10, f"{max(memory):.0f} MB")
+        painter.setPen(QColor("#8E8E93"))
+        painter.drawText(rect.left(), rect.bottom() + 16, self.records[0]["started_at"][:10])
+        last = self.records[-1]["started_at"][:10]
+        painter.drawText(rect.right() - painter.fontMetrics().horizontalAdvance(last), rect.bottom() + 16, last)
+
+    @staticmethod
+    def _draw_series(painter, rect, values, color):
+        top = max(values) or 1
+        step = rect.width() / (len(values) - 1)
+        points = QPolygonF([
+            QPointF(rect.left() + i * step, rect.bottom() - (v / top) * rect.height())
+            for i, v in enumerate(values)
+        ])
+        painter.setPen(QPen(QColor(color), 2))
+        painter.drawPolyline(points)
+
+
+# -----------------------------------
+# HISTORY PANEL
+# -----------------------------------
+class HistoryPanel(QWidget):
+    COLUMNS = ["Tarih", "Rapor", "Kaynak", "Dosya", "Satır", "Süre", "Bellek", "Durum"]
+    LIMIT = 200
+
+    def __init__(self, path=HISTORY_FILE):
+        super().__init__()
+        self.path = path
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(12)
+
+        header_layout = QHBoxLayout()
+        legend = QLabel(
+            f"<span style='color:{TIME_COLOR}'>■ Süre</span>&nbsp;&nbsp;"
+            f"<span style='color:{MEMORY_COLOR}'>■ Tepe bellek</span>"
+        )
+        legend.setStyleSheet("font-size: 13px; background: transparent;")
+
+        self.report_combo = QComboBox()
+        for label, report in REPORTS:
+            self.report_combo.addItem(label, report)
+        self.report_combo.currentIndexChanged.connect(self.refresh)
+
+        refresh_btn = QPushButton("Yenile")
+        refresh_btn.setCursor(Qt.PointingHandCursor)
+        refresh_btn.clicked.connect(self.refresh)
+        refresh_btn.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                border: none;
+                color: #007AFF;
+                font-size: 14px;
+            }
+        """)
+
+        header_layout.addWidget(legend)
+        header_layout.addStretch()
+        header_layout.addWidget(self.report_combo)
+        header_layout.addWidget(refresh_btn)
+
+        self.chart = TrendChart()
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                background-color: white;
+                border: 1px solid #E5E5EA;
+                border-radius: 8px;
+                font-size: 13px;
+            }
+            QHeaderView::section {
+                background-color: #F2F2F7;
+                color: #000000;
+                font-weight: 600;
+                padding: 4px;
+                border: none;
+            }
+        """)
+
+        self.path_label = QLabel(path)
+        self.path_label.setStyleSheet("font-size: 12px; color: #C7C7CC; background: transparent;")
+
+        layout.addLayout(header_layout)
+        layout.addWidget(self.chart)
+        layout.addWidget(self.table)
+        layout.addWidget(self.path_label)
+        self.setLayout(layout)
+
+    def refresh(self):
+        records = read_history(self.path, report=self.report_combo.currentData(), limit=self.LIMIT)
+        self.chart.set_records(records)
+
+        self.table.setRowCount(len(records))
+        # Newest run on top
+        for row, record in enumerate(reversed(records)):
+            rows = record.get("rows", {})
+            peak = record.get("peak_mb")
+            values = [
+                record["started_at"].replace("T", " "),
+                record["report"],
+                record.get("source", ""),
+                _input_names(record),
+                f"{rows['loaded']:,}" if "loaded" in rows else "",
+                format_duration(record.get("seconds")),
+                f"{peak:.0f} MB" if peak else "—",
+                "Tamamlandı" if record.get("status") == "ok" else "Hata",
+            ]
+            tooltip = _stage_tooltip(record)
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setToolTip(tooltip)
+                self.table.setItem(row, col, item)
+            if record.get("status") != "ok":
+                self.table.item(row, 7).setForeground(QColor("#FF3B30"))
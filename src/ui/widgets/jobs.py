@@ -0,0 +1,160 @@
+import os
+
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView, QCheckBox
+)
+
+from engine.inputs import as_list, describe_inputs
+from ui.scheduler import RUNNING, DONE, FAILED
+
+STATUS_COLORS = {
+    RUNNING: "#007AFF",
+    DONE: "#34C759",
+    FAILED: "#FF3B30",
+}
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "—"
+    if seconds < 60:
+        return f"{seconds:.1f} sn"
+    return f"{int(seconds // 60)} dk {int(seconds % 60)} sn"
+
+
+# -----------------------------------
+# JOBS PANEL (all pages share one scheduler)
+# -----------------------------------
+class JobsPanel(QWidget):
+    COLUMNS = ["#", "Rapor", "Dosya", "Durum", "Süre"]
+
+    def __init__(self, scheduler):
+        super().__init__()
+        self.scheduler = scheduler
+        self.rows = {}
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(24, 12, 24, 12)
+        layout.setSpacing(8)
+
+        header_layout = QHBoxLayout()
+        title = QLabel("İş Kuyruğu")
+        title.setStyleSheet("""
+            font-size: 15px;
+            color: #000000;
+            font-weight: 600;
+        """)
+
+        limit_label = QLabel("Paralel iş sayısı:")
+        limit_label.setStyleSheet("font-size: 13px; color: #8E8E93;")
+
+        self.limit_spin = QSpinBox()
+        self.limit_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.limit_spin.setValue(scheduler.max_workers)
+        self.limit_spin.valueChanged.connect(scheduler.set_max_workers)
+        self.limit_spin.setStyleSheet("""
+            QSpinBox {
+                background-color: white;
+                border: 1px solid #E5E5EA;
+                border-radius: 6px;
+                padding: 2px 6px;
+                font-size: 13px;
+            }
+        """)
+
+        self.isolated_check = QCheckBox("Ayrı süreçte çalıştır")
+        self.isolated_check.setToolTip("Her rapor ayrı bir süreçte çalışır; sonuçlar paylaşılan "
+                                       "Arrow dosyalarından kopyalanmadan açılır")
+        self.isolated_check.setChecked(scheduler.isolated)
+        self.isolated_check.toggled.connect(scheduler.set_isolated)
+        self.isolated_check.setStyleSheet("font-size: 13px; color: #000000; background: transparent;")
+
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+        header_layout.addWidget(self.isolated_check)
+        header_layout.addSpacing(16)
+        header_layout.addWidget(limit_label)
+        header_layout.addWidget(self.limit_spin)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setMaximumHeight(150)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                background-color: white;
+                border: 1px solid #E5E5EA;
+                border-radius: 8px;
+                font-size: 13px;
+            }
+            QHeaderView::section {
+                background-color: #F2F2F7;
+                color: #000000;
+                font-weight: 600;
+                padding: 4px;
+                border: none;
+            }
+        """)
+
+        layout.addLayout(header_layout)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+        self.setStyleSheet("""
+            JobsPanel {
+                background-color: white;
+                border-top: 1px solid #E5E5EA;
+            }
+        """)
+        self.hide()
+
+        # Running durations tick while jobs are active
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh_running)
+
+        scheduler.job_added.connect(self.add_job)
+        scheduler.job_changed.connect(self.update_job)
+
+    def add_job(self, job):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.rows[job.id] = row
+
+        values = [str(job.id), job.title, describe_inputs(job.input_file), "", ""]
+        for col, value in enumerate(values):
+            self.table.setItem(row, col, QTableWidgetItem(value))
+        self.table.item(row, 2).setToolTip("\n".join(as_list(job.input_file)))
+
+        self.update_job(job)
+        self.table.scrollToBottom()
+        self.show()
+        self.timer.start()
+
+    def update_job(self, job):
+        row = self.rows.get(job.id)
+        if row is None:
+            return
+
+        status = self.table.item(row, 3)
+        status.setText(job.status)
+        status.setForeground(QColor(STATUS_COLORS.get(job.status, "#8E8E93")))
+        if job.error:
+            status.setToolTip(job.error)
+
+        self.table.item(row, 4).setText(format_duration(job.duration()))
+
+    def refresh_running(self):
+        running = False
+        for job in self.scheduler.jobs:
+            if job.active:
+                running = True
+                self.update_job(job)
+        if not running:
+            self.timer.stop()
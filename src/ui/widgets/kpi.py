@@ -0,0 +1,122 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame
+
+# (kpi key, label, decimals)
+TILES = [
+    ("eur_revenue", "Gelir (EUR)", 2),
+    ("night_room", "Oda-Gece", 0),
+    ("arrival_room", "Varış (oda)", 0),
+    ("eur_per_room_night", "EUR / Oda-Gece", 2),
+]
+
+# Breakdown lists per report: (kpis key, title)
+LISTS = {
+    "agency": [("top_agency_groups", "En Çok Gelir: Acente Grupları"), ("by_market", "Pazar Dağılımı")],
+    "uyruk": [("top_countries", "En Çok Gelir: Ülkeler"), ("by_region", "Bölge Dağılımı")],
+}
+
+
+def _number(value, decimals):
+    return f"{value:,.{decimals}f}"
+
+
+# -----------------------------------
+# KPI CARD (headline numbers ahead of the workbook)
+# -----------------------------------
+class KpiCard(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(24, 20, 24, 20)
+        layout.setSpacing(12)
+
+        title = QLabel("KPI Özeti")
+        title.setStyleSheet("""
+            font-size: 17px;
+            color: #000000;
+            font-weight: 600;
+        """)
+
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("""
+            font-size: 13px;
+            color: #8E8E93;
+        """)
+
+        self.tiles_layout = QHBoxLayout()
+        self.tiles_layout.setSpacing(12)
+        self.lists_layout = QHBoxLayout()
+        self.lists_layout.setSpacing(24)
+
+        layout.addWidget(title)
+        layout.addWidget(self.info_label)
+        layout.addLayout(self.tiles_layout)
+        layout.addLayout(self.lists_layout)
+
+        self.setLayout(layout)
+        self.setStyleSheet("""
+            KpiCard {
+                background-color: white;
+                border-radius: 16px;
+                border: 1px solid #E5E5EA;
+            }
+        """)
+        self.hide()
+
+    @staticmethod
+    def _clear(box):
+        while box.count():
+            item = box.takeAt(0)
+            if item.widget() is not None:
+                item.widget().deleteLater()
+
+    def clear(self):
+        self._clear(self.tiles_layout)
+        self._clear(self.lists_layout)
+        self.info_label.setText("")
+        self.hide()
+
+    def _tile(self, label, value):
+        tile = QFrame()
+        tile.setStyleSheet("QFrame { background-color: #F2F2F7; border-radius: 10px; }")
+        box = QVBoxLayout()
+        box.setContentsMargins(14, 10, 14, 10)
+        value_label = QLabel(value)
+        value_label.setStyleSheet("font-size: 20px; font-weight: 700; color: #000000; background: transparent;")
+        name_label = QLabel(label)
+        name_label.setStyleSheet("font-size: 12px; color: #8E8E93; background: transparent;")
+        box.addWidget(value_label)
+        box.addWidget(name_label)
+        tile.setLayout(box)
+        return tile
+
+    def _list(self, title, rows):
+        total = sum(r.get("eur_revenue", 0) for r in rows) or 1
+        lines = [f"<b>{title}</b>"]
+        for i, row in enumerate(rows, 1):
+            revenue = row.get("eur_revenue", 0)
+            lines.append(f"{i}. {row['name']}: {_number(revenue, 2)} EUR "
+                         f"<span style='color:#8E8E93'>({revenue / total:.0%})</span>")
+        label = QLabel("<br>".join(lines))
+        label.setTextFormat(Qt.RichText)
+        label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        label.setStyleSheet("font-size: 13px; color: #000000;")
+        return label
+
+    def set_kpis(self, kpis):
+        self.clear()
+        totals = kpis.get("totals", {})
+        for key, label, decimals in TILES:
+            if key in totals:
+                self.tiles_layout.addWidget(self._tile(label, _number(totals[key], decimals)))
+        self.tiles_layout.addStretch()
+
+        for key, title in LISTS.get(kpis.get("report"), []):
+            rows = sorted(kpis.get(key, []), key=lambda r: r.get("eur_revenue", 0), reverse=True)
+            self.lists_layout.addWidget(self._list(title, rows))
+        self.lists_layout.addStretch()
+
+        months = len(kpis.get("by_month", []))
+        self.info_label.setText(f"{kpis.get('rows', 0):,} satır · {months} ay")
+        self.show()
@@ -0,0 +1,267 @@
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QTabWidget, QTableView, QHeaderView, QAbstractItemView
+)
+
+
+# -----------------------------------
+# COLUMN ACCESSORS (no per-cell materialisation)
+# -----------------------------------
+class _NumpyColumn:
+    def __init__(self, s):
+        self.values = s.to_numpy()
+
+    def __getitem__(self, row):
+        return self.values[row]
+
+    def ordering(self, ascending):
+        values = pd.Series(self.values, copy=False)
+        return values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+
+class _CategoricalColumn:
+    def __init__(self, s):
+        self.codes = s.cat.codes.to_numpy()
+        self.categories = s.cat.categories.to_numpy()
+
+    def __getitem__(self, row):
+        code = self.codes[row]
+        return None if code < 0 else self.categories[code]
+
+    def ordering(self, ascending):
+        n = len(self.categories)
+        rank = np.empty(n, dtype=np.int64)
+        rank[pd.Index(self.categories).astype(str).argsort()] = np.arange(n)
+        keys = rank[self.codes] if ascending else (n - 1) - rank[self.codes]
+        keys = np.where(self.codes < 0, n, keys)  # missing values last
+        return np.argsort(keys, kind="stable")
+
+
+class _ArrowColumn:
+    """Column backed by Arrow buffers (e.g. a memory-mapped result): cells are read on demand."""
+
+    def __init__(self, s):
+        import pyarrow as pa
+        array = s.array.__arrow_array__()
+        self.array = array if isinstance(array, pa.ChunkedArray) else pa.chunked_array([array])
+
+    def __getitem__(self, row):
+        return self.array[int(row)].as_py()
+
+    def ordering(self, ascending):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        array = self.array
+        if pa.types.is_dictionary(array.type):
+            array = array.cast(array.type.value_type)
+        return pc.array_sort_indices(
+            array,
+            order="ascending" if ascending else "descending",
+            null_placement="at_end"
+        ).to_numpy()
+
+
+def _column(s):
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _CategoricalColumn(s)
+    if isinstance(s.dtype, pd.ArrowDtype) or getattr(s.dtype, "storage", None) == "pyarrow":
+        return _ArrowColumn(s)
+    return _NumpyColumn(s)
+
+
+# -----------------------------------
+# TABLE MODEL OVER AN IN-MEMORY DATAFRAME
+# -----------------------------------
+class DataFrameModel(QAbstractTableModel):
+    """Read-only model: the view asks only for visible cells, nothing is copied into items."""
+
+    def __init__(self, df, parent=None):
+        super().__init__(parent)
+        self._columns = [str(c) for c in df.columns]
+        # Accessors read straight from the frame's buffers (numpy, categorical codes or Arrow)
+        self._values = [_column(df.iloc[:, i]) for i in range(df.shape[1])]
+        self._numeric = [pd.api.types.is_numeric_dtype(df.dtypes.iloc[i]) for i in range(df.shape[1])]
+        self._rows = len(df)
+        self._order = None
+        self._orderings = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        col = index.column()
+        if role == Qt.TextAlignmentRole:
+            if self._numeric[col]:
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+
+        if role != Qt.DisplayRole:
+            return None
+
+        row = index.row() if self._order is None else self._order[index.row()]
+        value = self._values[col][row]
+
+        if value is None or value is pd.NA or value is pd.NaT:
+            return ""
+        if isinstance(value, (float, np.floating)):
+            return "" if np.isnan(value) else f"{value:,.2f}"
+        return str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._columns[section]
+        return str(section + 1)
+
+    def ordering(self, column, order):
+        # Sorting permutations are computed once per (column, direction) and reused
+        key = (column, order)
+        if key not in self._orderings:
+            self._orderings[key] = self._values[column].ordering(order == Qt.AscendingOrder)
+        return self._orderings[key]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._order = None if column < 0 else self.ordering(column, order)
+        self.layoutChanged.emit()
+
+
+# -----------------------------------
+# PREVIEW CARD (one tab per output sheet)
+# -----------------------------------
+class PreviewCard(QWidget):
+    SAMPLE_ROWS = 200
+
+    def __init__(self):
+        super().__init__()
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(24, 20, 24, 20)
+        layout.setSpacing(12)
+
+        title = QLabel("Sonuç Önizleme")
+        title.setStyleSheet("""
+            font-size: 17px;
+            color: #000000;
+            font-weight: 600;
+        """)
+
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("""
+            font-size: 13px;
+            color: #8E8E93;
+        """)
+
+        self.tabs = QTabWidget()
+        self.tabs.setMinimumHeight(360)
+        self.tabs.setStyleSheet("""
+            QTabWidget::pane {
+                border: 1px solid #E5E5EA;
+                border-radius: 8px;
+                background-color: white;
+            }
+            QTabBar::tab {
+                background: #F2F2F7;
+                color: #000000;
+                padding: 8px 16px;
+                border-top-left-radius: 8px;
+                border-top-right-radius: 8px;
+                font-size: 13px;
+            }
+            QTabBar::tab:selected {
+                background: white;
+                font-weight: 600;
+            }
+        """)
+        self.tabs.currentChanged.connect(self._update_info)
+
+        layout.addWidget(title)
+        layout.addWidget(self.info_label)
+        layout.addWidget(self.tabs)
+
+        self.setLayout(layout)
+        self.setStyleSheet("""
+            PreviewCard {
+                background-color: white;
+                border-radius: 16px;
+                border: 1px solid #E5E5EA;
+            }
+        """)
+        self.hide()
+
+    def clear(self):
+        while self.tabs.count():
+            view = self.tabs.widget(0)
+            self.tabs.removeTab(0)
+            view.deleteLater()
+        self.info_label.setText("")
+        self.hide()
+
+    def set_results(self, frames):
+        self.clear()
+        for name, df in frames.items():
+            self.tabs.addTab(self._make_view(df), name)
+        self._update_info(self.tabs.currentIndex())
+        self.show()
+
+    def _make_view(self, df):
+        view = QTableView()
+        model = DataFrameModel(df, view)
+        view.setModel(model)
+        view.setAlternatingRowColors(True)
+        view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        view.setWordWrap(False)
+        view.setStyleSheet("""
+            QTableView {
+                background-color: white;
+                alternate-background-color: #F9F9F9;
+                gridline-color: #E5E5EA;
+                border: none;
+                font-size: 13px;
+            }
+            QHeaderView::section {
+                background-color: #4472C4;
+                color: white;
+                font-weight: 600;
+                padding: 6px;
+                border: none;
+            }
+        """)
+
+        # Fixed row height keeps scrolling O(visible rows) even for millions of rows
+        vheader = view.verticalHeader()
+        vheader.setSectionResizeMode(QHeaderView.Fixed)
+        vheader.setDefaultSectionSize(24)
+
+        hheader = view.horizontalHeader()
+        hheader.setSortIndicator(-1, Qt.AscendingOrder)
+        view.setSortingEnabled(True)
+
+        # Column widths from the header and a small sample instead of resizeColumnsToContents()
+        metrics = view.fontMetrics()
+        sample_rows = min(model.rowCount(), self.SAMPLE_ROWS)
+        for col in range(model.columnCount()):
+            texts = [model.headerData(col, Qt.Horizontal)]
+            texts += [model.data(model.index(r, col)) for r in range(sample_rows)]
+            width = max(metrics.horizontalAdvance(t) for t in texts) + 32
+            view.setColumnWidth(col, min(width, 320))
+
+        return view
+
+    def _update_info(self, index):
+        view = self.tabs.widget(index)
+        if view is None:
+            self.info_label.setText("")
+            return
+        model = view.model()
+        self.info_label.setText(f"{model.rowCount():,} satır · {model.columnCount()} sütun")
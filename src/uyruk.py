@@ -1,142 +1,53 @@
-import pandas as pd
 import warnings
-import difflib
 warnings.filterwarnings('ignore')
 
-FILE_PATH = "input-data/uyruk/uyruk.xlsx"
+from engine.inputs import UYRUK, load_uyruk
+from engine.kpi import uyruk_kpis
+from engine.metrics import RunMetrics
+from engine.months import parse_months
+from engine.uyruk import load_reference, parse_measures, measure_columns
+
+FILE_PATH = "input-data/uyruk/uyruk.xlsx"  # или список файлов; все листы AgencyGroup объединяются
 OUTPUT_PATH = "output-data/uyruk_perfomans.xlsx"
 UNIQUE_PAIRS_PATH = "./const/unique_region_country.xlsx"
+SQLITE_PATH = None  # например "output-data/uyruk_perfomans.sqlite"
+COLUMNAR_FORMATS = ()  # например ("parquet", "arrow")
+PREVIEW_ONLY = False  # True — только KPI-сводка, без Excel и остальных файлов
+MONTHS = None  # например "3-5" или ["Mart", "Nisan"]: разбираются только строки этих месяцев
 
 print("🚀 Парсинг: Month → Country → Agency → Region (region from unique_region_country.xlsx)")
+# Run metrics (row counts per step, time and memory per stage) go to the run history
+metrics = RunMetrics(UYRUK, FILE_PATH, source="script").start()
 
 # ------------------------------
 # 0. LOAD REGION–COUNTRY DATASET
 # ------------------------------
-pairs = pd.read_excel(UNIQUE_PAIRS_PATH)
-
-pairs.columns = pairs.columns.astype(str).str.strip().str.title()
-pairs['Country_norm'] = pairs['Country'].astype(str).str.upper().str.strip()
-pairs['Country_title'] = pairs['Country'].astype(str).str.title().str.strip()
-pairs['Region_title'] = pairs['Region'].astype(str).str.title().str.strip()
-
-country_to_region = dict(zip(pairs['Country_norm'], pairs['Region_title']))
-
-country_list_upper = list(country_to_region.keys())
-region_list_title = set(pairs['Region_title'].unique())
-
-print(f"✔ Эталон: {len(country_list_upper)} стран → {len(region_list_title)} регионов")
-
-# ------------------------------
-# 1. READ RAW EXCEL
-# ------------------------------
-raw = pd.read_excel(FILE_PATH, header=None)
-header_row = raw[raw.iloc[:, 0].astype(str).str.contains("AgencyGroup", na=False)].index[0]
-df = pd.read_excel(FILE_PATH, header=header_row)
-
-df = df.dropna(how='all').dropna(axis=1, how='all').reset_index(drop=True)
-
-df.columns = (
-    df.columns.astype(str)
-    .str.strip()
-    .str.replace(r'\s+', ' ', regex=True)
-    .str.replace(' ', '_')
-    .str.lower()
-)
-
-# ------------------------------
-# 2. MONTH DETECT
-# ------------------------------
-df['raw'] = df['agencygroup'].astype(str).str.strip()
-month_mask = df['raw'].str.match(r'^\d{2}-', na=False)
+with metrics.stage("reference"):
+    ref = load_reference(UNIQUE_PAIRS_PATH)
 
-df['Month'] = pd.NA
-cur_month = None
-
-for i in df.index:
-    if month_mask[i]:
-        cur_month = df.at[i, 'raw'].split('-', 1)[1].strip().title()
-    df.at[i, 'Month'] = cur_month
-
-df = df[~month_mask].reset_index(drop=True)
+print(f"✔ Эталон: {len(ref.countries)} стран → {len(ref.regions)} регионов")
 
 # ------------------------------
-# 3. PARSE COUNTRY / AGENCY
+# 1-4. READ, MONTH / COUNTRY / AGENCY / REGION, CLEAN VALID ONLY
 # ------------------------------
-df['Country'] = pd.NA
-df['Agency'] = pd.NA
-df['Region'] = pd.NA
-
-cur_country = None
-cur_region = None
-
-for i in df.index:
-    raw_val = str(df.at[i, 'raw']).strip()
-    upper = raw_val.upper()
-
-    if not raw_val:
-        continue
-
-    # 1) Exact country match
-    if upper in country_to_region:
-        cur_country = pairs.loc[pairs['Country_norm'] == upper, 'Country_title'].iloc[0]
-        cur_region  = country_to_region[upper]
-        continue
-
-    # 2) Region
-    if raw_val.title() in region_list_title:
-        cur_region = raw_val.title()
-        cur_country = None
-        continue
-
-    # 3) Skip TOTAL-like rows
-    if "TOTAL" in upper or "USER" in upper or "UTOPIA" in upper:
-        continue
-
-    # 4) Fuzzy country detection
-    cand = difflib.get_close_matches(upper, country_list_upper, n=1, cutoff=0.8)
-    if cand:
-        upper_match = cand[0]
-        cur_country = pairs.loc[pairs['Country_norm'] == upper_match, 'Country_title'].iloc[0]
-        cur_region  = country_to_region[upper_match]
-        continue
-
-    # 5) Agency
-    if cur_region:
-        df.at[i, 'Country'] = cur_country
-        df.at[i, 'Agency'] = raw_val
-        df.at[i, 'Region'] = cur_region
-
-# ------------------------------
-# 4. CLEAN VALID ONLY
-# ------------------------------
-df_clean = df.dropna(subset=['Agency']).copy()
-df_clean = df_clean.dropna(subset=['Country', 'Region'])
-
-df_clean = df_clean[
-    ~df_clean['Agency'].str.upper().str.contains(r'TOTAL|USER|GRAND', na=False)
-]
+# No __main__ guard in this script: sheets are parsed one after another
+counts = {}
+df_clean = load_uyruk(FILE_PATH, ref, counts=counts, max_workers=1, metrics=metrics, months=parse_months(MONTHS))
+metrics.rows(counts)
+print(f"✔ Строк: {counts['loaded']} → агентств {counts['after_service_rows']}")
 
 # ------------------------------
 # NUMERIC FIX
 # ------------------------------
-num_cols = [
-    c for c in df_clean.columns
-    if c not in ['raw', 'agencygroup', 'Month', 'Country', 'Agency', 'Region']
-]
-
-for col in num_cols:
-    df_clean[col] = pd.to_numeric(
-        df_clean[col].astype(str)
-        .str.replace('.', '', regex=False)
-        .str.replace(',', '.', regex=False)
-        .str.replace(r'[^0-9.-]', '', regex=True),
-        errors='coerce'
-    ).fillna(0)
+# Excel-typed numbers are kept as is, only text cells are re-parsed
+with metrics.stage("measures"):
+    df_clean = parse_measures(df_clean)
+num_cols = measure_columns(df_clean)
 
 # ------------------------------
 # 4.5 → UPPERCASE all TEXT COLUMNS
 # ------------------------------
-for col in df_clean.select_dtypes(include=['object']).columns:
+for col in df_clean.select_dtypes(include=['object', 'string']).columns:
     df_clean[col] = df_clean[col].astype(str).str.upper().str.strip()
 
 # ------------------------------
@@ -147,11 +58,46 @@ final_cols = ['Month', 'Country', 'Agency', 'Region'] + num_cols
 result = df_clean[final_cols].sort_values(
     ['Month', 'Country', 'Agency']
 ).reset_index(drop=True)
+metrics.rows({'uyruk': len(result)}, prefix='result.')
+
+# ------------------------------
+# KPI SUMMARY (before the workbook)
+# ------------------------------
+with metrics.stage("kpi"):
+    kpis = uyruk_kpis({'Uyruk': result})
+totals = kpis['totals']
+print(f"📈 KPI: выручка {totals.get('eur_revenue', 0):,.2f} EUR, "
+      f"комнат {totals.get('arrival_room', 0):,.0f}, ночей {totals.get('night_room', 0):,.0f}")
+for row in kpis['by_region']:
+    print(f"   {row['name']}: {row.get('eur_revenue', 0):,.2f} EUR")
+
+if PREVIEW_ONLY:
+    metrics.finish()
+    print("⏱", metrics.summary())
+    raise SystemExit(0)
 
 # ------------------------------
 # SAVE
 # ------------------------------
-result.to_excel(OUTPUT_PATH, index=False)
+with metrics.stage("xlsx"):
+    result.to_excel(OUTPUT_PATH, index=False)
+metrics.add_output(OUTPUT_PATH)
+
+if SQLITE_PATH:
+    from engine.sqlite_export import export_sqlite
+    export_sqlite(SQLITE_PATH, {'uyruk_result': result}, FILE_PATH, 'uyruk', metrics.file_hashes())
+    metrics.add_output(SQLITE_PATH)
+    print("🗄️ SQLite сохранен →", SQLITE_PATH)
+
+if COLUMNAR_FORMATS:
+    from engine.columnar import export_columnar
+    paths = export_columnar(OUTPUT_PATH, {'result': result}, COLUMNAR_FORMATS)
+    for path in paths:
+        metrics.add_output(path)
+    print("📦 Колоночные файлы →", ", ".join(paths))
+
+metrics.finish()
 
 print("\n✅ ГОТОВО! Итог сохранён →", OUTPUT_PATH)
+print("⏱", metrics.summary())
 print(result.head(10))
@@ -0,0 +1,164 @@
+import argparse
+import os
+import shutil
+import time
+import traceback
+import warnings
+from datetime import datetime
+warnings.filterwarnings('ignore')
+
+# Engine imports happen once, at daemon start (warm engine for every file)
+from engine.inputs import AGENCY, UYRUK, detect_report
+from engine.reports import run_agency_report, run_uyruk_report
+from engine.snapshots import SNAPSHOT_DIR
+from engine.uyruk import ReferenceCache
+
+# Конфигурация
+WATCH_DIRS = ["watch-data/in"]
+OUTPUT_DIR = "watch-data/out"
+UNIQUE_PAIRS_PATH = "./const/unique_region_country.xlsx"
+
+POLL_INTERVAL = 1.0     # сек. между проверками папок
+SETTLE_SECONDS = 2.0    # файл не менялся столько секунд → запись завершена
+
+PROCESSED_DIR = "processed"
+FAILED_DIR = "failed"
+
+
+def log(message):
+    print(f"[{datetime.now():%H:%M:%S}] {message}", flush=True)
+
+
+# ------------------------------
+# DEBOUNCE
+# ------------------------------
+class SettleTracker:
+    """A file is ready once its size and mtime stop changing for ``settle`` seconds."""
+
+    def __init__(self, settle=SETTLE_SECONDS):
+        self.settle = settle
+        self.seen = {}
+
+    def ready(self, path, now):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self.seen.pop(path, None)
+            return False
+
+        sig = (st.st_size, st.st_mtime)
+        prev = self.seen.get(path)
+        if prev is None or prev[0] != sig:
+            self.seen[path] = (sig, now)
+            return False
+        if st.st_size == 0 or now - prev[1] < self.settle:
+            return False
+
+        # Writer still holds the file (Windows share lock)
+        try:
+            with open(path, 'rb+'):
+                pass
+        except OSError:
+            return False
+        return True
+
+    def forget(self, path):
+        self.seen.pop(path, None)
+
+
+def candidates(folder):
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        # "~$file.xlsx" — lock file of an open Excel
+        if name.startswith("~$") or not name.lower().endswith(".xlsx"):
+            continue
+        if os.path.isfile(path):
+            yield path
+
+
+def move_to(path, subdir):
+    target_dir = os.path.join(os.path.dirname(path), subdir)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, os.path.basename(path))
+    if os.path.exists(target):
+        stem, ext = os.path.splitext(os.path.basename(path))
+        target = os.path.join(target_dir, f"{stem}_{datetime.now():%Y%m%d_%H%M%S}{ext}")
+    shutil.move(path, target)
+    return target
+
+
+# ------------------------------
+# PROCESS ONE FILE
+# ------------------------------
+def process(path, output_dir, references, snapshot_dir=None):
+    report = detect_report(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    if report == AGENCY:
+        output = os.path.join(output_dir, f"{stem}_agency_rapor.xlsx")
+        run_agency_report(path, output, log=log, source="watch", snapshot_dir=snapshot_dir)
+    elif report == UYRUK:
+        output = os.path.join(output_dir, f"{stem}_uyruk_performans.xlsx")
+        run_uyruk_report(path, references.get(), output, log=log, source="watch")
+    else:
+        raise ValueError("Başlık satırı bulunamadı: ne Agency ne de AgencyGroup raporu")
+
+    return report, output
+
+
+def watch(watch_dirs, output_dir, pairs_path, poll=POLL_INTERVAL, settle=SETTLE_SECONDS, once=False,
+          snapshot_dir=None):
+    os.makedirs(output_dir, exist_ok=True)
+    for folder in watch_dirs:
+        os.makedirs(folder, exist_ok=True)
+
+    references = ReferenceCache(pairs_path, on_load=lambda ref: log(f"✔ Эталон загружен: {len(ref.countries)} стран"))
+    references.get()
+    tracker = SettleTracker(settle)
+
+    log(f"👀 Наблюдение: {', '.join(watch_dirs)} → {output_dir}")
+
+    while True:
+        now = time.monotonic()
+        pending = 0
+
+        for folder in watch_dirs:
+            for path in candidates(folder):
+                if not tracker.ready(path, now):
+                    pending += 1
+                    continue
+                tracker.forget(path)
+
+                t0 = time.perf_counter()
+                log(f"📥 Новый файл: {path}")
+                try:
+                    report, output = process(path, output_dir, references, snapshot_dir)
+                    move_to(path, PROCESSED_DIR)
+                    log(f"✅ {report}: {output} ({time.perf_counter() - t0:.1f} s)")
+                except Exception as e:
+                    failed = move_to(path, FAILED_DIR)
+                    with open(failed + ".error.txt", "w", encoding="utf-8") as f:
+                        f.write(traceback.format_exc())
+                    log(f"❌ Ошибка {os.path.basename(path)}: {e}")
+
+        if once and pending == 0:
+            break
+        time.sleep(poll)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Отслеживание папок и автоматическое построение отчетов")
+    parser.add_argument("--watch", nargs="+", default=WATCH_DIRS, help="папки с выгрузками PMS")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="папка для отчетов")
+    parser.add_argument("--pairs", default=UNIQUE_PAIRS_PATH, help="таблица регион/страна")
+    parser.add_argument("--poll", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS)
+    parser.add_argument("--once", action="store_true", help="обработать то, что есть, и выйти")
+    parser.add_argument("--snapshots", nargs="?", const=SNAPSHOT_DIR, default=None,
+                        help="сохранять ежедневный снимок Agency для отчета pickup (папка хранилища)")
+    args = parser.parse_args()
+
+    try:
+        watch(args.watch, args.output, args.pairs, args.poll, args.settle, args.once, args.snapshots)
+    except KeyboardInterrupt:
+        log("⏹ Остановлено")